@@ -0,0 +1,45 @@
+"""Measure the throughput and the size of the files written and read by
+``uranie_launcher.data`` for each compression."""
+
+import argparse
+from pathlib import Path
+import sys
+import tempfile
+import time
+
+from common import make_data
+from uranie_launcher import data
+
+
+def main(arguments):
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=200_000, help="number of rows")
+    parser.add_argument("--columns", type=int, default=10, help="number of columns")
+    parser.add_argument("--format", choices=["ascii", "csv", "json"], default="ascii",
+                        help="file format")
+    args = parser.parse_args(arguments)
+
+    table = make_data(args.rows, args.columns)
+    writer = getattr(data, f"data_to_{args.format}")
+    reader = getattr(data, f"{args.format}_to_data")
+    print(f"{args.rows} rows x {args.columns} columns, {args.format}")
+    print(f"{'compression':<12} {'size':>10} {'write':>14} {'read':>14}")
+    with tempfile.TemporaryDirectory() as directory:
+        for compression in [""] + list(data.COMPRESSIONS):
+            filepath = Path(directory) / f"table.{args.format}{compression}"
+            start = time.perf_counter()
+            writer(table, filepath)
+            write_duration = time.perf_counter() - start
+            start = time.perf_counter()
+            reader(filepath)
+            read_duration = time.perf_counter() - start
+            # throughput of the uncompressed content
+            size = (Path(directory) / f"table.{args.format}").stat().st_size / 2**20
+            print(f"{compression or 'none':<12} {filepath.stat().st_size / 2**20:6.1f} MiB "
+                  f"{size / write_duration:8.1f} MiB/s {size / read_duration:8.1f} MiB/s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,75 @@
+"""Compare the formatting of doubles by ``data_to_ascii`` and ``data_to_csv``, converting
+each header of a block with a few NumPy calls, to the former implementation formatting each
+value of each row, on 10M values by default. The written doubles are checked to read back
+exactly."""
+
+import argparse
+import csv
+from pathlib import Path
+import sys
+import tempfile
+import time
+
+from common import make_data
+from uranie_launcher import data
+
+
+def legacy_data_to_ascii(table: data.Data, filepath: Path, chunk_rows: int = data.CHUNK_ROWS):
+    """``data_to_ascii`` formatting each value of each row with ``str``."""
+    with filepath.open(mode="w", encoding="utf-8", buffering=data.BUFFER_SIZE) as ascii_file:
+        for start in range(0, table.nb_rows, chunk_rows):
+            ascii_file.write("\n".join([" ".join([str(value) for value in row])
+                                        for row in table.get_rows(start, start + chunk_rows)])
+                             + "\n")
+
+
+def legacy_data_to_csv(table: data.Data, filepath: Path, chunk_rows: int = data.CHUNK_ROWS):
+    """``data_to_csv`` formatting each value of each row with ``str``."""
+    with filepath.open(mode="w", encoding="utf-8", newline="",
+                       buffering=data.BUFFER_SIZE) as csv_file:
+        csv_writer = csv.writer(csv_file)
+        for start in range(0, table.nb_rows, chunk_rows):
+            csv_writer.writerows([[index] + [str(value) for value in row] for index, row
+                                  in enumerate(table.get_rows(start, start + chunk_rows), start)])
+
+
+def main(arguments):
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000, help="number of rows")
+    parser.add_argument("--columns", type=int, default=10, help="number of columns")
+    args = parser.parse_args(arguments)
+
+    table = make_data(args.rows, args.columns)
+    writers = [
+        ("ascii (legacy)", legacy_data_to_ascii, ".dat", {}),
+        ("ascii", data.data_to_ascii, ".dat", {}),
+        ("ascii %.6e", data.data_to_ascii, ".dat", {"precision": 6}),
+        ("csv (legacy)", legacy_data_to_csv, ".csv", {}),
+        ("csv", data.data_to_csv, ".csv", {}),
+        ("csv %.6e", data.data_to_csv, ".csv", {"precision": 6}),
+    ]
+    nb_values = args.rows * args.columns
+    print(f"{args.rows} rows x {args.columns} columns")
+    legacy_duration = None
+    with tempfile.TemporaryDirectory() as directory:
+        for label, writer, suffix, options in writers:
+            filepath = Path(directory) / f"table{suffix}"
+            start = time.perf_counter()
+            writer(table, filepath, **options)
+            duration = time.perf_counter() - start
+            if writer in (legacy_data_to_ascii, legacy_data_to_csv):
+                legacy_duration = duration
+            print(f"{label:<16} {duration:8.2f} s {nb_values / duration / 1e6:8.2f} Mvalues/s"
+                  f" {legacy_duration / duration:6.1f} x")
+            if not options and writer not in (legacy_data_to_ascii, legacy_data_to_csv):
+                loaded = data.load(filepath)
+                if any(loaded.column(name).tobytes() != table.column(name).tobytes()
+                       for name in table.names):
+                    print(f"{label}: doubles are not read back exactly")
+                    return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,74 @@
+"""Compare the streaming writers of ``uranie_launcher.data`` to the former implementations,
+which built the whole file content in memory before writing it."""
+
+import argparse
+import json
+from pathlib import Path
+import sys
+import tempfile
+
+from common import make_data, measure
+from uranie_launcher import data
+
+
+def legacy_data_to_ascii(table: data.Data, filepath: Path):
+    """``data_to_ascii`` building the whole file as one string."""
+    columns = table.values
+    filepath.write_text(f"""
+#NAME: {table.name}
+#TITLE: {table.description}
+#DATE: {data._get_date()}
+#COLUMN_NAMES: {'|'.join(table.names)}
+#COLUMN_TYPES: {'|'.join(table.types)}
+#COLUMN_TITLES: {'|'.join(table.names)}
+#COLUMN_UNITS: {'|'.join(table.units)}
+
+""" + "\n".join([" ".join([str(values[index]).replace(' ', '') for values in columns])
+                 for index in range(table.nb_rows)]) + "\n", encoding='utf-8')
+
+
+def legacy_data_to_json(table: data.Data, filepath: Path):
+    """``data_to_json`` building the whole document, then the whole string."""
+    columns = table.values
+    dico = {
+        "_metadata": {
+            "_comment": "",
+            "date": data._get_date(),
+            "short_names": table.names,
+            "table_description": table.description,
+            "table_name": table.name,
+            "types": table.types,
+            "units": table.units
+        },
+        "items": [{name: values[index] for name, values in zip(table.names, columns)}
+                  for index in range(table.nb_rows)]
+    }
+    filepath.write_text(json.dumps(dico, indent=2), encoding='utf-8')
+
+
+def main(arguments):
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=200_000, help="number of rows")
+    parser.add_argument("--columns", type=int, default=10, help="number of columns")
+    args = parser.parse_args(arguments)
+
+    table = make_data(args.rows, args.columns)
+    writers = [
+        ("ascii (legacy)", legacy_data_to_ascii, ".dat"),
+        ("ascii", data.data_to_ascii, ".dat"),
+        ("json (legacy)", legacy_data_to_json, ".json"),
+        ("json", data.data_to_json, ".json"),
+    ]
+    print(f"{args.rows} rows x {args.columns} columns")
+    with tempfile.TemporaryDirectory() as directory:
+        for label, writer, suffix in writers:
+            filepath = Path(directory) / f"table{suffix}"
+            duration, peak = measure(
+                lambda: writer(table, filepath))  # pylint: disable=cell-var-from-loop
+            print(f"{label:<16} {duration:8.2f} s {peak / 2**20:10.1f} MiB peak")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
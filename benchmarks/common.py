@@ -0,0 +1,60 @@
+"""Helpers shared by the benchmarks of ``uranie_launcher.data``."""
+
+import time
+import tracemalloc
+from typing import Any, Callable, Tuple
+
+import numpy
+
+from uranie_launcher import data
+
+
+def make_data(nb_rows: int, nb_columns: int, seed: int = 0) -> data.Data:
+    """Create a data of random doubles, similar to a study output.
+
+    Parameters
+    ----------
+    nb_rows : int
+        Number of rows
+    nb_columns : int
+        Number of ``Data.Types.DOUBLE`` headers
+    seed : int, optional
+        Seed of the random generator, by default 0
+
+    Returns
+    -------
+    data.Data
+        Random data
+    """
+    values = numpy.random.default_rng(seed).random((nb_rows, nb_columns))
+    random_data = data.Data(name="benchmark",
+                            description="random values",
+                            headers=[data.Data.Header(f"x{index}", data.Data.Types.DOUBLE, "")
+                                     for index in range(nb_columns)])
+    random_data.add_rows(values)
+    return random_data
+
+
+def measure(function: Callable[[], Any]) -> Tuple[float, int]:
+    """Measure the duration and the peak of memory allocated by a function.
+
+    The function is called twice: memory tracing slows down the call measuring the peak.
+
+    Parameters
+    ----------
+    function : Callable[[], Any]
+        Function to call
+
+    Returns
+    -------
+    Tuple[float, int]
+        Duration in seconds and peak of allocated memory in bytes
+    """
+    start = time.perf_counter()
+    function()
+    duration = time.perf_counter() - start
+    tracemalloc.start()
+    function()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return duration, peak
@@ -68,9 +68,9 @@ def main():
         output_directory=output_dirname)
 
     print(ascii_filepath)
-    outp_data = data.ascii_to_data(ascii_filepath)
-    data.data_to_csv(outp_data, ascii_filepath.with_suffix(".csv"))
-    data.data_to_json(outp_data, ascii_filepath.with_suffix(".json"))
+    outp_data = data.load(ascii_filepath)
+    for suffix in [".csv", ".json"]:
+        data.save(outp_data, ascii_filepath.with_suffix(suffix))
 
     assert (
         nb_failed == 0 and
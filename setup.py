@@ -32,11 +32,13 @@ setup(
     entry_points={
         'console_scripts': [
             'uranie-launcher-unitary=uranie_launcher._run_unitary:run_unitary',
+            'uranie-launcher-convert=uranie_launcher._run_convert:run_convert',
             'test-run-unitary-calculation=tests.program_tester:run_unitary_calculation',
         ]},
     install_requires=[
                     #   "URANIE",
                     #   "ROOT"
+                      "numpy",
                       ],
     extras_require={
             'dev' : ["pytest"]
@@ -0,0 +1,485 @@
+"""Columnar storage used by ``data.Data``.
+
+Each column keeps its values in contiguous NumPy buffers which grow by doubling, so that
+appending a row is amortized O(1) and the stored values can be exposed as views.
+"""
+import abc
+import itertools
+from typing import Any, Callable, List, Tuple
+
+import numpy
+
+_INITIAL_CAPACITY = 16
+"""Number of rows allocated by an empty column."""
+
+ENCODE_ROWS = 1 << 16
+"""Number of strings converted at once to a fixed-width unicode array by ``encode_strings``."""
+
+
+def _read_only(array: numpy.ndarray) -> numpy.ndarray:
+    """Return a read-only view of ``array``.
+
+    Parameters
+    ----------
+    array : numpy.ndarray
+        Array to protect
+
+    Returns
+    -------
+    numpy.ndarray
+        View sharing the memory of ``array``
+    """
+    view = array.view()
+    view.flags.writeable = False
+    return view
+
+
+class Column(abc.ABC):
+    """Base class of the column storages."""
+
+    @abc.abstractmethod
+    def __len__(self) -> int:
+        """Number of rows."""
+
+    @abc.abstractmethod
+    def __getitem__(self, index: int) -> Any:
+        """Python value stored at row ``index``."""
+
+    @abc.abstractmethod
+    def append(self, value: Any):
+        """Append a value at the end of the column.
+
+        Parameters
+        ----------
+        value : Any
+            Value already checked against the column type
+        """
+
+    @abc.abstractmethod
+    def extend(self, values: Any):
+        """Append several values at the end of the column.
+
+        Parameters
+        ----------
+        values : Any
+            Sequence of values already checked against the column type
+        """
+
+    @abc.abstractmethod
+    def view(self) -> Any:
+        """Read-only view on the stored values, without copy."""
+
+    @abc.abstractmethod
+    def tolist(self, start: int = 0, stop: int = None) -> List[Any]:
+        """Copy of the values of rows ``start`` to ``stop`` (excluded) as Python objects."""
+
+    @abc.abstractmethod
+    def take(self, indices: slice or numpy.ndarray) -> 'Column':
+        """New column made of some rows.
+
+        Parameters
+        ----------
+        indices : slice or numpy.ndarray
+            Rows to take, already checked against the length of the column
+
+        Returns
+        -------
+        Column
+            Column sharing the memory of this one when ``indices`` is a slice, copied on
+            first append
+        """
+
+
+class _BufferColumn(Column):
+    """Column stored in a single growable NumPy buffer.
+
+    The buffer may be provided, possibly read-only or memory-mapped: it is then copied only
+    when values are added.
+    """
+
+    def __init__(self, dtype: str, values: numpy.ndarray = None) -> None:
+        """Constructor.
+
+        Parameters
+        ----------
+        dtype : str
+            NumPy type of the buffer
+        values : numpy.ndarray, optional
+            Initial values used as buffer, by default an empty buffer
+        """
+        self._buffer: numpy.ndarray = (numpy.empty(_INITIAL_CAPACITY, dtype=dtype)
+                                       if values is None else values)
+        self._size: int = 0 if values is None else len(values)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __getitem__(self, index: int) -> Any:
+        return self._buffer[:self._size][index].item()
+
+    def _reserve(self, size: int):
+        """Make sure the buffer can hold ``size`` values."""
+        if size > len(self._buffer):
+            buffer = numpy.empty(max(size, 2 * len(self._buffer)), dtype=self._buffer.dtype)
+            buffer[:self._size] = self._buffer[:self._size]
+            self._buffer = buffer
+
+    def append(self, value: Any):
+        self._reserve(self._size + 1)
+        self._buffer[self._size] = value
+        self._size += 1
+
+    def extend(self, values: Any):
+        values = numpy.asarray(values, dtype=self._buffer.dtype)
+        if values.size == 0:
+            return
+        self._reserve(self._size + len(values))
+        self._buffer[self._size:self._size + len(values)] = values
+        self._size += len(values)
+
+    def view(self) -> numpy.ndarray:
+        return _read_only(self._buffer[:self._size])
+
+    def tolist(self, start: int = 0, stop: int = None) -> List[Any]:
+        return self._buffer[:self._size][start:stop].tolist()
+
+    def take(self, indices: slice or numpy.ndarray) -> '_BufferColumn':
+        return _BufferColumn(self._buffer.dtype, self.view()[indices])
+
+
+class DoubleColumn(_BufferColumn):
+    """Column of ``float`` stored as contiguous float64."""
+
+    def __init__(self, values: numpy.ndarray = None) -> None:
+        super().__init__(dtype="float64", values=values)
+
+    def take(self, indices: slice or numpy.ndarray) -> 'DoubleColumn':
+        return DoubleColumn(self.view()[indices])
+
+
+def _encode_block(values: numpy.ndarray) -> Tuple[numpy.ndarray, numpy.ndarray]:
+    """Encode a unicode array in UTF-8, see ``encode_strings``."""
+    lengths = numpy.char.str_len(values)
+    width = values.dtype.itemsize // 4
+    offsets = numpy.concatenate([numpy.zeros(1, dtype="int64"), numpy.cumsum(lengths)])
+    codes = values.view("uint32").reshape(len(values), width)[
+        numpy.arange(width) < lengths[:, None]]
+    if codes.size == 0 or codes.max() < 0x80:
+        return codes.astype("uint8"), offsets
+    sizes = 1 + (codes >= 0x80) + (codes >= 0x800) + (codes >= 0x10000)
+    ends = numpy.concatenate([numpy.zeros(1, dtype="int64"), numpy.cumsum(sizes)])
+    encoded = codes.astype("<u4").tobytes().decode("utf-32-le", "surrogatepass").encode(
+        "utf-8", "surrogatepass")
+    return numpy.frombuffer(encoded, dtype="uint8"), ends[offsets]
+
+
+def encode_strings(values: Any) -> Tuple[numpy.ndarray, numpy.ndarray]:
+    """Encode strings in UTF-8 one after the other, see ``StringColumn``.
+
+    A sequence of ``str`` is converted to a fixed-width unicode array by blocks of
+    ``ENCODE_ROWS`` strings, so that a long string only widens the array of its block.
+
+    Parameters
+    ----------
+    values : Any
+        Sequence of ``str``, or unicode array
+
+    Returns
+    -------
+    Tuple[numpy.ndarray, numpy.ndarray]
+        Bytes of all the strings, uint8, and position of the first byte of each string
+        followed by the number of bytes, int64
+    """
+    if isinstance(values, numpy.ndarray) and values.dtype.kind == "U":
+        return _encode_block(numpy.ascontiguousarray(values).reshape(-1))
+    blocks = [_encode_block(numpy.array(values[start:start + ENCODE_ROWS], dtype=str))
+              for start in range(0, len(values), ENCODE_ROWS)]
+    if len(blocks) < 2:
+        return blocks[0] if blocks else _encode_block(numpy.zeros(0, dtype="<U1"))
+    ends = numpy.cumsum([0] + [len(encoded) for encoded, _ in blocks[:-1]])
+    return (numpy.concatenate([encoded for encoded, _ in blocks]),
+            numpy.concatenate([numpy.zeros(1, dtype="int64")] + [
+                offsets[1:] + end for (_, offsets), end in zip(blocks, ends)]))
+
+
+def decode_strings(values: numpy.ndarray, offsets: numpy.ndarray) -> numpy.ndarray:
+    """Decode the strings stored in UTF-8 one after the other, see ``StringColumn``.
+
+    Parameters
+    ----------
+    values : numpy.ndarray
+        Bytes of the strings, uint8
+    offsets : numpy.ndarray
+        Position of the first byte of each string in ``values``, followed by the position
+        after the last byte
+
+    Returns
+    -------
+    numpy.ndarray
+        Fixed-width unicode array of the strings
+    """
+    nb_strings = max(len(offsets) - 1, 0)
+    encoded = values[offsets[0]:offsets[-1]] if nb_strings else values[:0]
+    starts = numpy.asarray(offsets, dtype="int64") - (offsets[0] if nb_strings else 0)
+    if encoded.size == 0 or encoded.max() < 0x80:
+        codes = encoded
+    else:
+        codes = numpy.frombuffer(encoded.tobytes().decode("utf-8", "surrogatepass").encode(
+            "utf-32-le", "surrogatepass"), dtype="<u4")
+        # the first byte of each character is not a continuation byte 0b10xxxxxx
+        starts = numpy.concatenate([numpy.zeros(1, dtype="int64"), numpy.cumsum(
+            (encoded & 0xC0) != 0x80)])[starts]
+    lengths = numpy.diff(starts)
+    width = max(int(lengths.max(initial=0)), 1)
+    # characters of each string, padded with zeros up to the width of the array
+    strings = numpy.zeros((nb_strings, width), dtype=codes.dtype)
+    strings[numpy.arange(width) < lengths[:, None]] = codes
+    return strings.astype("<u4", copy=False).view(f"<U{width}").reshape(-1)
+
+
+class StringColumn(Column):
+    """Column of ``str`` stored in UTF-8, in compressed sparse row layout.
+
+    The bytes of all the rows are stored one after the other in a single uint8 buffer and
+    row ``index`` is made of the bytes ``offsets[index]`` to ``offsets[index + 1]``, as in
+    ``VectorColumn``. ``view`` decodes the rows once into a fixed-width unicode array, kept
+    until values are added: as NumPy unicode arrays, it takes 4 bytes per character of the
+    longest row for every row, so that a single long string makes it much larger than the
+    UTF-8 storage. ``__getitem__`` and ``tolist`` decode only the requested rows.
+    """
+
+    def __init__(self, values: numpy.ndarray = None, offsets: numpy.ndarray = None) -> None:
+        """Constructor.
+
+        Parameters
+        ----------
+        values : numpy.ndarray, optional
+            Bytes of all the rows, used as buffer, by default an empty buffer
+        offsets : numpy.ndarray, optional
+            Position of the first byte of each row in ``values``, followed by the number of
+            bytes, used as buffer, by default no row
+        """
+        self._values: _BufferColumn = _BufferColumn("uint8", values)
+        self._offsets: _BufferColumn = _BufferColumn(
+            "int64", numpy.zeros(1, dtype="int64") if offsets is None else offsets)
+        self._decoded: numpy.ndarray = None
+
+    @staticmethod
+    def from_rows(rows: Any) -> 'StringColumn':
+        """Create a column from its rows.
+
+        Parameters
+        ----------
+        rows : Any
+            Sequence of ``str``, or unicode array such as returned by ``view``
+
+        Returns
+        -------
+        StringColumn
+            New column
+        """
+        return StringColumn(*encode_strings(rows))
+
+    def __len__(self) -> int:
+        return max(len(self._offsets) - 1, 0)
+
+    def __getitem__(self, index: int) -> str:
+        index = range(len(self))[index]
+        start, stop = self._offsets.tolist(index, index + 2)
+        return self._values.view()[start:stop].tobytes().decode("utf-8", "surrogatepass")
+
+    def append(self, value: Any):
+        self._values.extend(numpy.frombuffer(value.encode("utf-8", "surrogatepass"),
+                                             dtype="uint8"))
+        self._offsets.append(len(self._values))
+        self._decoded = None
+
+    def extend(self, values: Any):
+        if len(values) == 0:
+            return
+        encoded, offsets = encode_strings(values)
+        self._values.extend(encoded)
+        self._offsets.extend(self._offsets.view()[-1] + offsets[1:])
+        self._decoded = None
+
+    def flat(self) -> Tuple[numpy.ndarray, numpy.ndarray]:
+        """Read-only views on the buffers, without copy.
+
+        Returns
+        -------
+        Tuple[numpy.ndarray, numpy.ndarray]
+            Bytes of all the rows and offsets of the rows, see ``StringColumn``
+        """
+        return self._values.view(), self._offsets.view()
+
+    def view(self) -> numpy.ndarray:
+        if self._decoded is None:
+            self._decoded = _read_only(decode_strings(*self.flat()))
+        return self._decoded
+
+    def tolist(self, start: int = 0, stop: int = None) -> List[Any]:
+        if self._decoded is not None:
+            return self._decoded[start:stop].tolist()
+        values, offsets = self.flat()
+        return decode_strings(values, offsets[start:None if stop is None else stop + 1]).tolist()
+
+    def take(self, indices: slice or numpy.ndarray) -> 'StringColumn':
+        values, offsets = self.flat()
+        if isinstance(indices, slice) and range(len(self))[indices].step == 1:
+            rows = range(len(self))[indices]
+            bounds = offsets[rows.start:max(rows.start, rows.stop) + 1]
+            return StringColumn(values[bounds[0]:bounds[-1]], bounds - bounds[0])
+        starts = offsets[:-1][indices]
+        sizes = offsets[1:][indices] - starts
+        new_offsets = numpy.concatenate([numpy.zeros(1, dtype="int64"), numpy.cumsum(sizes)])
+        positions = numpy.arange(new_offsets[-1]) + numpy.repeat(starts - new_offsets[:-1],
+                                                                 sizes)
+        return StringColumn(values[positions], new_offsets)
+
+
+class VectorColumn(Column):
+    """Column of ``list`` of ``float`` stored in compressed sparse row layout.
+
+    The elements of all the rows are stored one after the other in a single float64 buffer
+    and row ``index`` is made of the elements ``offsets[index]`` to ``offsets[index + 1]``,
+    so that rows are exposed as slices of the buffer.
+    """
+
+    def __init__(self, values: numpy.ndarray = None, offsets: numpy.ndarray = None) -> None:
+        """Constructor.
+
+        Parameters
+        ----------
+        values : numpy.ndarray, optional
+            Elements of all the rows, used as buffer, by default an empty buffer
+        offsets : numpy.ndarray, optional
+            Position of the first element of each row in ``values``, followed by the number
+            of elements, used as buffer, by default no row
+        """
+        self._values: DoubleColumn = DoubleColumn(values)
+        self._offsets: _BufferColumn = _BufferColumn(
+            "int64", numpy.zeros(1, dtype="int64") if offsets is None else offsets)
+
+    @staticmethod
+    def from_rows(rows: List[Any]) -> 'VectorColumn':
+        """Create a column from its rows.
+
+        Parameters
+        ----------
+        rows : List[Any]
+            Sequences of floats, such as the slices returned by ``view``
+
+        Returns
+        -------
+        VectorColumn
+            New column
+        """
+        column = VectorColumn()
+        column.extend(rows)
+        return column
+
+    def __len__(self) -> int:
+        return max(len(self._offsets) - 1, 0)
+
+    def __getitem__(self, index: int) -> List[float]:
+        index = range(len(self))[index]
+        start, stop = self._offsets.tolist(index, index + 2)
+        return self._values.tolist(start, stop)
+
+    def append(self, value: Any):
+        self._values.extend(value)
+        self._offsets.append(len(self._values))
+
+    def extend(self, values: Any):
+        sizes = numpy.fromiter(map(len, values), dtype="int64", count=len(values))
+        if sizes.size == 0:
+            return
+        arrays = [value for value in values if isinstance(value, numpy.ndarray)]
+        if len(arrays) == len(values):
+            elements = numpy.concatenate(arrays)
+        else:
+            elements = numpy.fromiter(itertools.chain.from_iterable(values), dtype="float64",
+                                      count=int(sizes.sum()))
+        self._values.extend(elements)
+        self._offsets.extend(self._offsets.view()[-1] + numpy.cumsum(sizes))
+
+    def flat(self) -> Tuple[numpy.ndarray, numpy.ndarray]:
+        """Read-only views on the buffers, without copy.
+
+        Returns
+        -------
+        Tuple[numpy.ndarray, numpy.ndarray]
+            Elements of all the rows and offsets of the rows, see ``VectorColumn``
+        """
+        return self._values.view(), self._offsets.view()
+
+    def tolist(self, start: int = 0, stop: int = None) -> List[Any]:
+        offsets = self._offsets.view()[start:None if stop is None else stop + 1]
+        if offsets.size == 0:
+            return []
+        elements = self._values.tolist(int(offsets[0]), int(offsets[-1]))
+        bounds = (offsets - offsets[0]).tolist()
+        return [elements[begin:end] for begin, end in zip(bounds, bounds[1:])]
+
+    def view(self) -> List[numpy.ndarray]:
+        values, offsets = self.flat()
+        bounds = offsets.tolist()
+        return [values[begin:end] for begin, end in zip(bounds, bounds[1:])]
+
+    def take(self, indices: slice or numpy.ndarray) -> 'VectorColumn':
+        values, offsets = self.flat()
+        if isinstance(indices, slice) and range(len(self))[indices].step == 1:
+            rows = range(len(self))[indices]
+            bounds = offsets[rows.start:max(rows.start, rows.stop) + 1]
+            return VectorColumn(values[bounds[0]:bounds[-1]], bounds - bounds[0])
+        starts = offsets[:-1][indices]
+        sizes = offsets[1:][indices] - starts
+        new_offsets = numpy.concatenate([numpy.zeros(1, dtype="int64"), numpy.cumsum(sizes)])
+        positions = numpy.arange(new_offsets[-1]) + numpy.repeat(starts - new_offsets[:-1],
+                                                                 sizes)
+        return VectorColumn(values[positions], new_offsets)
+
+
+class LazyColumn(Column):
+    """Column of known length whose storage is created on first access."""
+
+    def __init__(self, size: int, loader: Callable[[], Column]) -> None:
+        """Constructor.
+
+        Parameters
+        ----------
+        size : int
+            Number of values
+        loader : Callable[[], Column]
+            Function creating the storage
+        """
+        self._size: int = size
+        self._loader: Callable[[], Column] = loader
+        self._column: Column = None
+
+    def _load(self) -> Column:
+        if self._column is None:
+            self._column = self._loader()
+            self._loader = None
+        return self._column
+
+    def __len__(self) -> int:
+        return self._size if self._column is None else len(self._column)
+
+    def __getitem__(self, index: int) -> Any:
+        return self._load()[index]
+
+    def append(self, value: Any):
+        self._load().append(value)
+
+    def extend(self, values: Any):
+        self._load().extend(values)
+
+    def view(self) -> Any:
+        return self._load().view()
+
+    def tolist(self, start: int = 0, stop: int = None) -> List[Any]:
+        return self._load().tolist(start, stop)
+
+    def take(self, indices: slice or numpy.ndarray) -> Column:
+        return self._load().take(indices)
@@ -0,0 +1,227 @@
+"""Transparent compression of the files read and written by ``data``.
+
+Files whose suffix is in ``COMPRESSIONS`` are compressed or decompressed on the fly. The
+codec runs in a separate thread, exchanging blocks with the thread formatting or parsing the
+values through a bounded queue: ``zlib``, ``bz2`` and ``lzma`` release the GIL while they
+work, so that both run at the same time.
+"""
+import bz2
+import functools
+import gzip
+import io
+import lzma
+from pathlib import Path
+import queue
+import threading
+from typing import IO, BinaryIO
+
+COMPRESSIONS = {
+    ".gz": functools.partial(gzip.open, compresslevel=6),
+    ".bz2": bz2.open,
+    ".xz": lzma.open,
+}
+"""Function opening a compressed file, for each suffix."""
+
+BLOCK_SIZE = 1 << 18
+"""Number of bytes decompressed at once."""
+
+QUEUE_BLOCKS = 8
+"""Number of blocks waiting between the codec thread and the caller."""
+
+
+def is_compressed(filepath: Path) -> bool:
+    """Whether a file is compressed, according to its suffix.
+
+    Parameters
+    ----------
+    filepath : Path
+        Path to file
+
+    Returns
+    -------
+    bool
+        ``True`` if the suffix of the file is in ``COMPRESSIONS``
+    """
+    return filepath.suffix in COMPRESSIONS
+
+
+def format_suffix(filepath: Path) -> str:
+    """Suffix of a file, ignoring the suffix of its compression.
+
+    Parameters
+    ----------
+    filepath : Path
+        Path to file, such as ``table.csv.gz``
+
+    Returns
+    -------
+    str
+        Suffix of the file format, such as ``.csv``
+    """
+    return Path(filepath.stem).suffix if is_compressed(filepath) else filepath.suffix
+
+
+class _WriterThread(io.RawIOBase):
+    """Raw stream passing the written blocks to a thread compressing them."""
+
+    def __init__(self, compressed_file: BinaryIO) -> None:
+        """Constructor.
+
+        Parameters
+        ----------
+        compressed_file : BinaryIO
+            File compressing the blocks written to it
+        """
+        super().__init__()
+        self._file: BinaryIO = compressed_file
+        self._queue: queue.Queue = queue.Queue(maxsize=QUEUE_BLOCKS)
+        self._error: BaseException = None
+        self._position: int = 0
+        self._thread: threading.Thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        block = self._queue.get()
+        while block is not None:
+            if self._error is None:
+                try:
+                    if isinstance(block, threading.Event):
+                        self._file.flush()
+                    else:
+                        self._file.write(block)
+                except BaseException as error:  # pylint: disable=broad-except
+                    self._error = error
+            if isinstance(block, threading.Event):
+                block.set()
+            block = self._queue.get()
+
+    def _raise_error(self):
+        if self._error is not None:
+            raise self._error
+
+    def writable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._position
+
+    def write(self, block) -> int:
+        self._raise_error()
+        block = bytes(block)
+        self._queue.put(block)
+        self._position += len(block)
+        return len(block)
+
+    def flush(self):
+        """Wait for the written blocks to be compressed and flush the compressed file."""
+        if not self.closed and self._thread.is_alive():
+            flushed = threading.Event()
+            self._queue.put(flushed)
+            flushed.wait()
+            self._raise_error()
+
+    def close(self):
+        if not self.closed:
+            self._queue.put(None)
+            self._thread.join()
+            self._file.close()
+            super().close()
+            self._raise_error()
+
+
+class _ReaderThread(io.RawIOBase):
+    """Raw stream reading the blocks decompressed by a thread."""
+
+    def __init__(self, compressed_file: BinaryIO) -> None:
+        """Constructor.
+
+        Parameters
+        ----------
+        compressed_file : BinaryIO
+            File decompressing the blocks read from it
+        """
+        super().__init__()
+        self._file: BinaryIO = compressed_file
+        self._queue: queue.Queue = queue.Queue(maxsize=QUEUE_BLOCKS)
+        self._stop: threading.Event = threading.Event()
+        self._block: memoryview = memoryview(b"")
+        self._eof: bool = False
+        self._position: int = 0
+        self._thread: threading.Thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        try:
+            block = self._file.read(BLOCK_SIZE)
+            while block and not self._stop.is_set():
+                self._queue.put(block)
+                block = self._file.read(BLOCK_SIZE)
+            self._queue.put(b"")
+        except BaseException as error:  # pylint: disable=broad-except
+            self._queue.put(error)
+
+    def readable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._position
+
+    def readinto(self, buffer) -> int:
+        if not self._block and not self._eof:
+            block = self._queue.get()
+            if isinstance(block, BaseException):
+                raise block
+            self._block = memoryview(block)
+            self._eof = not block
+        size = min(len(buffer), len(self._block))
+        buffer[:size] = self._block[:size]
+        self._block = self._block[size:]
+        self._position += size
+        return size
+
+    def close(self):
+        if not self.closed:
+            self._stop.set()
+            # wakes the thread waiting for room in the queue, which then puts at most two
+            # blocks before stopping
+            while not self._queue.empty():
+                self._queue.get()
+            self._thread.join()
+            self._file.close()
+            super().close()
+
+
+def open_file(filepath: Path, mode: str = "r", encoding: str = None, newline: str = None,
+              buffering: int = -1) -> IO:
+    """Open a file as ``Path.open``, compressing or decompressing it according to its suffix.
+
+    Parameters
+    ----------
+    filepath : Path
+        Path to file
+    mode : str, optional
+        Mode among ``"r"``, ``"w"`` and ``"a"``, possibly with ``"b"``, by default ``"r"``
+    encoding : str, optional
+        Encoding in text mode, by default None
+    newline : str, optional
+        Newline translation in text mode, by default None
+    buffering : int, optional
+        Size in bytes of the buffer, by default the size chosen by ``io``
+
+    Returns
+    -------
+    IO
+        File object
+    """
+    if not is_compressed(filepath):
+        return filepath.open(mode=mode, buffering=buffering, encoding=encoding, newline=newline)
+    buffer_size = buffering if buffering > 1 else io.DEFAULT_BUFFER_SIZE
+    compressed_file = COMPRESSIONS[filepath.suffix](filepath, mode.replace("t", "").replace(
+        "b", "") + "b")
+    if "r" in mode:
+        binary_file = io.BufferedReader(_ReaderThread(compressed_file), buffer_size)
+    else:
+        binary_file = io.BufferedWriter(_WriterThread(compressed_file), buffer_size)
+    if "b" in mode:
+        return binary_file
+    return io.TextIOWrapper(binary_file, encoding=encoding, newline=newline)
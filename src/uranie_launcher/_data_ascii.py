@@ -0,0 +1,233 @@
+"""'Salome Table' format, as defined by Uranie, for ``data.Data``.
+"""
+import itertools
+from pathlib import Path
+from typing import Any, BinaryIO, Iterable, Iterator, List, TextIO, Tuple
+
+import numpy
+
+from . import _data_parallel, _data_text
+from ._compression import open_file
+from .data import (BUFFER_SIZE, CHUNK_ROWS, Data, _batched, _column_formatters,
+                   _convert_blocks, _empty_like, _get_date, _iter_text_blocks, _new_data,
+                   _project)
+
+
+def data_to_ascii(data: Data, filepath: Path, chunk_rows: int = CHUNK_ROWS,
+                  buffer_size: int = BUFFER_SIZE, precision: int = None):
+    """Convert ``Data`` to 'Salome Table' as defined by Uranie.
+
+    Rows are formatted and written by blocks, so that memory does not depend on the number
+    of rows. The values of each header of a block are formatted at once.
+
+    Parameters
+    ----------
+    data : Data
+        data to dump
+    filepath : Path
+        Path to file, compressed when its suffix is ``.gz``, ``.bz2`` or ``.xz``
+    chunk_rows : int, optional
+        Number of rows formatted at once, by default ``CHUNK_ROWS``
+    buffer_size : int, optional
+        Size in bytes of the file buffer, by default ``BUFFER_SIZE``
+    precision : int, optional
+        Number of digits after the decimal point of the doubles, written as
+        ``%.{precision}e``, by default the shortest string read back as the same double
+    """
+    with open_file(filepath, mode='w', encoding='utf-8',
+                   buffering=buffer_size) as ascii_file:
+        _write_ascii_header(data, ascii_file)
+        _write_ascii_rows(data, ascii_file, chunk_rows, precision)
+
+
+def _write_ascii_header(data: Data, ascii_file: TextIO):
+    """Write the header of a 'Salome Table' defined by ``data``."""
+    ascii_file.write(f"""
+#NAME: {data.name}
+#TITLE: {data.description}
+#DATE: {_get_date()}
+#COLUMN_NAMES: {'|'.join(data.names)}
+#COLUMN_TYPES: {'|'.join(data.types)}
+#COLUMN_TITLES: {'|'.join(data.names)}
+#COLUMN_UNITS: {'|'.join(data.units)}
+
+""")
+
+
+def _write_ascii_rows(data: Data, ascii_file: TextIO, chunk_rows: int,
+                      precision: int = None):
+    """Write the rows of ``data`` in a 'Salome Table', by blocks of ``chunk_rows``, with
+    doubles formatted by ``_double_formatter(precision)`` and strings without blank, which
+    separate the values."""
+    formatters = _column_formatters(data, _data_text.remove_blanks, precision)
+    for _, columns in _iter_text_blocks(data, chunk_rows, formatters):
+        ascii_file.write(_data_text.join_texts(columns, " ", "\n"))
+
+
+_HEADER_PREFIXES = ("#NAME:", "#TITLE:", "#DATE:", "#COLUMN_NAMES:", "#COLUMN_TYPES:",
+                    "#COLUMN_TITLES:", "#COLUMN_UNITS:")
+"""Prefixes of the lines of the header of a 'Salome Table', any other line not blank being
+the first row."""
+
+
+def _read_ascii_header(  # pylint: disable=too-many-branches  # noqa: C901
+        lines: Iterator[str]) -> Tuple[Data, Iterator[str]]:
+    """Read the header of a 'Salome Table' as defined by Uranie.
+
+    Parameters
+    ----------
+    lines : Iterator[str]
+        Lines of the file
+
+    Returns
+    -------
+    Tuple[Data, Iterator[str]]
+        Empty data defined by the header and iterator over the non blank lines of values
+    """
+    name = ""
+    description = ""
+    names = []
+    types = []
+    units = []
+    first_row = []
+    for line in lines:
+        if not line.strip():
+            continue
+        if not line.startswith(_HEADER_PREFIXES):
+            first_row = [line]
+            break
+        if line.startswith("#NAME:"):
+            name = line.replace('#NAME:', '').strip()
+        elif line.startswith("#TITLE:"):
+            description = line.replace('#TITLE:', '').strip()
+        elif line.startswith("#COLUMN_NAMES:"):
+            names = [n.strip() for n in line.replace('#COLUMN_NAMES:', '').strip().split('|')]
+        elif line.startswith("#COLUMN_TYPES:"):
+            types = [n.strip() for n in line.replace('#COLUMN_TYPES:', '').strip().split('|')]
+        elif line.startswith("#COLUMN_UNITS:"):
+            units = [n.strip() for n in line.replace('#COLUMN_UNITS:', '').strip().split('|')]
+
+    if not names:
+        names = [str(index) for index, _ in enumerate(first_row[0].split() if first_row else [])]
+    if not types:
+        types = ["D"] * len(names)
+    if not units:
+        units = [""] * len(names)
+
+    data = _new_data(name, description, names, types, units)
+    return data, itertools.chain(first_row, (line for line in lines if line.strip()))
+
+
+def _read_binary_header(binary_file: BinaryIO) -> Tuple[Data, int]:
+    """Read the header of a 'Salome Table' opened in binary mode.
+
+    The file is left at the first row.
+
+    Returns
+    -------
+    Tuple[Data, int]
+        Empty data defined by the header and position of the first row
+    """
+    lines = []
+    position = binary_file.tell()
+    for line in iter(binary_file.readline, b""):
+        lines.append(line.decode("utf-8"))
+        if line.strip() and not lines[-1].startswith(_HEADER_PREFIXES):
+            break
+        position += len(line)
+    header, _ = _read_ascii_header(iter(lines))
+    binary_file.seek(position)
+    return header, position
+
+
+def _iter_ascii_columns(data: Data, lines: Iterator[str], chunk_rows: int,
+                        indices: List[int] = None) -> Iterator[List[Any]]:
+    """Parse the lines of values of a 'Salome Table' by blocks.
+
+    When all the headers are ``Data.Types.DOUBLE``, each block is parsed at once by
+    ``numpy.loadtxt`` into a 2-D float64 array. Otherwise values are split and each column
+    is converted at once, see ``Data.Schema.column_parsers``.
+
+    Parameters
+    ----------
+    data : Data
+        Data defined by the header
+    lines : Iterator[str]
+        Non blank lines of values
+    chunk_rows : int
+        Number of rows per block
+    indices : List[int], optional
+        Position of the parsed headers, the values of the other ones are skipped,
+        by default all the headers
+
+    Yields
+    ------
+    List[Any]
+        Columns of each block, as accepted by ``Data.extend_columns``
+    """
+    if all(value_type == Data.Types.DOUBLE for value_type in data.types):
+        for block in _batched(lines, chunk_rows):
+            yield list(numpy.loadtxt(block, dtype="float64", comments=None, ndmin=2,
+                                     usecols=indices).T)
+    else:
+        yield from _convert_blocks(data, (line.split() for line in lines), chunk_rows, indices)
+
+
+def _parse_ascii_lines(data: Data, lines: Iterable[str],
+                       indices: List[int]) -> Iterator[List[Any]]:
+    """Parse lines of values by blocks, see ``_data_parallel.Parser``."""
+    return _iter_ascii_columns(data, (line for line in lines if line.strip()), CHUNK_ROWS,
+                               indices)
+
+
+def iter_ascii_chunks(filepath: Path, chunk_rows: int = CHUNK_ROWS,
+                      columns: List[str] = None) -> Iterator[Data]:
+    """Read 'Salome Table' as defined by Uranie by blocks of rows.
+
+    The header is parsed once and only one block of rows is held in memory at a time.
+
+    Parameters
+    ----------
+    filepath : Path
+        Path to file, compressed when its suffix is ``.gz``, ``.bz2`` or ``.xz``
+    chunk_rows : int, optional
+        Number of rows per block, by default ``CHUNK_ROWS``
+    columns : List[str], optional
+        Names of the headers to read, in this order, the values of the other headers are
+        neither converted nor stored, by default all the headers
+
+    Yields
+    ------
+    Data
+        Data of each block, with the name, description and headers of the file
+    """
+    with open_file(filepath, mode='r', encoding='utf-8') as ascii_file:
+        header, lines = _read_ascii_header(ascii_file)
+        projected, indices = _project(header, columns)
+        for block in _iter_ascii_columns(header, lines, chunk_rows, indices):
+            chunk = _empty_like(projected)
+            chunk.extend_columns(block)
+            yield chunk
+
+
+def ascii_to_data(filepath: Path, workers: int = 1, columns: List[str] = None) -> Data:
+    """Convert 'Salome Table' as defined by Uranie to ``Data``.
+
+    Parameters
+    ----------
+    filepath : Path
+        Path to file, compressed when its suffix is ``.gz``, ``.bz2`` or ``.xz``
+    workers : int, optional
+        Number of processes parsing the rows of an uncompressed file in parallel,
+        by default 1
+    columns : List[str], optional
+        Names of the headers to read, in this order, the values of the other headers are
+        neither converted nor stored, by default all the headers
+
+    Returns
+    -------
+    Data
+        Loaded data
+    """
+    return _data_parallel.read_file(filepath, _read_ascii_header, _read_binary_header,
+                                    _parse_ascii_lines, workers, columns=columns)
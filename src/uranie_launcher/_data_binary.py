@@ -0,0 +1,283 @@
+"""Self-describing columnar binary format for ``data.Data``.
+
+The file starts with ``MAGIC``, the size of the header as a little-endian uint64 and the
+header itself, encoded in json. It contains the name, the description, the headers and the
+number of rows of the data, and the position of the buffers of each column relative to the
+end of the header:
+
+- ``Data.Types.DOUBLE``: ``values``, float64;
+- ``Data.Types.STRING``: ``offsets``, int64 (one more than rows), and ``values``, utf-8;
+- ``Data.Types.VECTOR``: ``offsets``, int64 (one more than rows), and ``values``, float64.
+
+Buffers are little-endian and aligned on ``ALIGNMENT`` bytes, so that they can be used in
+place once the file is memory-mapped.
+"""
+import contextlib
+import functools
+import json
+from pathlib import Path
+import struct
+import tempfile
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Tuple
+
+import numpy
+
+from . import _columns
+from ._compression import is_compressed, open_file
+from .data import BUFFER_SIZE, CHUNK_ROWS, Data, _project
+
+MAGIC = b"ULDATA\x00\x01"
+"""First bytes of the file, ending with the version of the format."""
+
+ALIGNMENT = 64
+"""Alignment in bytes of the start of the data and of each buffer."""
+
+_SIZE = struct.Struct("<Q")
+
+
+def _align(position: int) -> int:
+    return -(-position // ALIGNMENT) * ALIGNMENT
+
+
+def _iter_blocks(values: Any, chunk_rows: int) -> Iterator[Any]:
+    for start in range(0, len(values), chunk_rows):
+        yield values[start:start + chunk_rows]
+
+
+def _column_buffers(value_type: str, values: Any,
+                    chunk_rows: int) -> Dict[str, Tuple[int, Iterator[Any]]]:
+    """Size and content of the buffers storing a column.
+
+    Parameters
+    ----------
+    value_type : str
+        Type among ``Data.Types``
+    values : Any
+        Values of the column as returned by ``Data.column``
+    chunk_rows : int
+        Number of values encoded at once
+
+    Returns
+    -------
+    Dict[str, Tuple[int, Iterator[Any]]]
+        Size in bytes and iterator over blocks of content of each buffer
+    """
+    if value_type == Data.Types.DOUBLE:
+        return {"values": (8 * len(values), (block.astype("<f8", copy=False)
+                                             for block in _iter_blocks(values, chunk_rows)))}
+
+    if value_type == Data.Types.STRING:
+        encoded, offsets = _columns.encode_strings(values)
+        return {"offsets": (offsets.nbytes, iter([offsets.astype("<i8", copy=False)])),
+                "values": (encoded.nbytes, iter([encoded]))}
+
+    def encode():
+        for block in _iter_blocks(values, chunk_rows):
+            yield numpy.concatenate([numpy.zeros(0)] + block).astype("<f8", copy=False)
+    sizes = numpy.fromiter((len(value) for value in values), dtype="<i8", count=len(values))
+    offsets = numpy.concatenate([numpy.zeros(1, dtype="<i8"), numpy.cumsum(sizes, dtype="<i8")])
+    return {"offsets": (offsets.nbytes, iter([offsets])),
+            "values": (8 * int(offsets[-1]), encode())}
+
+
+def _layout(columns: List[Dict[str, Tuple[int, Iterator[Any]]]]) -> List[Dict[str, List[int]]]:
+    """Position and size of the aligned buffers of each column, relative to the data start."""
+    position = 0
+    layout = []
+    for buffers in columns:
+        layout.append({})
+        for key, (size, _) in buffers.items():
+            position = _align(position)
+            layout[-1][key] = [position, size]
+            position += size
+    return layout
+
+
+def data_to_binary(data: Data, filepath: Path,
+                   chunk_rows: int = CHUNK_ROWS, buffer_size: int = BUFFER_SIZE):
+    """Convert ``Data`` to the columnar binary format.
+
+    Parameters
+    ----------
+    data : Data
+        data to dump
+    filepath : Path
+        Path to file, compressed when its suffix is ``.gz``, ``.bz2`` or ``.xz``
+    chunk_rows : int, optional
+        Number of values encoded at once, by default ``CHUNK_ROWS``
+    buffer_size : int, optional
+        Size in bytes of the file buffer, by default ``BUFFER_SIZE``
+    """
+    columns = [_column_buffers(value_type, data.column(name), chunk_rows)
+               for name, value_type in zip(data.names, data.types)]
+    _write_binary(data, data.nb_rows if data.nb_columns else 0, columns, filepath, buffer_size)
+
+
+def write_binary_chunks(header: Data, chunks: Iterable[Data], filepath: Path,
+                        chunk_rows: int = CHUNK_ROWS, buffer_size: int = BUFFER_SIZE):
+    """Write blocks of rows to the columnar binary format.
+
+    The position of the buffers in the header depends on their size, so the buffers of
+    each column are first written to temporary files next to ``filepath``, then copied
+    after the header. Only one block is held in memory at a time.
+
+    Parameters
+    ----------
+    header : Data
+        Data defining the name, description and headers of the file
+    chunks : Iterable[Data]
+        Blocks of rows, with the headers of ``header``
+    filepath : Path
+        Path to file, compressed when its suffix is ``.gz``, ``.bz2`` or ``.xz``
+    chunk_rows : int, optional
+        Number of values encoded at once, by default ``CHUNK_ROWS``
+    buffer_size : int, optional
+        Size in bytes of the file buffer and of the copied blocks, by default
+        ``BUFFER_SIZE``
+    """
+    with tempfile.TemporaryDirectory(dir=filepath.parent) as directory, \
+            contextlib.ExitStack() as stack:
+        spools = [{key: stack.enter_context((Path(directory) / f"{index}_{key}").open("w+b"))
+                   for key in (["values"] if value_type == Data.Types.DOUBLE
+                               else ["offsets", "values"])}
+                  for index, value_type in enumerate(header.types)]
+        for buffers in spools:
+            if "offsets" in buffers:
+                buffers["offsets"].write(numpy.zeros(1, dtype="<i8"))
+        ends = [0 for _ in spools]
+        nb_rows = 0
+        for chunk in chunks:
+            _spool_chunk(header, chunk, spools, ends, chunk_rows)
+            nb_rows += chunk.nb_rows if chunk.nb_columns else 0
+        columns = [{key: (spool.tell(), _read_blocks(spool, buffer_size))
+                    for key, spool in buffers.items()} for buffers in spools]
+        _write_binary(header, nb_rows, columns, filepath, buffer_size)
+
+
+def _spool_chunk(header: Data, chunk: Data, spools: List[Dict[str, BinaryIO]], ends: List[int],
+                 chunk_rows: int):
+    """Append the buffers of each column of ``chunk`` to its temporary files, shifting the
+    offsets by the number of values already written in ``ends``."""
+    for index, (name, value_type) in enumerate(zip(header.names, header.types)):
+        buffers = _column_buffers(value_type, chunk.column(name), chunk_rows)
+        if "offsets" in buffers:
+            offsets = next(buffers["offsets"][1])
+            spools[index]["offsets"].write(offsets[1:] + ends[index])
+            ends[index] += int(offsets[-1])
+        for block in buffers["values"][1]:
+            spools[index]["values"].write(block)
+
+
+def _read_blocks(spool: BinaryIO, buffer_size: int) -> Iterator[bytes]:
+    """Read a temporary file from its start, by blocks."""
+    spool.seek(0)
+    yield from iter(functools.partial(spool.read, buffer_size), b"")
+
+
+def _write_binary(data: Data, nb_rows: int,  # pylint: disable=too-many-arguments
+                  columns: List[Dict[str, Tuple[int, Iterator[Any]]]], filepath: Path,
+                  buffer_size: int):
+    """Write the header defined by ``data`` and the buffers of each column."""
+    layout = _layout(columns)
+
+    header = json.dumps({
+        "name": data.name,
+        "description": data.description,
+        "headers": [{"name": header.name, "type": header.value_type, "unit": header.value_unit}
+                    for header in data.headers],
+        "nb_rows": nb_rows,
+        "columns": layout,
+    }).encode("utf-8")
+
+    with open_file(filepath, mode="wb", buffering=buffer_size) as binary_file:
+        binary_file.write(MAGIC + _SIZE.pack(len(header)) + header)
+        start = _align(binary_file.tell())
+        for buffers, buffers_layout in zip(columns, layout):
+            for key, (_, blocks) in buffers.items():
+                binary_file.write(bytes(start + buffers_layout[key][0] - binary_file.tell()))
+                for block in blocks:
+                    binary_file.write(block)
+
+
+def _read_header(binary_file: BinaryIO) -> Tuple[Dict[str, Any], int]:
+    """Read the header of a binary file.
+
+    Returns
+    -------
+    Tuple[Dict[str, Any], int]
+        Header and position of the start of the data
+
+    Raises
+    ------
+    ValueError
+        If the file is not in the columnar binary format.
+    """
+    preamble = binary_file.read(len(MAGIC) + _SIZE.size)
+    if preamble[:len(MAGIC)] != MAGIC or len(preamble) != len(MAGIC) + _SIZE.size:
+        raise ValueError(f"{binary_file.name} is not a binary data file.")
+    size, = _SIZE.unpack(preamble[len(MAGIC):])
+    header = json.loads(binary_file.read(size).decode("utf-8"))
+    return header, _align(len(preamble) + size)
+
+
+def _load_column(mapped: numpy.ndarray, value_type: str,
+                 layout: Dict[str, List[int]]) -> _columns.Column:
+    """Create the storage of a column from the memory-mapped file.
+
+    ``Data.Types.DOUBLE`` values and the elements and offsets of ``Data.Types.VECTOR`` values
+    and the bytes and offsets of ``Data.Types.STRING`` values are used in place.
+    """
+    def buffer(key: str) -> numpy.ndarray:
+        start, size = layout[key]
+        return mapped[start:start + size]
+
+    if value_type == Data.Types.DOUBLE:
+        return _columns.DoubleColumn(buffer("values").view("<f8"))
+    if value_type == Data.Types.VECTOR:
+        return _columns.VectorColumn(buffer("values").view("<f8"), buffer("offsets").view("<i8"))
+    return _columns.StringColumn(buffer("values"), buffer("offsets").view("<i8"))
+
+
+def binary_to_data(filepath: Path, columns: List[str] = None) -> Data:
+    """Convert the columnar binary format to ``Data``.
+
+    The file is memory-mapped and each column is created on first access, so that opening
+    the file does not read the values and reading a column only touches its pages. A
+    compressed file is decompressed in memory instead.
+
+    Parameters
+    ----------
+    filepath : Path
+        Path to file, compressed when its suffix is ``.gz``, ``.bz2`` or ``.xz``
+    columns : List[str], optional
+        Names of the headers to read, in this order, by default all the headers
+
+    Returns
+    -------
+    Data
+        Loaded data
+
+    Raises
+    ------
+    ValueError
+        If the file is not in the columnar binary format or if a header of ``columns`` is
+        unknown.
+    """
+    with open_file(filepath, mode="rb") as binary_file:
+        header, start = _read_header(binary_file)
+        data, indices = _project(Data(name=header["name"], description=header["description"],
+                                      headers=[Data.Header(name=column["name"],
+                                                           value_type=column["type"],
+                                                           value_unit=column["unit"])
+                                               for column in header["headers"]]), columns)
+        if is_compressed(filepath):
+            position = binary_file.tell()
+            mapped = numpy.frombuffer(binary_file.read(), dtype="uint8")[start - position:]
+    if not is_compressed(filepath):
+        mapped = numpy.memmap(filepath, dtype="uint8", mode="r")[start:]
+    return Data(name=data.name,
+                description=data.description,
+                headers=data.headers,
+                columns=[_columns.LazyColumn(header["nb_rows"], functools.partial(
+                    _load_column, mapped, data_header.value_type, header["columns"][index]))
+                         for data_header, index in zip(data.headers, indices)])
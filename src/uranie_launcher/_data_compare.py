@@ -0,0 +1,254 @@
+"""Comparison of two tables of results with tolerances, such as the outputs of two versions
+of a code.
+
+Rows are aligned by the values of a key header with ``numpy.intersect1d``, then each header
+is compared for all the aligned rows at once. Files are read by blocks of rows: the rows
+whose key is not yet found in the other file wait in a buffer, so that files in the same
+order of keys are compared whatever their size. The keys of the compared rows are kept
+sorted, to check that they do not appear again in a later block.
+"""
+import itertools
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Tuple, Union
+
+import numpy
+
+from ._data_concat import concat
+from ._data_formats import read_chunks
+from ._data_join import _assemble, _check_join
+from .data import CHUNK_ROWS, Data, _project
+
+
+def _read(source: Union[Data, Path], chunk_rows: int) -> Tuple[Data, Iterator[Data]]:
+    """Header and blocks of rows of a data or of a file."""
+    if isinstance(source, Data):
+        return source, iter([source])
+    return read_chunks(source, chunk_rows)
+
+
+def _check_unique(keys: numpy.ndarray, compared: numpy.ndarray, key: str, source: str):
+    """Check that the values of a key header are unique, and not among the sorted keys of
+    the rows already compared.
+
+    Raises
+    ------
+    ValueError
+        If a value appears more than once.
+    """
+    found = numpy.minimum(numpy.searchsorted(compared, keys), max(len(compared) - 1, 0))
+    if len(numpy.unique(keys)) < len(keys) or (len(compared) and (compared[found] == keys).any()):
+        raise ValueError(f"Values of the key header '{key}' of {source} are not unique.")
+
+
+def _differences(value_type: str, a_values: Any, b_values: Any, rtol: float,
+                 atol: float) -> Tuple[numpy.ndarray, float, float]:
+    """Rows whose values differ beyond the tolerances, as ``numpy.isclose``, and largest
+    absolute and relative differences, ``nan`` for strings.
+
+    Two ``nan`` are equal, vectors of different lengths differ.
+    """
+    if value_type == Data.Types.STRING:
+        return numpy.asarray(a_values != b_values), numpy.nan, numpy.nan
+    if value_type == Data.Types.VECTOR:
+        a_lengths = numpy.fromiter(map(len, a_values), dtype="int64", count=len(a_values))
+        b_lengths = numpy.fromiter(map(len, b_values), dtype="int64", count=len(b_values))
+        differ = a_lengths != b_lengths
+        rows = numpy.flatnonzero(~differ)
+        owners = numpy.repeat(rows, a_lengths[rows])
+        a_values = numpy.concatenate([numpy.zeros(0)] + [a_values[row] for row in rows])
+        b_values = numpy.concatenate([numpy.zeros(0)] + [b_values[row] for row in rows])
+        differ[owners[~numpy.isclose(a_values, b_values, rtol, atol, equal_nan=True)]] = True
+    else:
+        differ = ~numpy.isclose(a_values, b_values, rtol, atol, equal_nan=True)
+    with numpy.errstate(invalid="ignore", divide="ignore"):
+        absolute = numpy.abs(a_values - b_values)
+        relative = absolute / numpy.abs(b_values)
+    # ``fmax`` ignores the ``nan`` differences of ``nan`` or infinite values
+    return (differ, float(numpy.fmax.reduce(absolute, initial=0.0)),
+            float(numpy.fmax.reduce(relative, initial=0.0)))
+
+
+class Comparison:
+    """Differences between two tables of results whose rows are aligned by a key header,
+    see ``compare``."""
+
+    def __init__(self,  # pylint: disable=too-many-arguments,too-many-locals
+                 a: Union[Data, Path], b: Union[Data, Path], key: str, rtol: float,
+                 atol: float, *,
+                 columns: List[str] = None, max_rows: int = None,
+                 chunk_rows: int = CHUNK_ROWS) -> None:
+        """Constructor, comparing the tables, see ``compare``.
+
+        Raises
+        ------
+        ValueError
+            If the key is missing, invalid or not unique, or if a compared header is missing
+            or of different types in both tables.
+        """
+        a_header, a_chunks = _read(a, chunk_rows)
+        b_header, b_chunks = _read(b, chunk_rows)
+        _check_join(a_header, b_header, key, "inner")
+        if columns is None:
+            columns = [name for name in a_header.names
+                       if name != key and name in b_header.names]
+        names = [key] + [name for name in columns if name != key]
+        a_pending, _ = _project(a_header, names)
+        b_pending, _ = _project(b_header, names)
+        for name, a_type, b_type in zip(names, a_pending.types, b_pending.types):
+            if a_type != b_type:
+                raise ValueError(f"Cannot compare '{name}' of types '{a_type}' and "
+                                 f"'{b_type}'.")
+
+        self._key: str = key
+        self._headers: List[Data.Header] = a_pending.headers[1:]
+        self._max_rows: int = max_rows
+        self._nb_rows: int = 0
+        self._nb_differences: Dict[str, int] = dict.fromkeys(names[1:], 0)
+        self._max_absolute: Dict[str, float] = dict.fromkeys(names[1:], numpy.nan)
+        self._max_relative: Dict[str, float] = dict.fromkeys(names[1:], numpy.nan)
+        nowhere = numpy.zeros(0, dtype="int64")
+        self._differences: List[Data] = [_assemble(a_pending, b_pending, key, nowhere, nowhere,
+                                                   suffixes=("_a", "_b"))]
+        self._nb_kept: int = 0
+
+        compared = a_pending.column(key)
+        for a_chunk, b_chunk in itertools.zip_longest(a_chunks, b_chunks):
+            if a_chunk is not None:
+                a_pending = concat([a_pending, a_chunk.select(names)])
+            if b_chunk is not None:
+                b_pending = concat([b_pending, b_chunk.select(names)])
+            a_keys, b_keys = a_pending.column(key), b_pending.column(key)
+            _check_unique(a_keys, compared, key, "a")
+            _check_unique(b_keys, compared, key, "b")
+            common, a_rows, b_rows = numpy.intersect1d(a_keys, b_keys, assume_unique=True,
+                                                       return_indices=True)
+            # both arrays are sorted: the stable sort merges them in linear time
+            compared = numpy.sort(numpy.concatenate([compared, common]), kind="stable")
+            order = numpy.argsort(a_rows)
+            self._add(a_pending.take(a_rows[order]), b_pending.take(b_rows[order]), rtol, atol)
+            a_unmatched = numpy.ones(len(a_keys), dtype=bool)
+            a_unmatched[a_rows] = False
+            b_unmatched = numpy.ones(len(b_keys), dtype=bool)
+            b_unmatched[b_rows] = False
+            a_pending, b_pending = a_pending.where(a_unmatched), b_pending.where(b_unmatched)
+        self._only_in_a: numpy.ndarray = a_pending.column(key)
+        self._only_in_b: numpy.ndarray = b_pending.column(key)
+
+    def _add(self, a_rows: Data, b_rows: Data, rtol: float, atol: float):
+        """Compare aligned rows, with the key and the compared headers."""
+        differ = numpy.zeros(a_rows.nb_rows, dtype=bool)
+        for header in self._headers:
+            name = header.name
+            rows, absolute, relative = _differences(header.value_type, a_rows.column(name),
+                                                    b_rows.column(name), rtol, atol)
+            self._nb_differences[name] += int(rows.sum())
+            self._max_absolute[name] = float(numpy.fmax(self._max_absolute[name], absolute))
+            self._max_relative[name] = float(numpy.fmax(self._max_relative[name], relative))
+            differ |= rows
+        self._nb_rows += a_rows.nb_rows
+        rows = numpy.flatnonzero(differ)
+        if self._max_rows is not None:
+            rows = rows[:max(self._max_rows - self._nb_kept, 0)]
+        if len(rows):
+            self._differences.append(_assemble(a_rows, b_rows, self._key, rows, rows,
+                                               suffixes=("_a", "_b")))
+            self._nb_kept += len(rows)
+
+    @property
+    def key(self) -> str:
+        """Name of the key header aligning the rows"""
+        return self._key
+
+    @property
+    def nb_rows(self) -> int:
+        """Number of compared rows, whose key is in both tables"""
+        return self._nb_rows
+
+    @property
+    def only_in_a(self) -> numpy.ndarray:
+        """Keys of the rows of ``a`` without row in ``b``"""
+        return self._only_in_a
+
+    @property
+    def only_in_b(self) -> numpy.ndarray:
+        """Keys of the rows of ``b`` without row in ``a``"""
+        return self._only_in_b
+
+    @property
+    def equal(self) -> bool:
+        """Whether both tables have the same keys and values within the tolerances"""
+        return (not any(self._nb_differences.values()) and self._only_in_a.size == 0
+                and self._only_in_b.size == 0)
+
+    @property
+    def summary(self) -> Data:
+        """One row per compared header: its ``name``, its number of rows with differences
+        ``nb_differences``, and its largest differences ``max_abs_difference`` and
+        ``max_rel_difference``, ``nan`` for strings or without compared row"""
+        summary = Data(name="comparison", description=f"Differences by '{self._key}'",
+                       headers=[Data.Header("name", Data.Types.STRING, ""),
+                                Data.Header("nb_differences", Data.Types.DOUBLE, ""),
+                                Data.Header("max_abs_difference", Data.Types.DOUBLE, ""),
+                                Data.Header("max_rel_difference", Data.Types.DOUBLE, "")])
+        summary.add_rows([[header.name, float(self._nb_differences[header.name]),
+                           self._max_absolute[header.name], self._max_relative[header.name]]
+                          for header in self._headers])
+        return summary
+
+    @property
+    def differences(self) -> Data:
+        """Rows with differences, at most ``max_rows``, in the order of ``a`` when both
+        tables are in the same order of keys: the key, then the compared headers of ``a``
+        suffixed by ``_a``, then those of ``b`` suffixed by ``_b``"""
+        return concat(self._differences)
+
+
+def compare(a: Union[Data, Path],  # pylint: disable=too-many-arguments
+            b: Union[Data, Path], key: str = "execution_index", rtol: float = 1e-05,
+            atol: float = 1e-08, *, columns: List[str] = None, max_rows: int = None,
+            chunk_rows: int = CHUNK_ROWS) -> Comparison:
+    """Compare the rows of two tables of results with the same key, with tolerances.
+
+    Doubles, and the elements of vectors of the same length, are equal when
+    ``abs(a - b) <= atol + rtol * abs(b)``, as ``numpy.isclose``; two ``nan`` are equal.
+    Strings are compared exactly.
+
+    Files are read by blocks of rows, keeping in memory the rows whose key is not yet found
+    in the other file, the kept rows with differences and the keys of the compared rows:
+    files in the same order of keys are compared whatever their size.
+
+    Parameters
+    ----------
+    a : Data or Path
+        Reference table, or path to a file in any registered format
+    b : Data or Path
+        Compared table, or path to a file in any registered format
+    key : str, optional
+        Name of the ``Data.Types.DOUBLE`` or ``Data.Types.STRING`` header of both tables,
+        with unique values, aligning the rows, by default ``"execution_index"``
+    rtol : float, optional
+        Relative tolerance, by default 1e-05
+    atol : float, optional
+        Absolute tolerance, by default 1e-08
+    columns : List[str], optional
+        Names of the compared headers, by default the headers of ``a`` also in ``b``
+    max_rows : int, optional
+        Maximum number of kept rows with differences, all being counted in the summary,
+        by default all
+    chunk_rows : int, optional
+        Number of rows of files read at once, by default ``CHUNK_ROWS``
+
+    Returns
+    -------
+    Comparison
+        Summary of the differences of each header, rows with differences and keys found in
+        only one table
+
+    Raises
+    ------
+    ValueError
+        If the key is missing, invalid or not unique, or if a compared header is missing or
+        of different types in both tables.
+    """
+    return Comparison(a, b, key, rtol, atol, columns=columns, max_rows=max_rows,
+                      chunk_rows=chunk_rows)
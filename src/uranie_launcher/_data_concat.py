@@ -0,0 +1,174 @@
+"""Concatenation of ``data.Data`` and of files of results.
+"""
+import csv
+import functools
+import io
+import itertools
+from pathlib import Path
+from typing import BinaryIO, Iterable, List
+
+import numpy
+
+from . import _columns
+from ._compression import format_suffix, open_file
+from ._data_ascii import (_read_ascii_header, _write_ascii_header, _write_ascii_rows,
+                          iter_ascii_chunks)
+from ._data_csv import _read_csv_header, _write_csv_header, _write_csv_rows, iter_csv_chunks
+from .data import BUFFER_SIZE, CHUNK_ROWS, Data, _batched
+
+
+def _check_headers(headers: List[Data], sources: List[str]):
+    """Check that all data have the headers of the first one.
+
+    Raises
+    ------
+    ValueError
+        If the names, types or units of the headers differ.
+    """
+    def describe(data: Data):
+        return list(zip(data.names, data.types, data.units))
+
+    for header, source in zip(headers[1:], sources[1:]):
+        if describe(header) != describe(headers[0]):
+            raise ValueError(f"Headers of {source} {describe(header)} differ from those of "
+                             f"{sources[0]} {describe(headers[0])}.")
+
+
+def _concat_column(value_type: str, views: List[numpy.ndarray or List[numpy.ndarray]]
+                   ) -> _columns.Column:
+    """Storage of the values of a header in several data, as returned by ``Data.column``."""
+    if value_type == Data.Types.DOUBLE:
+        return _columns.DoubleColumn(numpy.concatenate(views))
+    if value_type == Data.Types.STRING:
+        return _columns.StringColumn.from_rows(numpy.concatenate(views))
+    return _columns.VectorColumn.from_rows(list(itertools.chain.from_iterable(views)))
+
+
+def concat(datas: Iterable[Data]) -> Data:
+    """Concatenate the rows of several data.
+
+    Headers are checked once, then the values of each header are copied at once.
+
+    Parameters
+    ----------
+    datas : Iterable[Data]
+        Data with the same headers
+
+    Returns
+    -------
+    Data
+        Rows of all the data, with the name and description of the first one
+
+    Raises
+    ------
+    ValueError
+        If there is no data or if headers differ.
+    """
+    datas = list(datas)
+    if not datas:
+        raise ValueError("No data to concatenate.")
+    _check_headers(datas, [f"data {index}" for index, _ in enumerate(datas)])
+    return Data(name=datas[0].name,
+                description=datas[0].description,
+                headers=datas[0].headers,
+                columns=[_concat_column(value_type, [data.column(name) for data in datas])
+                         for name, value_type in zip(datas[0].names, datas[0].types)])
+
+
+def _is_csv(filepath: Path) -> bool:
+    return format_suffix(filepath) == ".csv"
+
+
+def _read_file_header(filepath: Path, is_csv: bool = None) -> Data:
+    """Empty data defined by the header of a csv file or of a 'Salome Table', according to
+    the suffix of the file unless ``is_csv`` is given."""
+    if _is_csv(filepath) if is_csv is None else is_csv:
+        with open_file(filepath, mode='r', encoding='utf-8', newline='') as csv_file:
+            return _read_csv_header(csv.reader(csv_file))
+    with open_file(filepath, mode='r', encoding='utf-8') as ascii_file:
+        return _read_ascii_header(ascii_file)[0]
+
+
+def _copy_ascii_rows(filepath: Path, output: BinaryIO, buffer_size: int):
+    """Copy the lines of values of a 'Salome Table' as they are."""
+    last = b"\n"
+    with open_file(filepath, mode='rb') as binary_file:
+        for line in iter(binary_file.readline, b""):
+            if line.strip() and not line.startswith(b"#"):
+                output.write(line)
+                last = line[-1:]
+                break
+        for block in iter(functools.partial(binary_file.read, buffer_size), b""):
+            output.write(block)
+            last = block[-1:]
+    if last != b"\n":
+        output.write(b"\n")
+
+
+def _copy_csv_rows(filepath: Path, csv_writer, chunk_rows: int, first_index: int) -> int:
+    """Copy the rows of a csv file, numbered from ``first_index``, return their number."""
+    nb_rows = 0
+    with open_file(filepath, mode='r', encoding='utf-8', newline='') as csv_file:
+        csv_reader = csv.reader(csv_file)
+        _read_csv_header(csv_reader)
+        for rows in _batched(csv_reader, chunk_rows):
+            csv_writer.writerows([[index] + row[1:]
+                                  for index, row in enumerate(rows, first_index + nb_rows)])
+            nb_rows += len(rows)
+    return nb_rows
+
+
+def concat_files(filepaths: Iterable[Path], out_filepath: Path,
+                 chunk_rows: int = CHUNK_ROWS, buffer_size: int = BUFFER_SIZE):
+    """Concatenate the rows of several files without loading them.
+
+    Files are csv when their suffix is ``.csv`` and 'Salome Tables' otherwise, possibly
+    compressed. The headers
+    of all the files are checked before writing. Then the lines of values of a table
+    written as a table are copied byte for byte, the rows of a csv file written as csv are
+    renumbered, and the other files are converted by blocks of rows.
+
+    Parameters
+    ----------
+    filepaths : Iterable[Path]
+        Paths to files with the same headers
+    out_filepath : Path
+        Path to the written file, with the name and description of the first file
+    chunk_rows : int, optional
+        Number of rows converted at once, by default ``CHUNK_ROWS``
+    buffer_size : int, optional
+        Size in bytes of the file buffer and of the copied blocks, by default
+        ``BUFFER_SIZE``
+
+    Raises
+    ------
+    ValueError
+        If there is no file or if headers differ.
+    """
+    filepaths = list(filepaths)
+    if not filepaths:
+        raise ValueError("No file to concatenate.")
+    headers = [_read_file_header(filepath) for filepath in filepaths]
+    _check_headers(headers, [str(filepath) for filepath in filepaths])
+
+    nb_rows = 0
+    with io.TextIOWrapper(open_file(out_filepath, mode='wb', buffering=buffer_size),
+                          encoding='utf-8', newline='' if _is_csv(out_filepath) else None,
+                          write_through=True) as out_file:
+        csv_writer = csv.writer(out_file)
+        if _is_csv(out_filepath):
+            _write_csv_header(headers[0], csv_writer)
+        else:
+            _write_ascii_header(headers[0], out_file)
+        for filepath in filepaths:
+            if not _is_csv(out_filepath) and not _is_csv(filepath):
+                _copy_ascii_rows(filepath, out_file.buffer, buffer_size)
+            elif _is_csv(out_filepath) and _is_csv(filepath):
+                nb_rows += _copy_csv_rows(filepath, csv_writer, chunk_rows, nb_rows)
+            elif _is_csv(out_filepath):
+                for chunk in iter_ascii_chunks(filepath, chunk_rows):
+                    _write_csv_rows(chunk, out_file, chunk_rows, nb_rows)
+                    nb_rows += chunk.nb_rows
+            else:
+                for chunk in iter_csv_chunks(filepath, chunk_rows):
+                    _write_ascii_rows(chunk, out_file, chunk_rows)
@@ -0,0 +1,174 @@
+"""csv format for ``data.Data``.
+"""
+import csv
+from pathlib import Path
+from typing import Any, BinaryIO, Iterable, Iterator, List, TextIO, Tuple
+
+import numpy
+
+from . import _data_text
+from ._compression import open_file
+from ._data_parallel import read_file
+from .data import (BUFFER_SIZE, CHUNK_ROWS, Data, _column_formatters, _convert_blocks,
+                   _empty_like, _get_date, _iter_text_blocks, _new_data, _project)
+
+
+def data_to_csv(data: Data, filepath: Path, chunk_rows: int = CHUNK_ROWS,
+                buffer_size: int = BUFFER_SIZE, precision: int = None):
+    """Convert ``Data`` to csv.
+
+    Rows are formatted and written by blocks, so that memory does not depend on the number
+    of rows. The values of each header of a block are formatted at once.
+
+    Parameters
+    ----------
+    data : Data
+        data to dump
+    filepath : Path
+        Path to file, compressed when its suffix is ``.gz``, ``.bz2`` or ``.xz``
+    chunk_rows : int, optional
+        Number of rows formatted at once, by default ``CHUNK_ROWS``
+    buffer_size : int, optional
+        Size in bytes of the file buffer, by default ``BUFFER_SIZE``
+    precision : int, optional
+        Number of digits after the decimal point of the doubles, written as
+        ``%.{precision}e``, by default the shortest string read back as the same double
+    """
+    with open_file(filepath, mode='w', encoding='utf-8', newline='',
+                   buffering=buffer_size) as csv_file:
+        _write_csv_header(data, csv.writer(csv_file))
+        _write_csv_rows(data, csv_file, chunk_rows, precision=precision)
+
+
+def _write_csv_header(data: Data, csv_writer: Any):
+    """Write the header rows of a csv file defined by ``data``."""
+    csv_writer.writerow(["NAME", data.name])
+    csv_writer.writerow(["TITLE", data.description])
+    csv_writer.writerow(["DATE", _get_date()])
+    csv_writer.writerow(["COLUMN_NAMES"] + data.names)
+    csv_writer.writerow(["COLUMN_TYPES"] + data.types)
+    csv_writer.writerow(["COLUMN_TITLES"] + data.names)
+    csv_writer.writerow(["COLUMN_UNITS"] + data.units)
+
+
+def _write_csv_rows(data: Data, csv_file: TextIO, chunk_rows: int, first_index: int = 0,
+                    precision: int = None):
+    """Write the rows of ``data`` in a csv file opened without newline translation, by
+    blocks of ``chunk_rows``, numbered from ``first_index``, with doubles formatted by
+    ``_double_formatter(precision)``, as the ``csv`` module."""
+    formatters = _column_formatters(data, _data_text.quote_csv, precision)
+    for start, columns in _iter_text_blocks(data, chunk_rows, formatters):
+        indices = numpy.arange(first_index + start,
+                               first_index + start + min(chunk_rows, data.nb_rows - start))
+        csv_file.write(_data_text.join_texts([_data_text.format_integers(indices)] + columns,
+                                             ",", "\r\n"))
+
+
+def _read_csv_header(csv_reader: Iterator[List[str]]) -> Data:
+    """Read the header rows of a csv file written by ``data_to_csv``.
+
+    Parameters
+    ----------
+    csv_reader : Iterator[List[str]]
+        csv reader, left at the first row of values
+
+    Returns
+    -------
+    Data
+        Empty data defined by the header
+    """
+    header = [line for _, line in zip(range(7), csv_reader)]
+    name = header[0][1]
+    description = header[1][1]
+    # header[2] is the date and header[5] the titles
+    names = header[3][1:]
+    types = header[4][1:]
+    units = header[6][1:]
+    return _new_data(name, description, names, types, units)
+
+
+def _read_binary_csv_header(binary_file: BinaryIO) -> Tuple[Data, int]:
+    """Read the header of a csv file opened in binary mode.
+
+    Returns
+    -------
+    Tuple[Data, int]
+        Empty data defined by the header and position of the first row
+    """
+    position = binary_file.tell()
+    sizes = []
+
+    def lines():
+        for line in iter(binary_file.readline, b""):
+            sizes.append(len(line))
+            yield line.decode("utf-8")
+
+    header = _read_csv_header(csv.reader(lines()))
+    return header, position + sum(sizes)
+
+
+def _read_csv_lines(csv_file: TextIO) -> Tuple[Data, TextIO]:
+    """Read the header rows of a csv file, return the empty data they define and the file,
+    left at the first row of values."""
+    return _read_csv_header(csv.reader(csv_file)), csv_file
+
+
+def _parse_csv_lines(data: Data, lines: Iterable[str],
+                     indices: List[int]) -> Iterator[List[Any]]:
+    """Parse the lines of the rows of a csv file by blocks, see ``_data_parallel.Parser``."""
+    return _convert_blocks(data, (row[1:] for row in csv.reader(lines)), CHUNK_ROWS, indices)
+
+
+def iter_csv_chunks(filepath: Path, chunk_rows: int = CHUNK_ROWS,
+                    columns: List[str] = None) -> Iterator[Data]:
+    """Read csv by blocks of rows.
+
+    The header is parsed once and only one block of rows is held in memory at a time.
+
+    Parameters
+    ----------
+    filepath : Path
+        Path to file, compressed when its suffix is ``.gz``, ``.bz2`` or ``.xz``
+    chunk_rows : int, optional
+        Number of rows per block, by default ``CHUNK_ROWS``
+    columns : List[str], optional
+        Names of the headers to read, in this order, the values of the other headers are
+        neither converted nor stored, by default all the headers
+
+    Yields
+    ------
+    Data
+        Data of each block, with the name, description and headers of the file
+    """
+    with open_file(filepath, mode='r', encoding='utf-8') as csv_file:
+        csv_reader = csv.reader(csv_file)
+        header = _read_csv_header(csv_reader)
+        projected, indices = _project(header, columns)
+        for block in _convert_blocks(header, (line[1:] for line in csv_reader), chunk_rows,
+                                     indices):
+            chunk = _empty_like(projected)
+            chunk.extend_columns(block)
+            yield chunk
+
+
+def csv_to_data(filepath: Path, workers: int = 1, columns: List[str] = None) -> Data:
+    """Convert csv to ``Data``.
+
+    Parameters
+    ----------
+    filepath : Path
+        Path to file, compressed when its suffix is ``.gz``, ``.bz2`` or ``.xz``
+    workers : int, optional
+        Number of processes parsing the rows of an uncompressed file in parallel,
+        by default 1.
+        Values must then not contain line breaks.
+    columns : List[str], optional
+        Names of the headers to read, see ``iter_csv_chunks``
+
+    Returns
+    -------
+    Data
+        Loaded data
+    """
+    return read_file(filepath, _read_csv_lines, _read_binary_csv_header, _parse_csv_lines,
+                     workers, columns=columns)
@@ -0,0 +1,399 @@
+"""Datasets of results split into part files, described by a manifest.
+
+A dataset is a directory holding part files of at most ``part_rows`` rows each, in any
+registered format, and a ``_manifest`` directory describing them:
+
+- ``_manifest/schema.json``: name, description and headers of the dataset, format of its
+  parts;
+- ``_manifest/<part>.json``: one entry per part, with its file, its number of rows and the
+  minimum and maximum of each ``Data.Types.DOUBLE`` header.
+
+An entry is renamed into place once its part is written, so that several processes can add
+parts to the same dataset at once without locking it, and that readers only see complete
+parts. Readers skip the parts whose minimum and maximum cannot satisfy the conditions of a
+filter, then read the other parts in parallel.
+"""
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import json
+import os
+from pathlib import Path
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+import uuid
+
+import numpy
+
+from ._data_concat import _check_headers, concat
+from ._data_filter import _check_conditions, where_mask
+from ._data_formats import get_format
+from .data import Data, _empty_like, _project
+
+PART_ROWS = 1_000_000
+"""Default maximum number of rows of each part of a dataset."""
+
+MANIFEST = "_manifest"
+"""Name of the directory of the manifest in a dataset."""
+
+_MAY_MATCH = {
+    "==": lambda low, high, value: low <= value <= high,
+    "!=": lambda low, high, value: not low == high == value,
+    "<": lambda low, high, value: low < value,
+    "<=": lambda low, high, value: low <= value,
+    ">": lambda low, high, value: high > value,
+    ">=": lambda low, high, value: high >= value,
+}
+"""Whether values between a minimum and a maximum may satisfy each operator."""
+
+
+def _write_json(filepath: Path, content: Dict[str, Any]) -> Path:
+    """Write a json file under a temporary name in its directory, return this name."""
+    temporary = filepath.with_name(f".{filepath.name}.{uuid.uuid4().hex}.tmp")
+    with temporary.open(mode="w", encoding="utf-8") as json_file:
+        json.dump(content, json_file, indent=2)
+    return temporary
+
+
+def _statistics(data: Data) -> Dict[str, List[float]]:
+    """Minimum and maximum of each ``Data.Types.DOUBLE`` header, None when unknown as
+    with ``nan`` values."""
+    statistics = {}
+    for name, value_type in zip(data.names, data.types):
+        if value_type == Data.Types.DOUBLE:
+            values = data.column(name)
+            low, high = (values.min(), values.max()) if len(values) else (numpy.nan,) * 2
+            statistics[name] = None if numpy.isnan(low) else [float(low), float(high)]
+    return statistics
+
+
+def read_manifest(directory: Path) -> Dict[str, Any]:
+    """Read the manifest of a dataset.
+
+    Parameters
+    ----------
+    directory : Path
+        Path to the directory of the dataset
+
+    Returns
+    -------
+    Dict[str, Any]
+        ``name``, ``description``, ``headers`` (``name``, ``type`` and ``unit`` of each
+        header) and ``format`` of the dataset, and its ``parts`` in the order in which they
+        were written: ``file``, ``nb_rows`` and ``statistics``, the ``[minimum, maximum]``
+        of each ``Data.Types.DOUBLE`` header, None when unknown
+
+    Raises
+    ------
+    ValueError
+        If ``directory`` is not a dataset.
+    """
+    schema = directory / MANIFEST / "schema.json"
+    if not schema.is_file():
+        raise ValueError(f"{directory} is not a dataset, {schema} is missing.")
+    with schema.open(encoding="utf-8") as json_file:
+        manifest = json.load(json_file)
+    manifest["parts"] = []
+    for entry in sorted((directory / MANIFEST).glob("part-*.json")):
+        with entry.open(encoding="utf-8") as json_file:
+            manifest["parts"].append(json.load(json_file))
+    return manifest
+
+
+def _manifest_header(manifest: Dict[str, Any]) -> Data:
+    """Data without rows with the name, description and headers of a manifest."""
+    return Data(name=manifest["name"], description=manifest["description"],
+                headers=[Data.Header(name=header["name"], value_type=header["type"],
+                                     value_unit=header["unit"])
+                         for header in manifest["headers"]])
+
+
+class DatasetWriter:
+    """Add the rows of a dataset as parts of at most ``part_rows`` rows.
+
+    The dataset is created with the headers of ``data`` when it does not exist. Rows are
+    buffered until a part is full; the last part is written when the writer is closed. Other
+    writers, in this process or others, may add parts to the same dataset at the same time.
+    Use it as a context manager to write the last part.
+    """
+
+    def __init__(self, directory: Path, data: Data, *,
+                 part_rows: int = PART_ROWS, data_format: str = None, **options: Any) -> None:
+        """Constructor.
+
+        Parameters
+        ----------
+        directory : Path
+            Path to the directory of the dataset, created if needed
+        data : Data
+            Data defining the name, description and headers of a new dataset, its rows are
+            not written
+        part_rows : int, optional
+            Maximum number of rows of each part, by default ``PART_ROWS``
+        data_format : str, optional
+            Name of the format of the parts of a new dataset, by default ``"binary"``
+        **options : Any
+            Options of the writer of the format of the parts, such as ``precision``
+
+        Raises
+        ------
+        ValueError
+            If ``part_rows`` is not positive, if the format is unknown, or if the headers or
+            the format of an existing dataset differ from those given.
+        """
+        if part_rows < 1:
+            raise ValueError(f"part_rows must be positive, got {part_rows}.")
+        (directory / MANIFEST).mkdir(parents=True, exist_ok=True)
+        schema = directory / MANIFEST / "schema.json"
+        if not schema.is_file():
+            temporary = _write_json(schema, {
+                "name": data.name, "description": data.description,
+                "headers": [{"name": name, "type": value_type, "unit": unit}
+                            for name, value_type, unit in zip(data.names, data.types,
+                                                              data.units)],
+                "format": get_format(directory, data_format or "binary").name})
+            try:
+                # fails when another writer created the dataset meanwhile
+                os.link(temporary, schema)
+            except FileExistsError:
+                pass
+            finally:
+                temporary.unlink()
+        manifest = read_manifest(directory)
+        _check_headers([_manifest_header(manifest), data],
+                       [f"dataset {directory}", f"data '{data.name}'"])
+        if data_format not in (None, manifest["format"]):
+            raise ValueError(f"Parts of dataset {directory} are in format "
+                             f"'{manifest['format']}', not '{data_format}'.")
+
+        self._directory: Path = directory
+        self._header: Data = _empty_like(data)
+        self._part_rows: int = part_rows
+        self._format: Any = get_format(directory, manifest["format"])
+        self._options: Dict[str, Any] = options
+        self._buffered: List[Data] = []
+        self._nb_buffered: int = 0
+        self._parts: List[str] = []
+        self._nb_rows: int = 0
+
+    def __enter__(self) -> 'DatasetWriter':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    @property
+    def directory(self) -> Path:
+        """Path to the directory of the dataset"""
+        return self._directory
+
+    @property
+    def nb_rows(self) -> int:
+        """Number of rows added by this writer"""
+        return self._nb_rows
+
+    @property
+    def parts(self) -> List[str]:
+        """Names of the files of the parts written by this writer"""
+        return list(self._parts)
+
+    def append(self, rows: List[List[float or str or List[float]]] or numpy.ndarray or Data):
+        """Add a batch of rows to the dataset, writing each part once full.
+
+        Parameters
+        ----------
+        rows : List[List[float or str or List[float]]] or numpy.ndarray or Data
+            Rows of values, see ``Data.add_rows``, or data with the headers of the dataset
+
+        Raises
+        ------
+        ValueError
+            If the values do not match the headers of the dataset.
+        """
+        if isinstance(rows, Data):
+            _check_headers([self._header, rows],
+                           [f"dataset {self._directory}", f"data '{rows.name}'"])
+            chunk = rows
+        else:
+            chunk = _empty_like(self._header)
+            chunk.add_rows(rows)
+        if not chunk.nb_columns or not chunk.nb_rows:
+            return
+        self._buffered.append(chunk)
+        self._nb_buffered += chunk.nb_rows
+        self._nb_rows += chunk.nb_rows
+        if self._nb_buffered >= self._part_rows:
+            pending = concat([self._header] + self._buffered)
+            full = self._nb_buffered - self._nb_buffered % self._part_rows
+            for start in range(0, full, self._part_rows):
+                self._write_part(pending.take(slice(start, start + self._part_rows)))
+            self._buffered = [pending.take(slice(full, None))] if full < pending.nb_rows else []
+            self._nb_buffered -= full
+
+    def _write_part(self, part: Data):
+        """Write the file of a part, then its entry in the manifest."""
+        # names sort in the order of writing
+        name = f"part-{time.time_ns():020d}-{uuid.uuid4().hex[:8]}"
+        filename = f"{name}{self._format.suffixes[0]}"
+        self._format.write(part, self._directory / filename, **self._options)
+        entry = self._directory / MANIFEST / f"{name}.json"
+        os.replace(_write_json(entry, {"file": filename, "nb_rows": part.nb_rows,
+                                       "statistics": _statistics(part)}), entry)
+        self._parts.append(filename)
+
+    def close(self):
+        """Write the buffered rows as the last part."""
+        if self._buffered:
+            self._write_part(concat([self._header] + self._buffered))
+            self._buffered = []
+            self._nb_buffered = 0
+
+
+def write_dataset(data: Data, directory: Path, part_rows: int = PART_ROWS,
+                  data_format: str = None, **options: Any):
+    """Add the rows of ``data`` to a dataset, see ``DatasetWriter``.
+
+    The rows are added to the parts of an existing dataset, which is not replaced.
+
+    Parameters
+    ----------
+    data : Data
+        data to dump
+    directory : Path
+        Path to the directory of the dataset, created if needed
+    part_rows : int, optional
+        Maximum number of rows of each part, by default ``PART_ROWS``
+    data_format : str, optional
+        Name of the format of the parts of a new dataset, by default ``"binary"``
+    **options : Any
+        Options of the writer of the format of the parts
+    """
+    write_dataset_chunks(data, [data], directory, part_rows, data_format, **options)
+
+
+def write_dataset_chunks(header: Data,  # pylint: disable=too-many-arguments
+                         chunks: Iterable[Data], directory: Path, part_rows: int = PART_ROWS,
+                         data_format: str = None, **options: Any):
+    """Add blocks of rows to a dataset, see ``write_dataset``.
+
+    Parameters
+    ----------
+    header : Data
+        Data defining the name, description and headers of a new dataset
+    chunks : Iterable[Data]
+        Blocks of rows, with the headers of ``header``
+    directory : Path
+        Path to the directory of the dataset, created if needed
+    part_rows : int, optional
+        Maximum number of rows of each part, by default ``PART_ROWS``
+    data_format : str, optional
+        Name of the format of the parts of a new dataset, by default ``"binary"``
+    **options : Any
+        Options of the writer of the format of the parts, such as ``chunk_rows``
+    """
+    with DatasetWriter(directory, header, part_rows=part_rows, data_format=data_format,
+                       **options) as writer:
+        for chunk in chunks:
+            writer.append(chunk)
+
+
+def _read_part(filepath: Path, data_format: str, columns: List[str],
+               conditions: List[Tuple[str, str, Any]]) -> Data:
+    """Read the rows of a part satisfying the conditions, keeping the headers of
+    ``columns``."""
+    read_columns = list(dict.fromkeys(columns + [name for name, _, _ in conditions]))
+    part = get_format(filepath, data_format).read(filepath, columns=read_columns)
+    if conditions:
+        part = part.where(where_mask(part, conditions))
+    return part.select(columns)
+
+
+def _selected_parts(directory: Path, where: List[Tuple[str, str, Any]] = None,
+                    columns: List[str] = None) -> Tuple[Data, Dict[str, Any]]:
+    """Header of a dataset, projected on ``columns``, and its manifest keeping only the
+    parts whose statistics may satisfy the conditions of ``where``."""
+    manifest = read_manifest(directory)
+    header = _manifest_header(manifest)
+    where = list(where or [])
+    _check_conditions(header, where)
+    projected, _ = _project(header, columns)
+    parts = []
+    for part in manifest["parts"]:
+        statistics = part["statistics"]
+        if all(_MAY_MATCH[symbol](*statistics[name], float(value))
+               for name, symbol, value in where if statistics.get(name) is not None):
+            parts.append(part)
+    manifest["parts"] = parts
+    return projected, manifest
+
+
+def read_dataset(directory: Path, where: List[Tuple[str, str, Any]] = None,
+                 columns: List[str] = None, workers: int = 1) -> Data:
+    """Read the rows of a dataset, possibly filtered.
+
+    Parts whose minimum and maximum of a ``Data.Types.DOUBLE`` header cannot satisfy a
+    condition are not read.
+
+    Parameters
+    ----------
+    directory : Path
+        Path to the directory of the dataset
+    where : List[Tuple[str, str, Any]], optional
+        Conditions ``(name, operator, value)`` satisfied by all the returned rows, with an
+        operator among ``==``, ``!=``, ``<``, ``<=``, ``>`` and ``>=``, such as
+        ``[("pi", ">", 3.14)]``, by default all the rows
+    columns : List[str], optional
+        Names of the headers to read, in this order, by default all the headers
+    workers : int, optional
+        Number of parts read in parallel, by threads for memory-mapped formats and by
+        processes for the others, by default 1
+
+    Returns
+    -------
+    Data
+        Rows of the parts, in the order in which they were written, with the name,
+        description and headers of the dataset
+
+    Raises
+    ------
+    ValueError
+        If ``directory`` is not a dataset, if a header does not exist or if a condition
+        compares a ``Data.Types.VECTOR`` header or uses an unknown operator.
+    """
+    header, manifest = _selected_parts(directory, where, columns)
+    arguments = [(directory / part["file"], manifest["format"], header.names, list(where or []))
+                 for part in manifest["parts"]]
+    if workers > 1 and len(arguments) > 1:
+        executor = (ThreadPoolExecutor if get_format(directory, manifest["format"]).memory_mapped
+                    else ProcessPoolExecutor)
+        with executor(max_workers=min(workers, len(arguments))) as pool:
+            parts = list(pool.map(_read_part, *zip(*arguments)))
+    else:
+        parts = [_read_part(*part_arguments) for part_arguments in arguments]
+    return concat([header] + parts)
+
+
+def iter_dataset_chunks(directory: Path, chunk_rows: int, columns: List[str] = None,
+                        where: List[Tuple[str, str, Any]] = None) -> Iterator[Data]:
+    """Read a dataset part by part, by blocks of rows.
+
+    Parameters
+    ----------
+    directory : Path
+        Path to the directory of the dataset
+    chunk_rows : int
+        Maximum number of rows per block
+    columns : List[str], optional
+        Names of the headers to read, in this order, by default all the headers
+    where : List[Tuple[str, str, Any]], optional
+        Conditions satisfied by all the rows, see ``read_dataset``
+
+    Yields
+    ------
+    Data
+        Data of each block, with the name, description and headers of the dataset
+    """
+    header, manifest = _selected_parts(directory, where, columns)
+    for part in manifest["parts"]:
+        data = _read_part(directory / part["file"], manifest["format"], header.names,
+                          list(where or []))
+        for start in range(0, data.nb_rows if data.nb_columns else 0, chunk_rows):
+            yield data.take(slice(start, start + chunk_rows))
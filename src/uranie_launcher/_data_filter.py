@@ -0,0 +1,66 @@
+"""Filters of the rows of ``data.Data`` by conditions comparing headers to values, such as
+``("pi", ">", 3.14)``, shared by the readers of datasets and the conversion script.
+"""
+import operator
+from typing import Any, List, Tuple
+
+import numpy
+
+from .data import Data
+
+OPERATORS = {
+    "==": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+}
+"""Comparison of each operator of the conditions."""
+
+
+def _check_conditions(data: Data, conditions: List[Tuple[str, str, Any]]):
+    """Check that conditions compare headers of scalars of ``data`` with known operators.
+
+    Raises
+    ------
+    ValueError
+        If a header does not exist, if a condition compares a ``Data.Types.VECTOR`` header
+        or uses an unknown operator.
+    """
+    for name, symbol, value in conditions:
+        value_type = data.types[data.schema.index(name)]
+        if value_type == Data.Types.VECTOR or symbol not in OPERATORS:
+            raise ValueError(f"Invalid condition '{name} {symbol} {value}', expected a header "
+                             f"of scalars and an operator among {list(OPERATORS)}.")
+
+
+def where_mask(data: Data, conditions: List[Tuple[str, str, Any]]) -> numpy.ndarray:
+    """Rows of a data satisfying all the conditions, to be passed to ``Data.where``.
+
+    Parameters
+    ----------
+    data : Data
+        Filtered data
+    conditions : List[Tuple[str, str, Any]]
+        Conditions ``(name, operator, value)``, with an operator among ``OPERATORS``, such
+        as ``[("pi", ">", 3.14)]``; values given as strings are converted to the type of
+        the header
+
+    Returns
+    -------
+    numpy.ndarray
+        One boolean per row, ``True`` when the row satisfies all the conditions
+
+    Raises
+    ------
+    ValueError
+        If a header does not exist, if a condition compares a ``Data.Types.VECTOR`` header
+        or uses an unknown operator.
+    """
+    _check_conditions(data, conditions)
+    mask = numpy.ones(data.nb_rows if data.nb_columns else 0, dtype=bool)
+    for name, symbol, value in conditions:
+        value_type = data.types[data.schema.index(name)]
+        mask &= OPERATORS[symbol](data.column(name), Data.Types.convert(value, value_type))
+    return mask
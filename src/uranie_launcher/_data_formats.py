@@ -0,0 +1,370 @@
+"""Registry of the file formats of ``data.Data``, used by ``load`` and ``save``.
+
+The functions of a format may be given as ``"module:function"`` strings: the module is then
+imported only when the format is first used.
+"""
+import importlib
+import itertools
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Tuple
+
+from ._compression import format_suffix, open_file
+from .data import CHUNK_ROWS, Data, _empty_like
+
+MAGIC_SIZE = 64
+"""Number of bytes read at the start of a file to detect its format."""
+
+
+def _resolve(function: Callable or str) -> Callable:
+    """Import a function given as ``"module:function"``, relative to this package."""
+    if not isinstance(function, str):
+        return function
+    module, name = function.split(":")
+    return getattr(importlib.import_module(module, __package__), name)
+
+
+class DataFormat:
+    """Class defining a file format of ``Data``."""
+
+    def __init__(self,  # pylint: disable=too-many-arguments
+                 name: str, suffixes: List[str],
+                 reader: Callable or str, writer: Callable or str, *,
+                 chunk_reader: Callable or str = None, chunk_writer: Callable or str = None,
+                 magic: bytes = b"", memory_mapped: bool = False) -> None:
+        """Constructor.
+
+        Parameters
+        ----------
+        name : str
+            Name of the format, such as ``"csv"``
+        suffixes : List[str]
+            Suffixes of the files in this format, such as ``[".csv"]``
+        reader : Callable or str
+            Function ``reader(filepath, **options) -> Data``, or ``"module:function"``;
+            the option ``columns`` lists the names of the headers to read
+        writer : Callable or str
+            Function ``writer(data, filepath, **options)``, or ``"module:function"``
+        chunk_reader : Callable or str, optional
+            Function ``chunk_reader(filepath, chunk_rows, columns=None) -> Iterator[Data]``
+            reading the file by blocks of rows, or ``"module:function"``, by default None
+        chunk_writer : Callable or str, optional
+            Function ``chunk_writer(header, chunks, filepath, **options)`` writing the rows
+            of an iterable of ``Data`` with the headers of ``header`` one block at a time,
+            or ``"module:function"``, by default None
+        magic : bytes, optional
+            First bytes of the files, blanks excepted, by default no detection
+        memory_mapped : bool, optional
+            Whether ``reader`` maps the file in memory instead of reading it, by default
+            False; files are then read by blocks by slicing the mapped data instead of with
+            ``chunk_reader``, and parts of datasets are read by threads
+        """
+        self._name: str = name
+        self._suffixes: List[str] = list(suffixes)
+        self._functions: Dict[str, Callable or str] = {
+            "reader": reader, "writer": writer, "chunk_reader": chunk_reader,
+            "chunk_writer": chunk_writer}
+        self._magic: bytes = magic
+        self._memory_mapped: bool = memory_mapped
+
+    @property
+    def name(self) -> str:
+        """Name of the format"""
+        return self._name
+
+    @property
+    def suffixes(self) -> List[str]:
+        """Suffixes of the files in this format"""
+        return list(self._suffixes)
+
+    @property
+    def magic(self) -> bytes:
+        """First bytes of the files, blanks excepted"""
+        return self._magic
+
+    @property
+    def streaming(self) -> bool:
+        """Whether files can be read by blocks of rows"""
+        return self._functions["chunk_reader"] is not None
+
+    @property
+    def streaming_writer(self) -> bool:
+        """Whether files can be written by blocks of rows"""
+        return self._functions["chunk_writer"] is not None
+
+    @property
+    def memory_mapped(self) -> bool:
+        """Whether files are mapped in memory instead of read"""
+        return self._memory_mapped
+
+    def _function(self, key: str) -> Callable:
+        self._functions[key] = _resolve(self._functions[key])
+        return self._functions[key]
+
+    def read(self, filepath: Path, **options) -> Data:
+        """Read a file, see ``load``."""
+        return self._function("reader")(filepath, **options)
+
+    def write(self, data: Data, filepath: Path, **options):
+        """Write a file, see ``save``."""
+        self._function("writer")(data, filepath, **options)
+
+    def iter_chunks(self, filepath: Path, chunk_rows: int, columns: List[str] = None,
+                    **options) -> Iterator[Data]:
+        """Read a file by blocks of rows, see ``iter_chunks``."""
+        if columns is not None:
+            options["columns"] = columns
+        # slicing a mapped file reads only the pages of each block, without parsing
+        if self.streaming and not self.memory_mapped:
+            yield from self._function("chunk_reader")(filepath, chunk_rows, **options)
+            return
+        data = self.read(filepath, **options)
+        for start in range(0, data.nb_rows if data.nb_columns else 0, chunk_rows):
+            yield data.take(slice(start, start + chunk_rows))
+
+    def write_chunks(self, header: Data, chunks: Iterable[Data], filepath: Path, **options):
+        """Write blocks of rows to a file, see ``save_chunks``."""
+        if self.streaming_writer:
+            self._function("chunk_writer")(header, chunks, filepath, **options)
+            return
+        data = _empty_like(header)
+        for chunk in chunks:
+            data.extend_columns([chunk.column(name) for name in header.names])
+        self.write(data, filepath, **options)
+
+
+_FORMATS: Dict[str, DataFormat] = {data_format.name: data_format for data_format in [
+    DataFormat("ascii", [".dat", ".txt"], "._data_ascii:ascii_to_data",
+               "._data_ascii:data_to_ascii", chunk_reader="._data_ascii:iter_ascii_chunks",
+               chunk_writer="._data_writer:write_ascii_chunks", magic=b"#"),
+    DataFormat("csv", [".csv"], "._data_csv:csv_to_data", "._data_csv:data_to_csv",
+               chunk_reader="._data_csv:iter_csv_chunks",
+               chunk_writer="._data_writer:write_csv_chunks", magic=b"NAME,"),
+    DataFormat("json", [".json"], "._data_json:json_to_data", "._data_json:data_to_json",
+               chunk_reader="._data_json:iter_json_chunks",
+               chunk_writer="._data_json:write_json_chunks", magic=b"{"),
+    DataFormat("binary", [".bin"], "._data_binary:binary_to_data",
+               "._data_binary:data_to_binary", chunk_writer="._data_binary:write_binary_chunks",
+               magic=b"ULDATA", memory_mapped=True),
+    DataFormat("dataset", [".dataset"], "._data_dataset:read_dataset",
+               "._data_dataset:write_dataset", chunk_reader="._data_dataset:iter_dataset_chunks",
+               chunk_writer="._data_dataset:write_dataset_chunks"),
+]}
+"""Registered formats by name."""
+
+
+def register_format(data_format: DataFormat, replace: bool = False):
+    """Register a file format used by ``load`` and ``save``.
+
+    Parameters
+    ----------
+    data_format : DataFormat
+        Format to register
+    replace : bool, optional
+        Whether the format replaces the format of the same name and the formats of its
+        suffixes, by default False
+
+    Raises
+    ------
+    ValueError
+        If the name or a suffix of the format is already registered and ``replace`` is
+        False.
+    """
+    conflicts = [name for name, registered in _FORMATS.items()
+                 if name == data_format.name or set(registered.suffixes) & set(
+                     data_format.suffixes)]
+    if conflicts and not replace:
+        raise ValueError(f"Format '{data_format.name}' conflicts with the registered formats "
+                         f"{conflicts}, use replace=True to replace them.")
+    for name in conflicts:
+        del _FORMATS[name]
+    _FORMATS[data_format.name] = data_format
+
+
+def formats() -> List[DataFormat]:
+    """Registered file formats.
+
+    Returns
+    -------
+    List[DataFormat]
+        Formats in the order of registration
+    """
+    return list(_FORMATS.values())
+
+
+def get_format(filepath: Path, data_format: str = None) -> DataFormat:
+    """Find the format of a file.
+
+    The format is detected from the suffix of the file, ignoring the suffix of its
+    compression, or from its first bytes when the suffix is unknown.
+
+    Parameters
+    ----------
+    filepath : Path
+        Path to file
+    data_format : str, optional
+        Name of the format, by default detected
+
+    Returns
+    -------
+    DataFormat
+        Format of the file
+
+    Raises
+    ------
+    ValueError
+        If the format is unknown or cannot be detected.
+    """
+    if data_format is not None:
+        if data_format not in _FORMATS:
+            raise ValueError(f"Unknown format '{data_format}', expected one of "
+                             f"{list(_FORMATS)}.")
+        return _FORMATS[data_format]
+    for registered in _FORMATS.values():
+        if format_suffix(filepath) in registered.suffixes:
+            return registered
+    if filepath.is_file():
+        with open_file(filepath, mode="rb") as binary_file:
+            head = binary_file.read(MAGIC_SIZE).lstrip()
+        for registered in _FORMATS.values():
+            if registered.magic and head.startswith(registered.magic):
+                return registered
+    suffixes = [suffix for registered in _FORMATS.values() for suffix in registered.suffixes]
+    raise ValueError(f"Cannot detect the format of {filepath}, expected a suffix among "
+                     f"{suffixes}.")
+
+
+def load(filepath: Path, data_format: str = None, **options: Any) -> Data:
+    """Read a file in any registered format.
+
+    Parameters
+    ----------
+    filepath : Path
+        Path to file, possibly compressed
+    data_format : str, optional
+        Name of the format, by default detected by ``get_format``
+    **options : Any
+        Options of the reader of the format, such as ``workers`` or ``columns``
+
+    Returns
+    -------
+    Data
+        Loaded data
+    """
+    return get_format(filepath, data_format).read(filepath, **options)
+
+
+def iter_chunks(filepath: Path, chunk_rows: int = CHUNK_ROWS, data_format: str = None,
+                columns: List[str] = None, **options: Any) -> Iterator[Data]:
+    """Read a file in any registered format by blocks of rows.
+
+    Formats mapping their files in memory, and those not supporting streaming, are loaded
+    and sliced without copy, the others are read block by block.
+
+    Parameters
+    ----------
+    filepath : Path
+        Path to file, possibly compressed
+    chunk_rows : int, optional
+        Number of rows per block, by default ``CHUNK_ROWS``
+    data_format : str, optional
+        Name of the format, by default detected by ``get_format``
+    columns : List[str], optional
+        Names of the headers to read, in this order, by default all the headers
+    **options : Any
+        Other options of the readers of the format, such as ``where`` for a dataset
+
+    Yields
+    ------
+    Data
+        Data of each block, with the name, description and headers of the file
+    """
+    yield from get_format(filepath, data_format).iter_chunks(filepath, chunk_rows, columns,
+                                                             **options)
+
+
+def read_chunks(filepath: Path, chunk_rows: int = CHUNK_ROWS, data_format: str = None,
+                columns: List[str] = None, **options: Any) -> Tuple[Data, Iterator[Data]]:
+    """Read the headers of a file in any registered format, and its rows by blocks.
+
+    Parameters
+    ----------
+    filepath : Path
+        Path to file, possibly compressed
+    chunk_rows : int, optional
+        Number of rows per block, by default ``CHUNK_ROWS``
+    data_format : str, optional
+        Name of the format, by default detected by ``get_format``
+    columns : List[str], optional
+        Names of the headers to read, in this order, by default all the headers
+    **options : Any
+        Other options of the readers of the format, such as ``where`` for a dataset
+
+    Returns
+    -------
+    Tuple[Data, Iterator[Data]]
+        Data with the name, description and headers of the file, which is its first block
+        or the data of the file when it has no row, and the blocks of rows, as
+        ``iter_chunks``
+    """
+    data_format = get_format(filepath, data_format)
+    chunks = data_format.iter_chunks(filepath, chunk_rows, columns, **options)
+    first = next(chunks, None)
+    if first is None:
+        if columns is not None:
+            options["columns"] = columns
+        return data_format.read(filepath, **options), iter([])
+    return first, itertools.chain([first], chunks)
+
+
+def save(data: Data, filepath: Path, data_format: str = None, **options: Any):
+    """Write a file in any registered format.
+
+    Parameters
+    ----------
+    data : Data
+        data to dump
+    filepath : Path
+        Path to file, compressed when its suffix is ``.gz``, ``.bz2`` or ``.xz``
+    data_format : str, optional
+        Name of the format, by default detected from the suffix of ``filepath``
+    **options : Any
+        Options of the writer of the format, such as ``chunk_rows``
+    """
+    get_format(filepath, data_format).write(data, filepath, **options)
+
+
+def save_chunks(chunks: Iterable[Data], filepath: Path, header: Data = None,
+                data_format: str = None, **options: Any):
+    """Write blocks of rows to a file in any registered format.
+
+    Formats supporting streaming are written block by block, so that a file larger than
+    the memory can be converted with ``iter_chunks``, the blocks are concatenated for the
+    others.
+
+    Parameters
+    ----------
+    chunks : Iterable[Data]
+        Blocks of rows with the same headers
+    filepath : Path
+        Path to file, compressed when its suffix is ``.gz``, ``.bz2`` or ``.xz``
+    header : Data, optional
+        Data defining the name, description and headers of the file, by default the first
+        block
+    data_format : str, optional
+        Name of the format, by default detected from the suffix of ``filepath``
+    **options : Any
+        Options of the writer of the format, such as ``chunk_rows``
+
+    Raises
+    ------
+    ValueError
+        If there is neither header nor block.
+    """
+    data_format = get_format(filepath, data_format)
+    chunks = iter(chunks)
+    if header is None:
+        header = next(chunks, None)
+        if header is None:
+            raise ValueError(f"No header nor rows to write to {filepath}.")
+        chunks = itertools.chain([header], chunks)
+    data_format.write_chunks(header, chunks, filepath, **options)
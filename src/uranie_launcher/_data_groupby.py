@@ -0,0 +1,235 @@
+"""Aggregation of the rows of ``data.Data`` grouped by the values of key headers.
+
+Each key header is numbered by ``numpy.unique``, then the rows are sorted once by group, so
+that each aggregation is computed for all the groups at once by ``numpy.ufunc.reduceat`` on
+the sorted values, and quantiles are read in the values sorted within each group.
+"""
+from typing import Any, Dict, List, Tuple
+
+import numpy
+
+from . import _columns
+from .data import Data
+
+AGGREGATIONS = ("count", "sum", "mean", "std", "var", "min", "max", "median", "first", "last")
+"""Names of the aggregations of ``GroupBy.agg``, which also accepts quantiles as floats."""
+
+_ANY_TYPE_AGGREGATIONS = ("count", "first", "last")
+"""Aggregations of headers of any type, the others need ``Data.Types.DOUBLE`` values."""
+
+
+def _squared(unit: str) -> str:
+    """Unit of a variance."""
+    if not unit:
+        return ""
+    return f"{unit}^2" if unit.isidentifier() else f"({unit})^2"
+
+
+def _result_header(header: Data.Header, aggregation: Any) -> Data.Header:
+    """Header of the values of an aggregation of the values of ``header``."""
+    if aggregation == "count":
+        return Data.Header(f"{header.name}_count", Data.Types.DOUBLE, "")
+    if aggregation in ("first", "last"):
+        return Data.Header(f"{header.name}_{aggregation}", header.value_type,
+                           header.value_unit)
+    if aggregation == "var":
+        return Data.Header(f"{header.name}_var", Data.Types.DOUBLE, _squared(header.value_unit))
+    if isinstance(aggregation, str):
+        return Data.Header(f"{header.name}_{aggregation}", Data.Types.DOUBLE, header.value_unit)
+    return Data.Header(f"{header.name}_q{aggregation:g}", Data.Types.DOUBLE, header.value_unit)
+
+
+def _check_aggregation(header: Data.Header, aggregation: Any):
+    """Check an aggregation of the values of ``header``.
+
+    Raises
+    ------
+    ValueError
+        If the aggregation is unknown, or needs doubles and ``header`` is not
+        ``Data.Types.DOUBLE``.
+    """
+    if isinstance(aggregation, str):
+        if aggregation not in AGGREGATIONS:
+            raise ValueError(f"Unknown aggregation '{aggregation}', expected one of "
+                             f"{list(AGGREGATIONS)} or a quantile between 0 and 1.")
+    elif not isinstance(aggregation, float) or not 0.0 <= aggregation <= 1.0:
+        raise ValueError(f"Invalid quantile {aggregation}, expected a float between 0 and 1.")
+    if header.value_type != Data.Types.DOUBLE and aggregation not in _ANY_TYPE_AGGREGATIONS:
+        raise ValueError(f"Cannot compute '{aggregation}' of '{header.name}' of type "
+                         f"'{header.value_type}', expected one of "
+                         f"{list(_ANY_TYPE_AGGREGATIONS)}.")
+
+
+class GroupBy:
+    """Rows of a ``Data`` grouped by the values of key headers, see ``Data.groupby``.
+
+    Groups are sorted by the values of the keys, in the order of the keys. ``nan`` values
+    of a ``Data.Types.DOUBLE`` key form one group.
+    """
+
+    def __init__(self, data: Data, keys: List[str]) -> None:
+        """Constructor.
+
+        Parameters
+        ----------
+        data : Data
+            Grouped data
+        keys : List[str]
+            Names of the ``Data.Types.DOUBLE`` or ``Data.Types.STRING`` headers whose values
+            define the groups
+
+        Raises
+        ------
+        ValueError
+            If there is no key, if a key does not exist or if it is a ``Data.Types.VECTOR``
+            header.
+        """
+        if not keys:
+            raise ValueError("Expected at least one key header.")
+        for key in keys:
+            value_type = data.types[data.schema.index(key)]
+            if value_type == Data.Types.VECTOR:
+                raise ValueError(f"Cannot group by '{key}' of type '{value_type}', expected "
+                                 f"'{Data.Types.DOUBLE}' or '{Data.Types.STRING}'.")
+        self._data: Data = data
+        self._keys: List[str] = list(keys)
+
+        nb_rows = data.nb_rows if data.nb_columns else 0
+        groups = numpy.zeros(nb_rows, dtype="int64")
+        for key in keys:
+            distinct, codes = numpy.unique(data.column(key), return_inverse=True)
+            # renumbered after each key, so that numbers stay below the number of rows
+            _, groups = numpy.unique(groups * len(distinct) + codes.reshape(-1),
+                                     return_inverse=True)
+        groups = groups.reshape(-1)
+        self._groups: numpy.ndarray = groups
+        self._order: numpy.ndarray = numpy.argsort(groups, kind="stable")
+        self._counts: numpy.ndarray = numpy.bincount(groups)
+        self._starts: numpy.ndarray = numpy.cumsum(self._counts) - self._counts
+
+    @property
+    def keys(self) -> List[str]:
+        """Names of the key headers"""
+        return list(self._keys)
+
+    @property
+    def nb_groups(self) -> int:
+        """Number of groups"""
+        return len(self._counts)
+
+    def _first_rows(self) -> numpy.ndarray:
+        return self._order[self._starts]
+
+    def _last_rows(self) -> numpy.ndarray:
+        return self._order[self._starts + self._counts - 1]
+
+    def _reduce(self, ufunc: numpy.ufunc, values: numpy.ndarray) -> numpy.ndarray:
+        """Reduction of the values of each group."""
+        if not self.nb_groups:
+            return values[:0]
+        return ufunc.reduceat(values[self._order], self._starts)
+
+    def _quantile(self, values: numpy.ndarray, quantile: float) -> numpy.ndarray:
+        """Quantile of the values of each group, interpolated as ``numpy.quantile``, ``nan``
+        when the group contains ``nan``."""
+        ordered = values[numpy.lexsort((values, self._groups))]
+        positions = self._starts + quantile * (self._counts - 1)
+        lower = numpy.floor(positions).astype("int64")
+        upper = numpy.ceil(positions).astype("int64")
+        result = ordered[lower] + (positions - lower) * (ordered[upper] - ordered[lower])
+        result[self._reduce(numpy.logical_or, numpy.isnan(values))] = numpy.nan
+        return result
+
+    def _count(self, _: Any) -> numpy.ndarray:
+        return self._counts.astype("float64")
+
+    def _sum(self, values: numpy.ndarray) -> numpy.ndarray:
+        return self._reduce(numpy.add, values)
+
+    def _mean(self, values: numpy.ndarray) -> numpy.ndarray:
+        return self._sum(values) / self._counts
+
+    def _var(self, values: numpy.ndarray) -> numpy.ndarray:
+        deviations = (values - self._mean(values)[self._groups]) ** 2
+        return self._reduce(numpy.add, deviations) / self._counts
+
+    def _std(self, values: numpy.ndarray) -> numpy.ndarray:
+        return numpy.sqrt(self._var(values))
+
+    def _min(self, values: numpy.ndarray) -> numpy.ndarray:
+        return self._reduce(numpy.minimum, values)
+
+    def _max(self, values: numpy.ndarray) -> numpy.ndarray:
+        return self._reduce(numpy.maximum, values)
+
+    def _median(self, values: numpy.ndarray) -> numpy.ndarray:
+        return self._quantile(values, 0.5)
+
+    def _aggregate(self, name: str, value_type: str, aggregation: Any) -> Any:
+        """Values of an aggregation of the values of a header, one per group."""
+        if aggregation in ("first", "last"):
+            rows = self._first_rows() if aggregation == "first" else self._last_rows()
+            if value_type == Data.Types.VECTOR:
+                return _columns.VectorColumn.from_rows(self._data.take(rows).column(name))
+            return self._data.column(name)[rows]
+        reducers = {
+            "count": self._count,
+            "sum": self._sum,
+            "mean": self._mean,
+            "var": self._var,
+            "std": self._std,
+            "min": self._min,
+            "max": self._max,
+            "median": self._median,
+        }
+        if aggregation in reducers:
+            return reducers[aggregation](self._data.column(name))
+        return self._quantile(self._data.column(name), aggregation)
+
+    def agg(self, aggregations: Dict[str, List[Any]]) -> Data:
+        """Aggregate the values of some headers in each group.
+
+        Parameters
+        ----------
+        aggregations : Dict[str, List[Any]]
+            Aggregations of the values of each header, among ``AGGREGATIONS`` and quantiles
+            as floats between 0 and 1, such as ``{"pi": ["mean", "max", 0.05, 0.95]}``.
+            ``"count"``, ``"first"`` and ``"last"`` apply to headers of any type, the
+            others to ``Data.Types.DOUBLE`` headers. ``"std"`` and ``"var"`` are those of
+            the population, as ``numpy.std`` and ``numpy.var``.
+
+        Returns
+        -------
+        Data
+            One row per group, with the key headers then one header per aggregation, named
+            after the aggregated header and the aggregation, such as ``pi_mean`` or
+            ``pi_q0.95``, whose unit is the unit of the aggregated header, its square for
+            ``"var"`` and none for ``"count"``
+
+        Raises
+        ------
+        ValueError
+            If a header does not exist or if an aggregation is invalid.
+        """
+        plan: List[Tuple[Data.Header, Any]] = []
+        for name, names in aggregations.items():
+            header = self._data.headers[self._data.schema.index(name)]
+            for aggregation in [names] if isinstance(names, str) else names:
+                _check_aggregation(header, aggregation)
+                plan.append((header, aggregation))
+
+        storages = {
+            Data.Types.STRING: _columns.StringColumn.from_rows,
+            Data.Types.DOUBLE: _columns.DoubleColumn,
+        }
+        first_rows = self._first_rows()
+        headers = [self._data.headers[self._data.schema.index(key)] for key in self._keys]
+        columns = [storages[header.value_type](self._data.column(header.name)[first_rows])
+                   for header in headers]
+        for header, aggregation in plan:
+            headers.append(_result_header(header, aggregation))
+            values = self._aggregate(header.name, header.value_type, aggregation)
+            columns.append(values if isinstance(values, _columns.Column)
+                           else storages[headers[-1].value_type](values))
+        return Data(name=self._data.name, description=self._data.description,
+                    headers=headers, columns=columns)
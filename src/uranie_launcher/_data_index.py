@@ -0,0 +1,280 @@
+"""Random access to the rows of large 'Salome Table' files.
+
+An index, stored next to the table in a sidecar file, records the byte offset of every N-th
+row, so that a row is read by seeking to the closest indexed row and parsing at most N lines.
+"""
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterable, List
+
+import numpy
+
+from ._compression import is_compressed
+from ._data_ascii import _iter_ascii_columns, _read_binary_header
+from .data import Data, _project
+
+INDEX_EVERY = 1000
+"""Default number of rows between two indexed rows."""
+
+INDEX_SUFFIX = ".idx"
+"""Suffix added to the name of the table to name its index."""
+
+
+def index_path(filepath: Path) -> Path:
+    """Path to the index of a table.
+
+    Parameters
+    ----------
+    filepath : Path
+        Path to the table
+
+    Returns
+    -------
+    Path
+        Path to the sidecar file
+    """
+    return filepath.with_name(filepath.name + INDEX_SUFFIX)
+
+
+def build_ascii_index(filepath: Path, every: int = INDEX_EVERY, key: str = None) -> Path:
+    """Build the index of a 'Salome Table' as defined by Uranie.
+
+    Parameters
+    ----------
+    filepath : Path
+        Path to the table
+    every : int, optional
+        Number of rows between two indexed rows, by default ``INDEX_EVERY``
+    key : str, optional
+        Name of a ``Data.Types.DOUBLE`` header, sorted in increasing order, whose values are
+        also indexed to find rows by value (such as ``execution_index``), by default None
+
+    Returns
+    -------
+    Path
+        Path to the index, see ``index_path``
+
+    Raises
+    ------
+    ValueError
+        If ``every`` is not positive, if ``key`` values are not sorted or if the table is
+        compressed.
+    """
+    if is_compressed(filepath):
+        raise ValueError(f"Rows of the compressed file {filepath} cannot be indexed.")
+    if every < 1:
+        raise ValueError(f"every must be positive, got {every}.")
+    with filepath.open(mode="rb") as binary_file:
+        header, position = _read_binary_header(binary_file)
+        key_index = header.names.index(key) if key else None
+        offsets = []
+        keys = []
+        nb_rows = 0
+        previous = -numpy.inf
+        for line in binary_file:
+            if line.strip():
+                if key:
+                    # every row is checked, not only the indexed ones, so that no row is
+                    # missed by ``read_keys``
+                    value = float(line.split()[key_index])
+                    if value < previous:
+                        raise ValueError(f"Values of '{key}' are not sorted in {filepath}.")
+                    previous = value
+                if nb_rows % every == 0:
+                    offsets.append(position)
+                    if key:
+                        keys.append(value)
+                nb_rows += 1
+            position += len(line)
+
+    stat = filepath.stat()
+    with index_path(filepath).open(mode="wb") as index_file:
+        numpy.savez(index_file,
+                    offsets=numpy.array(offsets, dtype="int64"),
+                    keys=numpy.array(keys, dtype="float64"),
+                    key=numpy.array(key or ""),
+                    every=every,
+                    nb_rows=nb_rows,
+                    size=stat.st_size,
+                    mtime_ns=stat.st_mtime_ns)
+    return index_path(filepath)
+
+
+def _load_index(filepath: Path) -> Dict[str, numpy.ndarray] or None:
+    """Load the index of a table, ``None`` if it does not exist or is outdated."""
+    if not index_path(filepath).is_file():
+        return None
+    with numpy.load(index_path(filepath)) as index:
+        index = dict(index)
+    stat = filepath.stat()
+    if (int(index["size"]), int(index["mtime_ns"])) != (stat.st_size, stat.st_mtime_ns):
+        return None
+    return index
+
+
+class AsciiTableReader:
+    """Read some rows of a 'Salome Table' as defined by Uranie, using its index.
+
+    The index is built if it does not exist, does not match the table anymore or does not
+    index the requested ``key``. Use it as a context manager to close the table.
+    """
+
+    def __init__(self, filepath: Path, every: int = INDEX_EVERY, key: str = None,
+                 columns: List[str] = None) -> None:
+        """Constructor.
+
+        Parameters
+        ----------
+        filepath : Path
+            Path to the table
+        every : int, optional
+            Number of rows between two indexed rows when the index is built,
+            by default ``INDEX_EVERY``
+        key : str, optional
+            Name of the sorted header used by ``read_keys``, by default None
+        columns : List[str], optional
+            Names of the headers of the read rows, in this order, by default all the headers
+
+        Raises
+        ------
+        ValueError
+            If a header of ``columns`` is unknown.
+        """
+        index = _load_index(filepath)
+        if index is None or (key and str(index["key"]) != key):
+            build_ascii_index(filepath, every=every, key=key)
+            index = _load_index(filepath)
+        self._offsets: List[int] = index["offsets"].tolist()
+        self._keys: numpy.ndarray = index["keys"]
+        self._key: str = str(index["key"])
+        self._every: int = int(index["every"])
+        self._nb_rows: int = int(index["nb_rows"])
+        self._file: BinaryIO = filepath.open(mode="rb")
+        try:
+            self._header, _ = _read_binary_header(self._file)
+            self._projected, self._indices = _project(self._header, columns)
+        except ValueError:
+            self._file.close()
+            raise
+
+    def __enter__(self) -> 'AsciiTableReader':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def close(self):
+        """Close the table."""
+        self._file.close()
+
+    @property
+    def nb_rows(self) -> int:
+        """Number of rows of the table"""
+        return self._nb_rows
+
+    @property
+    def header(self) -> Data:
+        """Empty data defined by the header of the table"""
+        return self._header
+
+    def _read_lines(self, indices: Iterable[int]) -> Dict[int, str]:
+        """Read the lines of rows ``indices``, in increasing order."""
+        lines = {}
+        row = None
+        for index in sorted(set(indices)):
+            if not 0 <= index < self._nb_rows:
+                raise IndexError(f"Row {index} out of range [0;{self._nb_rows}[.")
+            if row is None or not row <= index < row + self._every:
+                row = index - index % self._every
+                self._file.seek(self._offsets[index // self._every])
+            while True:
+                line = self._file.readline()
+                if line.strip():
+                    row += 1
+                    if row - 1 == index:
+                        lines[index] = line.decode("utf-8")
+                        break
+        return lines
+
+    def _to_data(self, lines: List[str]) -> Data:
+        data = Data(name=self._projected.name, description=self._projected.description,
+                    headers=self._projected.headers)
+        if lines:
+            for columns in _iter_ascii_columns(self._header, iter(lines), len(lines),
+                                               self._indices):
+                data.extend_columns(columns)
+        return data
+
+    def read_rows(self, indices: Iterable[int]) -> Data:
+        """Read some rows.
+
+        Parameters
+        ----------
+        indices : Iterable[int]
+            Positions of the rows in the table
+
+        Returns
+        -------
+        Data
+            Rows in the order of ``indices``
+
+        Raises
+        ------
+        IndexError
+            If a row is not in the table.
+        """
+        indices = list(indices)
+        lines = self._read_lines(indices)
+        return self._to_data([lines[index] for index in indices])
+
+    def read_range(self, start: int, stop: int) -> Data:
+        """Read consecutive rows.
+
+        Parameters
+        ----------
+        start : int
+            Position of the first row
+        stop : int
+            Position after the last row, limited to the number of rows
+
+        Returns
+        -------
+        Data
+            Rows ``start`` to ``stop`` (excluded)
+        """
+        return self.read_rows(range(max(start, 0), min(stop, self._nb_rows)))
+
+    def read_keys(self, values: Iterable[float]) -> Data:
+        """Read the rows whose ``key`` header has some values.
+
+        Parameters
+        ----------
+        values : Iterable[float]
+            Values of the ``key`` header
+
+        Returns
+        -------
+        Data
+            Rows found, in the order of ``values``, all the rows of a value in the order of
+            the table; values absent from the table are skipped
+
+        Raises
+        ------
+        ValueError
+            If the reader has no ``key``.
+        """
+        if not self._key:
+            raise ValueError("No key indexed, use AsciiTableReader(..., key=name).")
+        key_index = self._header.names.index(self._key)
+        lines = []
+        for value in values:
+            # rows of ``value`` start in the last block starting before it, or in the first
+            # block starting with it, and continue up to the last block starting with it
+            first = max(int(numpy.searchsorted(self._keys, value, side="left")) - 1, 0)
+            last = int(numpy.searchsorted(self._keys, value, side="right")) - 1
+            if last < 0:
+                continue
+            block_lines = self._read_lines(range(first * self._every, min(
+                (last + 1) * self._every, self._nb_rows)))
+            lines.extend(line for line in block_lines.values()
+                         if float(line.split()[key_index]) == value)
+        return self._to_data(lines)
@@ -0,0 +1,284 @@
+"""Hash join of ``data.Data`` and of files of results on a key header.
+
+The distinct keys of the right data are numbered in a dictionary, then the keys of the left
+data are looked up once each, so that both are read once. The rows of the result are
+gathered from the columns of both data at once.
+"""
+import contextlib
+import itertools
+from pathlib import Path
+import tempfile
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+
+import numpy
+
+from . import _columns
+from ._data_csv import csv_to_data, iter_csv_chunks
+from ._data_formats import load, read_chunks, save_chunks
+from ._data_writer import DataWriter
+from .data import CHUNK_ROWS, Data, _empty_like
+
+JOINS = ("inner", "left", "right", "outer")
+"""Kinds of join: rows with a key in both data, plus the other rows of the left data, of
+the right data or of both."""
+
+
+class _HashTable:
+    """Rows of the right data grouped by key, probed by the keys of left rows."""
+
+    def __init__(self, keys: numpy.ndarray) -> None:
+        """Constructor.
+
+        Parameters
+        ----------
+        keys : numpy.ndarray
+            Key of each right row
+        """
+        distinct, groups = numpy.unique(keys, return_inverse=True)
+        self._groups: Dict[Any, int] = dict(zip(distinct.tolist(), range(len(distinct))))
+        counts = numpy.bincount(groups, minlength=len(distinct))
+        # a missing key is group -1: no row, starting after the rows of the last group
+        self._counts: numpy.ndarray = numpy.append(counts, 0)
+        self._starts: numpy.ndarray = numpy.append(numpy.cumsum(counts) - counts, len(keys))
+        self._rows: numpy.ndarray = numpy.append(numpy.argsort(groups, kind="stable"), -1)
+        self._matched: numpy.ndarray = numpy.zeros(len(keys), dtype=bool)
+
+    def probe(self, keys: numpy.ndarray,
+              keep_unmatched: bool) -> Tuple[numpy.ndarray, numpy.ndarray]:
+        """Match left rows with the right rows of the same key.
+
+        Parameters
+        ----------
+        keys : numpy.ndarray
+            Key of each left row
+        keep_unmatched : bool
+            Whether left rows without right row are kept
+
+        Returns
+        -------
+        Tuple[numpy.ndarray, numpy.ndarray]
+            Left and right row of each joined row, in the order of the left rows, -1 for a
+            missing right row
+        """
+        groups = numpy.fromiter(map(self._groups.get, keys.tolist(), itertools.repeat(-1)),
+                                dtype="int64", count=len(keys))
+        counts = self._counts[groups]
+        sizes = numpy.maximum(counts, 1) if keep_unmatched else counts
+        first_rows = numpy.cumsum(sizes) - sizes
+        positions = numpy.arange(sizes.sum()) - numpy.repeat(first_rows - self._starts[groups],
+                                                             sizes)
+        right_rows = self._rows[positions]
+        self._matched[right_rows[right_rows >= 0]] = True
+        return numpy.repeat(numpy.arange(len(keys)), sizes), right_rows
+
+    def unmatched(self) -> numpy.ndarray:
+        """Right rows not matched by any probed left row, in order."""
+        return numpy.flatnonzero(~self._matched)
+
+
+def _check_join(left: Data, right: Data, on: str, how: str):
+    """Check the kind of join and the key header of both data.
+
+    Raises
+    ------
+    ValueError
+        If the kind of join is unknown, if a data has no header ``on`` or if the key headers
+        are not of the same scalar type.
+    """
+    if how not in JOINS:
+        raise ValueError(f"Unknown join '{how}', expected one of {list(JOINS)}.")
+    left_type = left.types[left.schema.index(on)]
+    right_type = right.types[right.schema.index(on)]
+    if left_type != right_type or left_type == Data.Types.VECTOR:
+        raise ValueError(f"Cannot join on '{on}' of types '{left_type}' and '{right_type}', "
+                         f"expected the same type among '{Data.Types.DOUBLE}' and "
+                         f"'{Data.Types.STRING}'.")
+
+
+def _gather(value_type: str, values: Any, rows: numpy.ndarray) -> Any:
+    """Values of ``rows`` of a column as returned by ``Data.column``, row -1 being missing:
+    ``nan``, an empty string or an empty vector."""
+    valid = rows >= 0
+    if value_type == Data.Types.VECTOR:
+        empty = numpy.zeros(0)
+        return [values[row] if row >= 0 else empty for row in rows.tolist()]
+    if value_type == Data.Types.DOUBLE:
+        gathered = numpy.full(len(rows), numpy.nan)
+    else:
+        gathered = numpy.full(len(rows), "", dtype=values.dtype)
+    gathered[valid] = values[rows[valid]]
+    return gathered
+
+
+def _storage(value_type: str, values: Any) -> _columns.Column:
+    if value_type == Data.Types.DOUBLE:
+        return _columns.DoubleColumn(values)
+    if value_type == Data.Types.STRING:
+        return _columns.StringColumn.from_rows(values)
+    return _columns.VectorColumn.from_rows(values)
+
+
+def _assemble(left: Data,  # pylint: disable=too-many-arguments
+              right: Data, on: str, left_rows: numpy.ndarray, right_rows: numpy.ndarray, *,
+              suffixes: Tuple[str, str]) -> Data:
+    """Create the joined data: the headers of the left data, then those of the right data
+    but ``on``, renamed with ``suffixes`` when both data have them."""
+    right_names = [name for name in right.names if name != on]
+    common = set(left.names) & set(right_names)
+    headers = [Data.Header(name + suffixes[0] if name in common else name, header.value_type,
+                           header.value_unit)
+               for name, header in zip(left.names, left.headers)]
+    headers += [Data.Header(name + suffixes[1] if name in common else name, header.value_type,
+                            header.value_unit)
+                for name, header in zip(right.names, right.headers) if name != on]
+    columns = []
+    for name, value_type in zip(left.names, left.types):
+        values = _gather(value_type, left.column(name), left_rows)
+        if name == on and (left_rows < 0).any():
+            # keys of the right rows without left row
+            values = numpy.where(left_rows >= 0, values,
+                                 right.column(on)[numpy.maximum(right_rows, 0)])
+        columns.append(_storage(value_type, values))
+    columns += [_storage(value_type, _gather(value_type, right.column(name), right_rows))
+                for name, value_type in zip(right.names, right.types) if name != on]
+    return Data(name=left.name, description=left.description, headers=headers,
+                columns=columns)
+
+
+def join(left: Data, right: Data, on: str, how: str = "inner",
+         suffixes: Tuple[str, str] = ("_left", "_right")) -> Data:
+    """Join the rows of two data with the same value of a key header.
+
+    Rows are in the order of the left data, followed, for ``"right"`` and ``"outer"`` joins,
+    by the right rows without left row. A left row matching several right rows is repeated.
+    Values missing in a joined row are ``nan``, an empty string or an empty vector.
+
+    Parameters
+    ----------
+    left : Data
+        Left data, such as the experimental design
+    right : Data
+        Right data, such as the results
+    on : str
+        Name of the key header of both data, such as ``"execution_index"``
+    how : str, optional
+        Kind of join among ``JOINS``, by default ``"inner"``
+    suffixes : Tuple[str, str], optional
+        Suffixes of the names of the headers of both data but the key,
+        by default ``("_left", "_right")``
+
+    Returns
+    -------
+    Data
+        Headers of the left data then those of the right data but the key, with the name and
+        description of the left data
+
+    Raises
+    ------
+    ValueError
+        If the kind of join is unknown or the key headers are invalid.
+    """
+    _check_join(left, right, on, how)
+    table = _HashTable(right.column(on))
+    left_rows, right_rows = table.probe(left.column(on),
+                                        keep_unmatched=how in ("left", "outer"))
+    if how in ("right", "outer"):
+        unmatched = table.unmatched()
+        left_rows = numpy.concatenate([left_rows, numpy.full(len(unmatched), -1)])
+        right_rows = numpy.concatenate([right_rows, unmatched])
+    return _assemble(left, right, on, left_rows, right_rows, suffixes=suffixes)
+
+
+def _join_chunks(left_chunks: Iterable[Data], right: Data, on: str, how: str, *,
+                 suffixes: Tuple[str, str], header: Data) -> Iterator[Data]:
+    """Join blocks of left rows defined by ``header`` with the right data, see ``join``,
+    then yield the right rows without left row for ``"right"`` and ``"outer"`` joins."""
+    table = _HashTable(right.column(on))
+    for chunk in left_chunks:
+        left_rows, right_rows = table.probe(chunk.column(on),
+                                            keep_unmatched=how in ("left", "outer"))
+        yield _assemble(chunk, right, on, left_rows, right_rows, suffixes=suffixes)
+    if how in ("right", "outer"):
+        right_rows = table.unmatched()
+        yield _assemble(_empty_like(header), right, on, numpy.full(len(right_rows), -1),
+                        right_rows, suffixes=suffixes)
+
+
+def _partition(header: Data, chunks: Iterable[Data], on: str, filepaths: List[Path]):
+    """Split rows into csv files by hash of their key, so that rows of the same key are in
+    the files of the same index."""
+    partitions = len(filepaths)
+    with contextlib.ExitStack() as stack:
+        writers = [stack.enter_context(DataWriter(filepath, header)) for filepath in filepaths]
+        for chunk in chunks:
+            indices = numpy.fromiter(map(hash, chunk.column(on).tolist()), dtype="int64",
+                                     count=chunk.nb_rows) % partitions
+            for index, writer in enumerate(writers):
+                writer.append(chunk.where(indices == index))
+
+
+def join_files(left_filepath: Path,  # pylint: disable=too-many-arguments
+               right_filepath: Path, out_filepath: Path, on: str, how: str = "inner", *,
+               suffixes: Tuple[str, str] = ("_left", "_right"), partitions: int = 1,
+               chunk_rows: int = CHUNK_ROWS):
+    """Join the rows of two files in any registered format, see ``join``.
+
+    The left file is read by blocks of rows and the right file is loaded. When the right
+    file does not fit in memory, both files are first split in ``partitions`` temporary csv
+    files next to ``out_filepath`` by hash of the key, then each pair of partitions is joined
+    the same way: only a partition of the right file is then loaded at a time, and rows of
+    the result are grouped by partition.
+
+    Parameters
+    ----------
+    left_filepath : Path
+        Path to the left file, such as the experimental design
+    right_filepath : Path
+        Path to the right file, such as the results
+    out_filepath : Path
+        Path to the written file, in the format of its suffix
+    on : str
+        Name of the key header of both files, such as ``"execution_index"``
+    how : str, optional
+        Kind of join among ``JOINS``, by default ``"inner"``
+    suffixes : Tuple[str, str], optional
+        Suffixes of the names of the headers of both files but the key,
+        by default ``("_left", "_right")``
+    partitions : int, optional
+        Number of partitions of the files, by default 1: the right file is loaded at once
+    chunk_rows : int, optional
+        Number of rows read at once, by default ``CHUNK_ROWS``
+
+    Raises
+    ------
+    ValueError
+        If the kind of join is unknown, if the key headers are invalid or if ``partitions``
+        is not positive.
+    """
+    if partitions < 1:
+        raise ValueError(f"partitions must be positive, got {partitions}.")
+    left_header, left_chunks = read_chunks(left_filepath, chunk_rows)
+    if partitions == 1:
+        # the right file is loaded once, its rows are not read by blocks
+        right_header, right_chunks = load(right_filepath), iter([])
+    else:
+        right_header, right_chunks = read_chunks(right_filepath, chunk_rows)
+    _check_join(left_header, right_header, on, how)
+    header = join(_empty_like(left_header), _empty_like(right_header), on, how, suffixes)
+
+    def joined_chunks() -> Iterator[Data]:
+        if partitions == 1:
+            yield from _join_chunks(left_chunks, right_header, on, how,
+                                    suffixes=suffixes, header=left_header)
+            return
+        with tempfile.TemporaryDirectory(dir=out_filepath.parent) as directory:
+            parts = [(Path(directory) / f"left_{index}.csv",
+                      Path(directory) / f"right_{index}.csv") for index in range(partitions)]
+            _partition(left_header, left_chunks, on, [left for left, _ in parts])
+            _partition(right_header, right_chunks, on, [right for _, right in parts])
+            for left_part, right_part in parts:
+                yield from _join_chunks(iter_csv_chunks(left_part, chunk_rows),
+                                        csv_to_data(right_part), on, how,
+                                        suffixes=suffixes, header=left_header)
+
+    save_chunks(joined_chunks(), out_filepath, header=header, chunk_rows=chunk_rows)
@@ -0,0 +1,295 @@
+"""json format for ``data.Data``.
+"""
+import itertools
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, TextIO, Tuple
+
+from . import _json_stream
+from ._compression import open_file
+from .data import (BUFFER_SIZE, CHUNK_ROWS, Data, _batched, _column_tolist, _empty_like,
+                   _get_date, _iter_row_blocks, _new_data, _project)
+
+JSON_ITEMS = "items"
+"""Layout of json files listing the values row by row."""
+
+JSON_COLUMNS = "columns"
+"""Layout of json files listing the values header by header."""
+
+
+def _metadata(data: Data) -> Dict[str, Any]:
+    """``_metadata`` of the json file of ``data``."""
+    return {
+        "_comment": "",
+        "date": _get_date(),
+        "short_names": data.names,
+        "table_description": data.description,
+        "table_name": data.name,
+        "types": data.types,
+        "units": data.units
+    }
+
+
+def data_to_json(data: Data, filepath: Path,  # pylint: disable=too-many-arguments
+                 chunk_rows: int = CHUNK_ROWS, buffer_size: int = BUFFER_SIZE,
+                 layout: str = JSON_ITEMS):
+    """Convert ``Data`` to json.
+
+    Values are encoded and written by blocks, so that memory does not depend on the number
+    of rows. Two layouts are available:
+
+    - ``JSON_ITEMS``: ``"items"`` lists one object per row, indented;
+    - ``JSON_COLUMNS``: ``"columns"`` maps each header name to the list of its values,
+      without blanks. Files are several times smaller and faster to read and write.
+
+    Parameters
+    ----------
+    data : Data
+        data to dump
+    filepath : Path
+        Path to file, compressed when its suffix is ``.gz``, ``.bz2`` or ``.xz``
+    chunk_rows : int, optional
+        Number of rows encoded at once, by default ``CHUNK_ROWS``
+    buffer_size : int, optional
+        Size in bytes of the file buffer, by default ``BUFFER_SIZE``
+    layout : str, optional
+        ``JSON_ITEMS`` or ``JSON_COLUMNS``, by default ``JSON_ITEMS``
+
+    Raises
+    ------
+    ValueError
+        If the layout is unknown.
+    """
+    if layout not in (JSON_ITEMS, JSON_COLUMNS):
+        raise ValueError(f"Unknown json layout '{layout}', "
+                         f"expected '{JSON_ITEMS}' or '{JSON_COLUMNS}'.")
+    with open_file(filepath, mode='w', encoding='utf-8', buffering=buffer_size) as json_file:
+        if layout == JSON_COLUMNS:
+            _write_json_columns(data, json_file, chunk_rows)
+        else:
+            _write_json_items(data, [data], json_file, chunk_rows)
+
+
+def write_json_chunks(header: Data, chunks: Iterable[Data], filepath: Path,
+                      chunk_rows: int = CHUNK_ROWS, buffer_size: int = BUFFER_SIZE):
+    """Write blocks of rows to json, with the ``JSON_ITEMS`` layout.
+
+    Only one block is held in memory at a time.
+
+    Parameters
+    ----------
+    header : Data
+        Data defining the name, description and headers of the file
+    chunks : Iterable[Data]
+        Blocks of rows, with the headers of ``header``
+    filepath : Path
+        Path to file, compressed when its suffix is ``.gz``, ``.bz2`` or ``.xz``
+    chunk_rows : int, optional
+        Number of rows encoded at once, by default ``CHUNK_ROWS``
+    buffer_size : int, optional
+        Size in bytes of the file buffer, by default ``BUFFER_SIZE``
+    """
+    with open_file(filepath, mode='w', encoding='utf-8', buffering=buffer_size) as json_file:
+        _write_json_items(header, chunks, json_file, chunk_rows)
+
+
+def _write_json_items(header: Data, chunks: Iterable[Data], json_file: TextIO,
+                      chunk_rows: int):
+    """Write the rows of ``chunks`` to json, with the ``JSON_ITEMS`` layout."""
+    metadata = json.dumps({"_metadata": _metadata(header)}, indent=2)
+    keys = [f"      {json.dumps(name)}: " for name in header.names]
+    encode = json.JSONEncoder().encode
+    json_file.write(metadata[:-len("\n}")] + ',\n  "items": [')
+    separator = "\n"
+    for chunk in chunks:
+        for _, rows in _iter_row_blocks(chunk, chunk_rows):
+            json_file.write(separator + ",\n".join(
+                "    {\n" + ",\n".join([key + encode(value) for key, value in zip(keys, row)])
+                + "\n    }" for row in rows))
+            separator = ",\n"
+    json_file.write("]\n}" if separator == "\n" else "\n  ]\n}")
+
+
+def _write_json_columns(data: Data, json_file: TextIO, chunk_rows: int):
+    """Write ``data`` to json column by column, with the ``JSON_COLUMNS`` layout."""
+    if chunk_rows < 1:
+        raise ValueError(f"chunk_rows must be positive, got {chunk_rows}.")
+    encode = json.JSONEncoder(separators=(",", ":")).encode
+    metadata = encode({"_metadata": _metadata(data)})
+    json_file.write(metadata[:-1] + ',"columns":{')
+    nb_rows = data.nb_rows if data.nb_columns else 0
+    for index, name in enumerate(data.names):
+        json_file.write(("," if index else "") + encode(name) + ":[")
+        for start in range(0, nb_rows, chunk_rows):
+            json_file.write(("," if start else "") +
+                            encode(_column_tolist(data, name, start, start + chunk_rows))[1:-1])
+        json_file.write("]")
+    json_file.write("}}")
+
+
+def _json_header(metadata: Dict[str, Any]) -> Data:
+    """Create the empty data defined by the ``_metadata`` of a json file."""
+    return _new_data(metadata["table_name"], metadata["table_description"],
+                     metadata["short_names"], metadata["types"], metadata["units"])
+
+
+def _values(member: Dict[str, Any], names: List[str], key: str) -> List[Any]:
+    """Values of the headers of ``names`` in a member of ``items`` or in ``columns``.
+
+    Raises
+    ------
+    ValueError
+        If a header has no value.
+    """
+    try:
+        return [member[name] for name in names]
+    except KeyError as error:
+        raise ValueError(f"Invalid json: no value of header {error} in '{key}'.") from None
+
+
+def _read_json(json_file: TextIO,
+               columns: List[str] = None) -> Tuple[Data, Iterator[List[Any]], List[List[Any]]]:
+    """Read a json file written by ``data_to_json``.
+
+    ``items`` are decoded one by one while iterating over the rows, ``columns`` are decoded
+    header by header, skipping the headers not in ``columns``.
+
+    Parameters
+    ----------
+    json_file : TextIO
+        File opened in text mode
+    columns : List[str], optional
+        Names of the headers to read, in this order, by default all the headers
+
+    Returns
+    -------
+    Tuple[Data, Iterator[List[Any]], List[List[Any]]]
+        Empty data with the read headers of ``_metadata``, iterator over the rows of
+        ``items`` and values of each read header in ``columns`` (None with the
+        ``JSON_ITEMS`` layout), or None three times when the values precede ``_metadata``
+
+    Raises
+    ------
+    ValueError
+        If ``_metadata`` is not found, if a header of ``columns`` is unknown or if a header
+        has no value in ``columns``.
+    """
+    members = _json_stream.iter_members(json_file, streamed_key=JSON_ITEMS,
+                                        selected_key=JSON_COLUMNS, selected=columns)
+    for key, value in members:
+        if key in (JSON_ITEMS, JSON_COLUMNS):
+            return None, None, None
+        if key == "_metadata":
+            header = _project(_json_header(value), columns)[0]
+            break
+    else:
+        raise ValueError("Invalid json: '_metadata' not found.")
+    names = header.names
+    for key, value in members:
+        if key == JSON_COLUMNS:
+            values = dict(member for key, member in members if key == JSON_COLUMNS)
+            return header, iter([]), _values(values, names, JSON_COLUMNS)
+        if key == JSON_ITEMS:
+            return header, itertools.chain([_values(value, names, JSON_ITEMS)], (
+                _values(item, names, JSON_ITEMS) for key, item in members if key == JSON_ITEMS
+            )), None
+    return header, iter([]), None
+
+
+def _load_json(json_file: TextIO, columns: List[str] = None) -> Data:
+    """Read a json file at once, whatever the order of its members.
+
+    Raises
+    ------
+    ValueError
+        If ``_metadata`` is not found, if a header of ``columns`` is unknown or if a header
+        has no value.
+    """
+    dico = json.load(json_file)
+    if "_metadata" not in dico:
+        raise ValueError("Invalid json: '_metadata' not found.")
+    data = _project(_json_header(dico["_metadata"]), columns)[0]
+    if JSON_COLUMNS in dico:
+        data.extend_columns(_values(dico[JSON_COLUMNS], data.names, JSON_COLUMNS))
+    else:
+        data.add_rows([_values(item, data.names, JSON_ITEMS)
+                       for item in dico.get(JSON_ITEMS, [])])
+    return data
+
+
+def iter_json_chunks(filepath: Path, chunk_rows: int = CHUNK_ROWS,
+                     columns: List[str] = None) -> Iterator[Data]:
+    """Read json by blocks of rows.
+
+    With the ``JSON_ITEMS`` layout, the file is decoded incrementally: ``_metadata`` must
+    precede ``items``, as written by ``data_to_json``. With the ``JSON_COLUMNS`` layout, the
+    first row is complete only once the last header is read: the values of the read headers
+    are decoded header by header, those of the other headers are skipped, and they are then
+    split in blocks.
+
+    Parameters
+    ----------
+    filepath : Path
+        Path to file, compressed when its suffix is ``.gz``, ``.bz2`` or ``.xz``
+    chunk_rows : int, optional
+        Number of rows per block, by default ``CHUNK_ROWS``
+    columns : List[str], optional
+        Names of the headers to read, in this order, the values of the other headers are
+        neither converted nor stored, by default all the headers
+
+    Yields
+    ------
+    Data
+        Data of each block, with the name, description and headers of the file
+
+    Raises
+    ------
+    ValueError
+        If ``_metadata`` does not precede the values or if a header has no value.
+    """
+    with open_file(filepath, mode='r', encoding='utf-8') as json_file:
+        header, rows, values = _read_json(json_file, columns)
+        if header is None:
+            raise ValueError("Invalid json: '_metadata' must precede the values.")
+        if values is not None:
+            for start in range(0, len(values[0]) if values else 0, chunk_rows):
+                chunk = _empty_like(header)
+                chunk.extend_columns([column[start:start + chunk_rows] for column in values])
+                yield chunk
+        for block in _batched(rows, chunk_rows):
+            chunk = _empty_like(header)
+            chunk.add_rows(block)
+            yield chunk
+
+
+def json_to_data(filepath: Path, columns: List[str] = None) -> Data:
+    """Convert json to ``Data``.
+
+    Both layouts of ``data_to_json`` are read, the values of ``JSON_COLUMNS`` are added
+    header by header without building the rows, and the values of the headers not in
+    ``columns`` are skipped without being decoded. Files whose values precede
+    ``_metadata`` are decoded at once.
+
+    Parameters
+    ----------
+    filepath : Path
+        Path to file, compressed when its suffix is ``.gz``, ``.bz2`` or ``.xz``
+    columns : List[str], optional
+        Names of the headers to read, in this order, the values of the other headers are
+        neither converted nor stored, by default all the headers
+
+    Returns
+    -------
+    Data
+        Loaded data
+    """
+    with open_file(filepath, mode='r', encoding='utf-8') as json_file:
+        data, rows, values = _read_json(json_file, columns)
+        if data is not None:
+            if values is not None:
+                data.extend_columns(values)
+            for block in _batched(rows, CHUNK_ROWS):
+                data.add_rows(block)
+            return data
+    with open_file(filepath, mode='r', encoding='utf-8') as json_file:
+        return _load_json(json_file, columns)
@@ -0,0 +1,175 @@
+"""Reading of the rows of 'Salome Tables' and csv files, in parallel for large files.
+
+The rows after the header are split into byte ranges starting at the beginning of a line,
+parsed in a pool of processes. Each process copies the columns of its range in a shared
+memory block, see ``_data_shared``, which the calling process concatenates into the columns
+of the result in the order of the ranges: values of all the types are sent without being
+pickled.
+"""
+from concurrent.futures import ProcessPoolExecutor
+import itertools
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, Iterable, Iterator, List, TextIO, Tuple
+
+import numpy
+
+from . import _columns
+from ._compression import is_compressed, open_file
+from ._data_shared import SharedData
+from .data import Data, _new_data, _project
+
+Parser = Callable[[Data, Iterable[str], List[int]], Iterator[Any]]
+"""Module level function parsing lines of values into blocks of the headers at the given
+positions, accepted by ``Data.extend_columns``."""
+
+
+def _split(filepath: Path, start: int, nb_ranges: int) -> List[Tuple[int, int]]:
+    """Split the end of a file, from ``start``, into byte ranges of whole lines."""
+    size = filepath.stat().st_size
+    bounds = [start]
+    with filepath.open(mode="rb") as binary_file:
+        for index in range(1, nb_ranges):
+            position = start + (size - start) * index // nb_ranges
+            if position > bounds[-1]:
+                binary_file.seek(position - 1)
+                binary_file.readline()
+                bounds.append(min(binary_file.tell(), size))
+    bounds.append(size)
+    return [(begin, end) for begin, end in zip(bounds, bounds[1:]) if end > begin]
+
+
+def _iter_lines(binary_file: BinaryIO, size: int) -> Iterator[str]:
+    """Decode the whole lines of the next ``size`` bytes of a file one by one."""
+    for line in binary_file:
+        yield line.decode("utf-8")
+        size -= len(line)
+        if size <= 0:
+            return
+
+
+def _parse_range(filepath: Path, parse: Parser,
+                 headers: Tuple[List[str], List[str], List[str]],
+                 indices: List[int],
+                 byte_range: Tuple[int, int]) -> SharedData:
+    """Parse a byte range of rows in a process of the pool, keeping the headers at
+    ``indices``.
+
+    Returns
+    -------
+    SharedData
+        Handle on the parsed rows, whose shared memory is freed by the calling process
+    """
+    begin, end = byte_range
+    header = _new_data("", "", *headers)
+    data, _ = _project(header, [header.names[index] for index in indices])
+    with filepath.open(mode="rb") as binary_file:
+        binary_file.seek(begin)
+        for block in parse(header, _iter_lines(binary_file, end - begin), indices):
+            data.extend_columns(block)
+    handle = data.to_shared()
+    handle.detach()
+    return handle
+
+
+def _concat_columns(header: Data, pieces: List[Data]) -> List[_columns.Column]:
+    """Concatenate the columns of the parsed ranges, copying them."""
+    columns = []
+    for name, value_type in zip(header.names, header.types):
+        views = [piece.column(name) for piece in pieces]
+        if value_type == Data.Types.DOUBLE:
+            columns.append(_columns.DoubleColumn(numpy.concatenate(views)))
+        elif value_type == Data.Types.STRING:
+            columns.append(_columns.StringColumn.from_rows(numpy.concatenate(views)))
+        else:
+            columns.append(_columns.VectorColumn.from_rows(
+                list(itertools.chain.from_iterable(views))))
+    return columns
+
+
+def _stitch(header: Data, handles: List[SharedData]) -> Data:
+    """Create the data from the parsed ranges, in order, releasing the shared memory.
+
+    On error, the shared memory is freed when the handles are garbage collected.
+    """
+    columns = _concat_columns(header, [Data.from_shared(handle) for handle in handles])
+    for handle in handles:
+        handle.close()
+        handle.unlink()
+    return Data(name=header.name, description=header.description, headers=header.headers,
+                columns=columns)
+
+
+def parse_parallel(filepath: Path, header: Data, start: int, parse: Parser, workers: int, *,
+                   columns: List[str] = None) -> Data:
+    """Parse the rows of a file in a pool of processes.
+
+    Parameters
+    ----------
+    filepath : Path
+        Path to an uncompressed file
+    header : Data
+        Empty data defined by the header of the file
+    start : int
+        Position of the first row in the file
+    parse : Parser
+        Parser of the lines of values
+    workers : int
+        Number of processes
+    columns : List[str], optional
+        Names of the headers to read, in this order, by default all the headers
+
+    Returns
+    -------
+    Data
+        Loaded data
+    """
+    projected, indices = _project(header, columns)
+    ranges = _split(filepath, start, workers)
+    if not ranges:
+        return projected
+    headers = (header.names, header.types, header.units)
+    with ProcessPoolExecutor(max_workers=min(workers, len(ranges))) as executor:
+        futures = [executor.submit(_parse_range, filepath, parse, headers, indices, byte_range)
+                   for byte_range in ranges]
+    return _stitch(projected, [future.result() for future in futures])
+
+
+def read_file(filepath: Path,  # pylint: disable=too-many-arguments
+              read_header: Callable[[TextIO], Tuple[Data, Iterable[str]]],
+              read_binary_header: Callable[[BinaryIO], Tuple[Data, int]], parse: Parser,
+              workers: int, *, columns: List[str] = None) -> Data:
+    """Read the rows of a file, in a pool of processes when there are several workers and
+    the file is not compressed, see ``parse_parallel``.
+
+    Parameters
+    ----------
+    filepath : Path
+        Path to file, compressed when its suffix is ``.gz``, ``.bz2`` or ``.xz``
+    read_header : Callable[[TextIO], Tuple[Data, Iterable[str]]]
+        Reader of the header of a file opened in text mode, returning the empty data it
+        defines and the lines of values
+    read_binary_header : Callable[[BinaryIO], Tuple[Data, int]]
+        Reader of the header of a file opened in binary mode, returning the empty data it
+        defines and the position of the first row
+    parse : Parser
+        Parser of the lines of values
+    workers : int
+        Number of processes
+    columns : List[str], optional
+        Names of the headers to read, in this order, by default all the headers
+
+    Returns
+    -------
+    Data
+        Loaded data
+    """
+    if workers > 1 and not is_compressed(filepath):
+        with filepath.open(mode='rb') as binary_file:
+            header, start = read_binary_header(binary_file)
+        return parse_parallel(filepath, header, start, parse, workers, columns=columns)
+    with open_file(filepath, mode='r', encoding='utf-8') as text_file:
+        header, lines = read_header(text_file)
+        data, indices = _project(header, columns)
+        for block in parse(header, lines, indices):
+            data.extend_columns(block)
+        return data
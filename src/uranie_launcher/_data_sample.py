@@ -0,0 +1,137 @@
+"""Random subsampling of the rows of files of results too large to be loaded.
+
+The file is read once by blocks of rows. Each row gets a uniform random key and the rows of
+the smallest keys are kept, as in reservoir sampling: this is a uniform sample without
+replacement, whose memory only depends on its size. Once the sample is full, only the rows
+of a block whose key is below the largest kept key are considered.
+
+Only the keys of the sample are updated at each block: the rows of a block entering the
+sample are taken once and appended to the rows taken before, which are gathered again only
+when more than half of them have left the sample, so that each row is copied a bounded
+number of times on average.
+"""
+from pathlib import Path
+from typing import List
+
+import numpy
+
+from ._data_concat import concat
+from ._data_formats import read_chunks
+from .data import CHUNK_ROWS, Data, _empty_like
+
+
+def _smallest(keys: numpy.ndarray, size: int, strata: numpy.ndarray = None) -> numpy.ndarray:
+    """Positions of the ``size`` smallest keys, of each value of ``strata`` when given."""
+    if strata is None:
+        if len(keys) <= size:
+            return numpy.arange(len(keys))
+        return numpy.argpartition(keys, size - 1)[:size] if size else numpy.zeros(0, "int64")
+    _, codes = numpy.unique(strata, return_inverse=True)
+    codes = codes.reshape(-1)
+    order = numpy.lexsort((keys, codes))
+    counts = numpy.bincount(codes)
+    starts = numpy.cumsum(counts) - counts
+    ranks = numpy.arange(len(keys)) - starts[codes[order]]
+    return order[ranks < size]
+
+
+def sample_rows(filepath: Path,  # pylint: disable=too-many-arguments,too-many-locals
+                n: int, seed: int = None, strata: str = None, *,
+                chunk_rows: int = CHUNK_ROWS, data_format: str = None,
+                columns: List[str] = None) -> Data:
+    """Read a uniform random sample of the rows of a file in any registered format.
+
+    The file is read once by blocks of rows, holding at most the sample and a block in
+    memory.
+
+    Parameters
+    ----------
+    filepath : Path
+        Path to file, possibly compressed
+    n : int
+        Number of rows of the sample, of each value of ``strata`` when given. All the rows
+        are kept when there are fewer.
+    seed : int, optional
+        Seed of the random generator, by default None: a different sample at each call
+    strata : str, optional
+        Name of a ``Data.Types.DOUBLE`` or ``Data.Types.STRING`` header, such as a scenario:
+        ``n`` rows are sampled among the rows of each of its values, by default None
+    chunk_rows : int, optional
+        Number of rows read at once, by default ``CHUNK_ROWS``
+    data_format : str, optional
+        Name of the format, by default detected by ``get_format``
+    columns : List[str], optional
+        Names of the headers to read, in this order, by default all the headers
+
+    Returns
+    -------
+    Data
+        Sampled rows, in the order of the file, with the name, description and headers of
+        the file
+
+    Raises
+    ------
+    ValueError
+        If ``n`` is negative, or if ``strata`` does not exist or is a ``Data.Types.VECTOR``
+        header.
+    """
+    if n < 0:
+        raise ValueError(f"n must be positive or zero, got {n}.")
+    read_columns = columns
+    if strata is not None and columns is not None and strata not in columns:
+        read_columns = list(columns) + [strata]
+    header, chunks = read_chunks(filepath, chunk_rows, data_format, read_columns)
+    if strata is not None and header.types[header.schema.index(strata)] == Data.Types.VECTOR:
+        raise ValueError(f"Cannot sample strata of '{strata}' of type "
+                         f"'{Data.Types.VECTOR}', expected '{Data.Types.DOUBLE}' or "
+                         f"'{Data.Types.STRING}'.")
+
+    generator = numpy.random.default_rng(seed)
+    keys = numpy.zeros(0)
+    values = None if strata is None else _empty_like(header).column(strata)
+    # rows taken from the blocks, in the order of the file, and position of each row of
+    # the sample in their concatenation
+    pieces = [_empty_like(header)]
+    sources = numpy.zeros(0, dtype="int64")
+    nb_taken = 0
+    for chunk in chunks:
+        chunk_keys = generator.random(chunk.nb_rows)
+        if strata is None and len(keys) == n > 0:
+            candidates = chunk_keys < keys.max()
+            if not candidates.any():
+                continue
+            chunk = chunk.where(candidates)
+            chunk_keys = chunk_keys[candidates]
+        pool_keys = numpy.concatenate([keys, chunk_keys])
+        if strata is not None:
+            values = numpy.concatenate([values, chunk.column(strata)])
+        kept = _smallest(pool_keys, n, values)
+        taken = numpy.sort(kept[kept >= len(keys)] - len(keys))
+        chunk_sources = numpy.zeros(len(chunk_keys), dtype="int64")
+        chunk_sources[taken] = nb_taken + numpy.arange(len(taken))
+        pieces.append(chunk.take(taken))
+        nb_taken += len(taken)
+        keys, sources = pool_keys[kept], numpy.concatenate([sources, chunk_sources])[kept]
+        if strata is not None:
+            values = values[kept]
+        if nb_taken > 2 * len(sources):
+            order = numpy.argsort(sources)
+            pieces, keys = [_gather(pieces, sources[order])], keys[order]
+            sources = numpy.arange(len(order))
+            nb_taken = len(sources)
+            if strata is not None:
+                values = values[order]
+
+    # positions in the rows taken are in the order of the file
+    sample = _gather(pieces, numpy.sort(sources))
+    if read_columns is not columns:
+        return sample.select(columns)
+    return sample
+
+
+def _gather(pieces: List[Data], positions: numpy.ndarray) -> Data:
+    """Rows of the concatenation of ``pieces`` at sorted ``positions``."""
+    ends = numpy.cumsum([piece.nb_rows for piece in pieces])
+    bounds = numpy.searchsorted(positions, numpy.concatenate([[0], ends]))
+    return concat([piece.take(positions[start:stop] - end + piece.nb_rows)
+                   for piece, start, stop, end in zip(pieces, bounds, bounds[1:], ends)])
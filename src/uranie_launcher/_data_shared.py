@@ -0,0 +1,221 @@
+"""Transport of ``data.Data`` to other processes through shared memory.
+
+The columns are copied once in a shared memory block, described by a small picklable
+``SharedData`` handle. Processes receiving the handle, such as the workers of a
+``multiprocessing`` pool, map the block and use its buffers as read-only columns, without
+copy:
+
+- ``Data.Types.DOUBLE``: ``values``, float64;
+- ``Data.Types.STRING``: ``offsets``, int64 (one more than rows), and ``values``, utf-8;
+- ``Data.Types.VECTOR``: ``offsets``, int64 (one more than rows), and ``values``, float64.
+"""
+import atexit
+from multiprocessing import resource_tracker, shared_memory
+from typing import Any, Dict, List, Tuple
+import weakref
+
+import numpy
+
+from . import _columns
+from .data import Data
+
+ALIGNMENT = 64
+"""Alignment in bytes of each buffer in the shared memory block."""
+
+_ATTACHED: Dict[str, Tuple[shared_memory.SharedMemory, weakref.ref]] = {}
+"""Shared memory blocks mapped by ``from_shared`` in this process, by name, with a weak
+reference to the byte array from which all the columns are viewed."""
+
+
+def _align(position: int) -> int:
+    return -(-position // ALIGNMENT) * ALIGNMENT
+
+
+def _column_arrays(value_type: str, values: Any) -> Dict[str, numpy.ndarray]:
+    """Arrays storing the values of a column as returned by ``Data.column``, elements of
+    ``Data.Types.VECTOR`` values being concatenated on copy."""
+    if value_type == Data.Types.DOUBLE:
+        return {"values": values}
+    if value_type == Data.Types.STRING:
+        encoded, offsets = _columns.encode_strings(values)
+        return {"offsets": offsets, "values": encoded}
+    sizes = numpy.fromiter(map(len, values), dtype="int64", count=len(values))
+    return {"offsets": numpy.concatenate([numpy.zeros(1, dtype="int64"), numpy.cumsum(sizes)]),
+            "values": values}
+
+
+def _release(memory: shared_memory.SharedMemory):
+    memory.close()
+    memory.unlink()
+
+
+class SharedData:
+    """Handle on a ``Data`` copied in shared memory by ``Data.to_shared``.
+
+    The handle is picklable and small, whatever the number of rows: send it to other
+    processes, which get the data with ``Data.from_shared``. The process creating the
+    handle owns the shared memory, freed by ``unlink``, when leaving the ``with`` block of
+    the handle, or at the latest when the handle is garbage collected.
+    """
+
+    def __init__(self, data: Data) -> None:
+        """Constructor, copying the columns of ``data`` in a new shared memory block.
+
+        Parameters
+        ----------
+        data : Data
+            Data to share
+        """
+        self._name: str = data.name
+        self._description: str = data.description
+        self._headers: List[Tuple[str, str, str]] = list(zip(data.names, data.types,
+                                                             data.units))
+        self._nb_rows: int = data.nb_rows if data.nb_columns else 0
+        arrays = [_column_arrays(value_type, data.column(name))
+                  for name, value_type in zip(data.names, data.types)]
+
+        position = 0
+        self._layout: List[Dict[str, Tuple[int, str, int]]] = []
+        for buffers in arrays:
+            self._layout.append({})
+            for key, values in buffers.items():
+                dtype = numpy.dtype("float64") if isinstance(values, list) else values.dtype
+                count = sum(map(len, values)) if isinstance(values, list) else len(values)
+                position = _align(position)
+                self._layout[-1][key] = (position, dtype.str, count)
+                position += dtype.itemsize * count
+
+        memory = shared_memory.SharedMemory(create=True, size=max(1, position))
+        self._memory_name: str = memory.name
+        # frees the block even if the copy fails
+        self._finalizer: weakref.finalize = weakref.finalize(self, _release, memory)
+        self._detached: bool = False
+        for buffers, layout in zip(arrays, self._layout):
+            for key, values in buffers.items():
+                offset, dtype, count = layout[key]
+                target = numpy.ndarray((count,), dtype=dtype, buffer=memory.buf, offset=offset)
+                if isinstance(values, list):
+                    numpy.concatenate([numpy.zeros(0)] + values, out=target)
+                else:
+                    target[:] = values
+                del target
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = self.__dict__.copy()
+        state["_finalizer"] = None
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]):
+        self.__dict__.update(state)
+        if self._detached:
+            # this process receives the shared memory given by ``detach``
+            self._detached = False
+            memory = shared_memory.SharedMemory(name=self._memory_name)
+            self._finalizer = weakref.finalize(self, _release, memory)
+
+    def detach(self):
+        """Give the shared memory to the process unpickling the handle next, such as the
+        caller of a function run in a pool of processes returning the handle, which owns it
+        as if it had created the handle.
+
+        Raises
+        ------
+        ValueError
+            If the shared memory is not owned by this process.
+        """
+        if self._finalizer is None or not self._finalizer.alive:
+            raise ValueError(f"The shared data '{self._name}' is not owned by this process.")
+        _, _, (memory,), _ = self._finalizer.detach()
+        # the shared memory must survive this process, which may exit first
+        resource_tracker.unregister(memory._name,  # pylint: disable=protected-access
+                                    "shared_memory")
+        memory.close()
+        self._finalizer = None
+        self._detached = True
+
+    def __enter__(self) -> 'SharedData':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.unlink()
+
+    @property
+    def name(self) -> str:
+        """Name of the shared memory block"""
+        return self._memory_name
+
+    @property
+    def nb_rows(self) -> int:
+        """Number of rows of the shared data"""
+        return self._nb_rows
+
+    def unlink(self):
+        """Free the shared memory, in the process which created the handle.
+
+        Processes having already mapped it keep their data until they ``close`` it or exit.
+        Calling it again, or in another process, does nothing.
+        """
+        if self._finalizer is not None:
+            self._finalizer()
+
+    def close(self):
+        """Unmap the shared memory from this process, once the data returned by
+        ``Data.from_shared`` are no longer used.
+
+        Raises
+        ------
+        ValueError
+            If values of the shared data are still referenced in this process.
+        """
+        memory, root = _ATTACHED.get(self._memory_name, (None, None))
+        if memory is None:
+            return
+        if root() is not None:
+            raise ValueError(f"Values of the shared data '{self._name}' are still used, "
+                             f"it cannot be closed.")
+        del _ATTACHED[self._memory_name]
+        memory.close()
+
+    def attach(self) -> Data:
+        """Map the shared memory in this process, see ``Data.from_shared``."""
+        memory, root = _ATTACHED.get(self._memory_name, (None, lambda: None))
+        if memory is None:
+            memory = shared_memory.SharedMemory(name=self._memory_name)
+        # the views of the columns keep ``array`` alive, which keeps the block mapped
+        array = root()
+        if array is None:
+            array = numpy.frombuffer(memory.buf, dtype="uint8")
+            array.flags.writeable = False
+            _ATTACHED[self._memory_name] = (memory, weakref.ref(array))
+
+        def buffer(layout: Tuple[int, str, int]) -> numpy.ndarray:
+            offset, dtype, count = layout
+            return array[offset:offset + numpy.dtype(dtype).itemsize * count].view(dtype)
+
+        columns = []
+        for (_, value_type, _), layout in zip(self._headers, self._layout):
+            if value_type == Data.Types.DOUBLE:
+                columns.append(_columns.DoubleColumn(buffer(layout["values"])))
+            elif value_type == Data.Types.STRING:
+                columns.append(_columns.StringColumn(buffer(layout["values"]),
+                                                     buffer(layout["offsets"])))
+            else:
+                columns.append(_columns.VectorColumn(buffer(layout["values"]),
+                                                     buffer(layout["offsets"])))
+        return Data(name=self._name, description=self._description,
+                    headers=[Data.Header(name=name, value_type=value_type, value_unit=unit)
+                             for name, value_type, unit in self._headers],
+                    columns=columns)
+
+
+@atexit.register
+def _close_attached():
+    """Unmap the shared memory blocks no longer used when the process exits, the others are
+    unmapped by the system."""
+    for memory, root in _ATTACHED.values():
+        if root() is None:
+            memory.close()
+        else:
+            # closing a block whose values are still referenced raises a BufferError
+            memory.close = lambda: None
+    _ATTACHED.clear()
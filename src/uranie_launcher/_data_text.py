@@ -0,0 +1,175 @@
+"""Vectorized conversion of columns to text, used by the text formats of ``data.Data``.
+
+Each value of a column is converted to the bytes of its text in a row of a ``uint8``
+matrix, padded at the end with NUL bytes. The text of a block of rows is then made by
+concatenating the matrices of its columns with separators and removing the padding, with a
+few NumPy calls per column instead of one Python call per value and per separator.
+
+Doubles are written as ``repr``, the shortest string read back as the same double, or as
+``%.{precision}e``, by Python.
+"""
+from typing import List
+
+import numpy
+
+_QUOTE, _BLANK = b'" '
+
+
+def format_doubles(values: numpy.ndarray, precision: int = None) -> numpy.ndarray:
+    """Texts of doubles.
+
+    Parameters
+    ----------
+    values : numpy.ndarray
+        Doubles
+    precision : int, optional
+        Number of digits after the decimal point of the ``%.{precision}e`` format, by
+        default the shortest string read back as the same double, as ``repr``
+
+    Returns
+    -------
+    numpy.ndarray
+        ``uint8`` matrix of the ASCII bytes of each text, padded with NUL bytes
+    """
+    format_double = repr if precision is None else f"%.{precision}e".__mod__
+    return _matrix(numpy.array(list(map(format_double, numpy.asarray(values, dtype="float64")
+                                        .tolist())), dtype="S"))
+
+
+def format_integers(values: numpy.ndarray) -> numpy.ndarray:
+    """Texts of integers, as ``format_doubles``."""
+    return _matrix(numpy.asarray(values, dtype="int64").astype("S"))
+
+
+def format_strings(values: numpy.ndarray) -> numpy.ndarray:
+    """UTF-8 texts of a ``numpy.ndarray`` of strings, as ``format_doubles``."""
+    try:
+        values = values.astype("S")
+    except UnicodeEncodeError:
+        values = numpy.char.encode(values, "utf-8")
+    return _matrix(values)
+
+
+def _matrix(values: numpy.ndarray) -> numpy.ndarray:
+    """``uint8`` matrix of the bytes of a ``numpy.ndarray`` of bytes, padded with NUL bytes."""
+    return values.view("uint8").reshape(len(values), values.dtype.itemsize)
+
+
+def format_vectors(values: List[numpy.ndarray], precision: int = None) -> numpy.ndarray:
+    """Texts of vectors, such as ``[1.0,2.0]``, as ``format_doubles``.
+
+    Parameters
+    ----------
+    values : List[numpy.ndarray]
+        Elements of each vector
+    precision : int, optional
+        Precision of the elements, see ``format_doubles``
+
+    Returns
+    -------
+    numpy.ndarray
+        ``uint8`` matrix of the ASCII bytes of each text, padded with NUL bytes
+    """
+    sizes = numpy.fromiter(map(len, values), dtype="int64", count=len(values))
+    offsets = numpy.concatenate([[0], numpy.cumsum(sizes)])
+    filled = sizes > 0
+    # elements after a bracket for the first one of each vector, and followed by a comma
+    # or by a bracket for the last one
+    elements = _pad(format_doubles(numpy.concatenate([numpy.zeros(0)] + list(values)),
+                                   precision), 0, before=1, after=1)
+    elements[:, -1] = ord(",")
+    elements[offsets[1:][filled] - 1, -1] = ord("]")
+    elements[offsets[:-1][filled], 0] = ord("[")
+    ends = numpy.concatenate([[0], numpy.cumsum(numpy.count_nonzero(elements, axis=1))])[offsets]
+    widths = numpy.diff(ends)
+    texts = numpy.zeros((len(values), max(2, widths.max(initial=0))), dtype="uint8")
+    texts[numpy.repeat(numpy.arange(len(values)), widths),
+          numpy.arange(ends[-1]) - numpy.repeat(ends[:-1], widths)] = elements[elements != 0]
+    texts[~filled, :2] = numpy.frombuffer(b"[]", dtype="uint8")
+    return texts
+
+
+def _pad(texts: numpy.ndarray, width: int, before: int = 0, after: int = 0) -> numpy.ndarray:
+    """Pad texts with NUL bytes, to at least ``width`` bytes and with ``before`` and ``after``
+    more bytes."""
+    padded = numpy.zeros((len(texts), max(width, before + texts.shape[1] + after)),
+                         dtype="uint8")
+    padded[:, before:before + texts.shape[1]] = texts
+    return padded
+
+
+def _lengths(texts: numpy.ndarray) -> numpy.ndarray:
+    """Number of bytes of texts before the NUL bytes padding them, NUL bytes inside a text
+    being kept."""
+    return numpy.count_nonzero(_filled(texts), axis=1)
+
+
+def _filled(texts: numpy.ndarray) -> numpy.ndarray:
+    """Whether each byte of texts is before the NUL bytes padding them."""
+    return numpy.logical_or.accumulate(texts[:, ::-1] != 0, axis=1)[:, ::-1]
+
+
+def remove_blanks(texts: numpy.ndarray) -> numpy.ndarray:
+    """Texts without blanks, which separate the values of a 'Salome Table'."""
+    kept = texts != _BLANK
+    if kept.all():
+        return texts
+    # the kept bytes of each row are moved to the first columns
+    columns = numpy.cumsum(kept, axis=1) - 1
+    compact = numpy.zeros_like(texts)
+    compact[numpy.nonzero(kept)[0], columns[kept]] = texts[kept]
+    return compact
+
+
+def quote_csv(texts: numpy.ndarray) -> numpy.ndarray:
+    """Texts quoted as the ``csv`` module does, when they contain a comma, a quote or a line
+    break, quotes being doubled."""
+    special = numpy.isin(texts, numpy.frombuffer(b',"\r\n', dtype="uint8")).any(axis=1)
+    escaped = special & (texts == _QUOTE).any(axis=1)
+    rows = numpy.flatnonzero(special & ~escaped)
+    quoted = _pad(texts, 0, after=2)
+    quoted[rows] = _pad(texts[rows], quoted.shape[1], before=1)
+    quoted[rows, 0] = quoted[rows, _lengths(texts[rows]) + 1] = _QUOTE
+    if not escaped.any():
+        return quoted
+    # bytes strings of numpy drop the NUL bytes at their end, which are the padding
+    others = format_strings(numpy.array([
+        b'"' + text.replace(b'"', b'""') + b'"' for text in numpy.ascontiguousarray(
+            texts[escaped]).view(f"S{texts.shape[1]}").ravel().tolist()], dtype=bytes))
+    quoted = _pad(quoted, others.shape[1])
+    quoted[escaped] = _pad(others, quoted.shape[1])
+    return quoted
+
+
+def join_texts(columns: List[numpy.ndarray], separator: str, end: str) -> str:
+    """Join the texts of the columns of each row with a separator, and the rows with an end
+    of line, ending the last row too.
+
+    Parameters
+    ----------
+    columns : List[numpy.ndarray]
+        Texts of the values of each column, as ``format_doubles``
+    separator : str
+        ASCII separator of the values of a row
+    end : str
+        ASCII end of each row
+
+    Returns
+    -------
+    str
+        Text of the rows
+    """
+    nb_rows = len(columns[0]) if columns else 0
+    parts, kept = [], []
+    for index, texts in enumerate(columns):
+        if index:
+            parts.append(numpy.full((nb_rows, len(separator)), ord(separator), dtype="uint8"))
+            kept.append(numpy.ones((nb_rows, len(separator)), dtype=bool))
+        parts.append(texts)
+        kept.append(_filled(texts))
+    parts.append(numpy.broadcast_to(numpy.frombuffer(end.encode(), dtype="uint8"),
+                                    (nb_rows, len(end))))
+    kept.append(numpy.ones((nb_rows, len(end)), dtype=bool))
+    # only the padding is removed, strings may contain NUL bytes
+    return (numpy.concatenate(parts, axis=1)[numpy.concatenate(kept, axis=1)].tobytes()
+            .decode("utf-8"))
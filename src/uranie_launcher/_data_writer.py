@@ -0,0 +1,210 @@
+"""Incremental writing of csv files and 'Salome Tables'.
+"""
+import csv
+import functools
+from pathlib import Path
+from typing import Any, Iterable, List, TextIO
+
+import numpy
+
+from ._compression import is_compressed, open_file
+from ._data_ascii import _write_ascii_header, _write_ascii_rows
+from ._data_concat import _check_headers, _is_csv, _read_file_header
+from ._data_csv import (_read_binary_csv_header, _read_csv_header, _write_csv_header,
+                        _write_csv_rows)
+from .data import BUFFER_SIZE, CHUNK_ROWS, Data, _double_formatter, _empty_like
+
+
+def _count_csv_rows(filepath: Path) -> int:
+    """Number of rows of a csv file.
+
+    Line breaks are counted without parsing the rows, unless a value is quoted and may
+    then contain line breaks.
+    """
+    with open_file(filepath, mode='rb', buffering=BUFFER_SIZE) as binary_file:
+        _read_binary_csv_header(binary_file)
+        nb_lines = 0
+        last = b"\n"
+        for block in iter(functools.partial(binary_file.read, BUFFER_SIZE), b""):
+            if b'"' in block:
+                break
+            nb_lines += block.count(b"\n")
+            last = block[-1:]
+        else:
+            return nb_lines + (last != b"\n")
+    with open_file(filepath, mode='r', encoding='utf-8', newline='') as csv_file:
+        csv_reader = csv.reader(csv_file)
+        _read_csv_header(csv_reader)
+        return sum(1 for _ in csv_reader)
+
+
+def _ends_with_newline(filepath: Path) -> bool:
+    """Whether a non-empty uncompressed file ends with a line break."""
+    with filepath.open(mode='rb') as binary_file:
+        binary_file.seek(-1, 2)
+        return binary_file.read(1) == b"\n"
+
+
+class DataWriter:
+    """Write the rows of a csv file or of a 'Salome Table' by batches.
+
+    The file is csv when its suffix is ``.csv`` and a 'Salome Table' otherwise, unless
+    ``data_format`` is given, possibly compressed. The header is written when the file is
+    created, then each batch of rows is appended to the file without reading or rewriting
+    the previous ones. Use it as a context manager to close the file.
+    """
+
+    def __init__(self,  # pylint: disable=too-many-arguments
+                 filepath: Path, data: Data, append: bool = False, *,
+                 chunk_rows: int = CHUNK_ROWS, buffer_size: int = BUFFER_SIZE,
+                 data_format: str = None, precision: int = None) -> None:
+        """Constructor.
+
+        Parameters
+        ----------
+        filepath : Path
+            Path to file, compressed when its suffix is ``.gz``, ``.bz2`` or ``.xz``
+        data : Data
+            Data defining the name, description and headers of the file, its rows are not
+            written
+        append : bool, optional
+            Whether rows are appended to the file when it exists, instead of replacing it,
+            by default False
+        chunk_rows : int, optional
+            Number of rows formatted at once, by default ``CHUNK_ROWS``
+        buffer_size : int, optional
+            Size in bytes of the file buffer, by default ``BUFFER_SIZE``
+        data_format : str, optional
+            ``"ascii"`` or ``"csv"``, by default detected from the suffix of ``filepath``
+        precision : int, optional
+            Number of digits after the decimal point of the doubles, written as
+            ``%.{precision}e``, by default the shortest string read back as the same double
+
+        Raises
+        ------
+        ValueError
+            If the format is unknown, if ``precision`` is negative or if the names, types or
+            units of the headers of an existing file differ from those of ``data``.
+        """
+        if data_format not in (None, "ascii", "csv"):
+            raise ValueError(f"Unknown format '{data_format}', expected 'ascii' or 'csv'.")
+        _double_formatter(precision)
+        is_csv = _is_csv(filepath) if data_format is None else data_format == "csv"
+        self._filepath: Path = filepath
+        self._header: Data = _empty_like(data)
+        self._chunk_rows: int = chunk_rows
+        self._precision: int = precision
+        self._nb_rows: int = 0
+        self._first_index: int = 0
+
+        exists = append and filepath.is_file() and filepath.stat().st_size > 0
+        if exists:
+            _check_headers([_read_file_header(filepath, is_csv), data],
+                           [str(filepath), f"data '{data.name}'"])
+            if is_csv:
+                self._first_index = _count_csv_rows(filepath)
+        missing_newline = (exists and not is_csv and not is_compressed(filepath)
+                           and not _ends_with_newline(filepath))
+
+        self._file: TextIO = open_file(filepath, mode='a' if exists else 'w', encoding='utf-8',
+                                       newline='' if is_csv else None, buffering=buffer_size)
+        self._csv_writer: Any = csv.writer(self._file) if is_csv else None
+        if missing_newline:
+            self._file.write("\n")
+        if not exists and self._csv_writer is not None:
+            _write_csv_header(self._header, self._csv_writer)
+        elif not exists:
+            _write_ascii_header(self._header, self._file)
+
+    def __enter__(self) -> 'DataWriter':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    @property
+    def filepath(self) -> Path:
+        """Path to the written file"""
+        return self._filepath
+
+    @property
+    def nb_rows(self) -> int:
+        """Number of rows written by this writer"""
+        return self._nb_rows
+
+    def append(self, rows: List[List[float or str or List[float]]] or numpy.ndarray or Data):
+        """Write a batch of rows at the end of the file.
+
+        Parameters
+        ----------
+        rows : List[List[float or str or List[float]]] or numpy.ndarray or Data
+            Rows of values, see ``Data.add_rows``, or data with the headers of the file
+
+        Raises
+        ------
+        ValueError
+            If the values do not match the headers of the file.
+        """
+        if isinstance(rows, Data):
+            _check_headers([self._header, rows], [str(self._filepath), f"data '{rows.name}'"])
+            chunk = rows
+        else:
+            chunk = _empty_like(self._header)
+            chunk.add_rows(rows)
+        if not chunk.nb_columns:
+            return
+        if self._csv_writer is not None:
+            _write_csv_rows(chunk, self._file, self._chunk_rows,
+                            self._first_index + self._nb_rows, self._precision)
+        else:
+            _write_ascii_rows(chunk, self._file, self._chunk_rows, self._precision)
+        self._nb_rows += chunk.nb_rows
+
+    def flush(self):
+        """Write the buffered rows to the file.
+
+        A compressed file is flushed by its codec, but it can only be read once the writer
+        is closed.
+        """
+        self._file.flush()
+        self._file.buffer.raw.flush()
+
+    def close(self):
+        """Write the buffered rows and close the file."""
+        self._file.close()
+
+
+def write_ascii_chunks(header: Data,  # pylint: disable=too-many-arguments
+                       chunks: Iterable[Data], filepath: Path, *, chunk_rows: int = CHUNK_ROWS,
+                       buffer_size: int = BUFFER_SIZE, precision: int = None):
+    """Write blocks of rows to a 'Salome Table', see ``DataWriter``.
+
+    Parameters
+    ----------
+    header : Data
+        Data defining the name, description and headers of the file
+    chunks : Iterable[Data]
+        Blocks of rows, with the headers of ``header``
+    filepath : Path
+        Path to file, compressed when its suffix is ``.gz``, ``.bz2`` or ``.xz``
+    chunk_rows : int, optional
+        Number of rows formatted at once, by default ``CHUNK_ROWS``
+    buffer_size : int, optional
+        Size in bytes of the file buffer, by default ``BUFFER_SIZE``
+    precision : int, optional
+        Number of digits after the decimal point of the doubles, see ``DataWriter``
+    """
+    with DataWriter(filepath, header, chunk_rows=chunk_rows, buffer_size=buffer_size,
+                    data_format="ascii", precision=precision) as writer:
+        for chunk in chunks:
+            writer.append(chunk)
+
+
+def write_csv_chunks(header: Data,  # pylint: disable=too-many-arguments
+                     chunks: Iterable[Data], filepath: Path, *, chunk_rows: int = CHUNK_ROWS,
+                     buffer_size: int = BUFFER_SIZE, precision: int = None):
+    """Write blocks of rows to csv, see ``write_ascii_chunks``."""
+    with DataWriter(filepath, header, chunk_rows=chunk_rows, buffer_size=buffer_size,
+                    data_format="csv", precision=precision) as writer:
+        for chunk in chunks:
+            writer.append(chunk)
@@ -0,0 +1,194 @@
+"""Incremental reading of a json object too large to be loaded at once.
+"""
+import json
+import re
+from typing import Any, Collection, Iterator, TextIO, Tuple
+
+BLOCK_SIZE = 1 << 16
+"""Number of characters read from the file at once."""
+
+_SKIPPED_TOKENS = re.compile(r'"(?:[^"\\]|\\.)*(?P<end>"|\\?\Z)|[][{}]')
+"""Strings, possibly cut by the end of the buffer, and brackets of a skipped value."""
+
+_NUMBER_TAIL = re.compile(r"[-+.0-9eE]*\Z")
+"""Characters of a number up to the end of the buffer, which may continue in the next block."""
+
+
+class _Scanner:
+    """Decode json values one by one from a text file, refilling a buffer as needed."""
+
+    def __init__(self, text_file: TextIO, block_size: int) -> None:
+        """Constructor.
+
+        Parameters
+        ----------
+        text_file : TextIO
+            File opened in text mode
+        block_size : int
+            Number of characters read from the file at once
+        """
+        self._file: TextIO = text_file
+        self._block_size: int = block_size
+        self._buffer: str = ""
+        self._position: int = 0
+        self._eof: bool = False
+        self._decoder: json.JSONDecoder = json.JSONDecoder()
+
+    def _fill(self) -> bool:
+        """Read the next block, return ``False`` at the end of the file.
+
+        The block is at least three times as large as the unconsumed buffer, so that decoding a
+        large value, which is retried after each block, costs a time linear in its size.
+        """
+        remaining = len(self._buffer) - self._position
+        block = "" if self._eof else self._file.read(max(self._block_size, 3 * remaining))
+        self._eof = not block
+        self._buffer = self._buffer[self._position:] + block
+        self._position = 0
+        return not self._eof
+
+    def peek(self) -> str:
+        """Next non-blank character, without consuming it (empty at the end of the file)."""
+        while True:
+            while self._position < len(self._buffer) and self._buffer[self._position].isspace():
+                self._position += 1
+            if self._position < len(self._buffer) or not self._fill():
+                return self._buffer[self._position:self._position + 1]
+
+    def expect(self, characters: str) -> str:
+        """Consume the next non-blank character, which must be one of ``characters``.
+
+        Raises
+        ------
+        ValueError
+            If the next character is not expected.
+        """
+        character = self.peek()
+        if not character or character not in characters:
+            raise ValueError(f"Invalid json: expected one of '{characters}', "
+                             f"found '{character}'.")
+        self._position += 1
+        return character
+
+    def decode(self) -> Any:
+        """Decode the next json value.
+
+        A value followed only by characters of a number up to the end of the buffer, such as
+        ``12`` of ``123`` or ``1`` of ``1.5``, may be cut: the next block is read and the value
+        is decoded again.
+
+        Raises
+        ------
+        json.JSONDecodeError
+            If the value is not valid json.
+        """
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._position)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            if self._eof or not _NUMBER_TAIL.match(self._buffer, end):
+                self._position = end
+                return value
+            self._fill()
+
+    def skip(self):
+        """Consume the next json value without decoding it, when it is an array or an object.
+
+        Raises
+        ------
+        ValueError
+            If the file ends before the end of the value.
+        """
+        if self.peek() not in ("[", "{"):
+            self.decode()
+            return
+        depth = 0
+        while True:
+            for match in _SKIPPED_TOKENS.finditer(self._buffer, self._position):
+                if match.group("end") is not None and match.group("end") != '"':
+                    break  # string cut by the end of the buffer
+                if match.group() in ("[", "{"):
+                    depth += 1
+                elif match.group() in ("]", "}"):
+                    depth -= 1
+                    if depth == 0:
+                        self._position = match.end()
+                        return
+                self._position = match.end()
+            if not self._fill():
+                raise ValueError("Invalid json: unexpected end of file.")
+
+
+def iter_members(text_file: TextIO,  # pylint: disable=too-many-branches  # noqa: C901
+                 streamed_key: str, block_size: int = BLOCK_SIZE, selected_key: str = None,
+                 selected: Collection[str] = None) -> Iterator[Tuple[str, Any]]:
+    """Iterate over the members of the top level json object of a file.
+
+    Each member is yielded as ``(key, value)``, except the one named ``streamed_key`` which
+    must be an array: it is yielded as ``(key, element)`` for each of its elements, and the
+    one named ``selected_key`` which must be an object: it is yielded as ``(key, None)``
+    when it starts, then as ``(key, (name, value))`` for each of its members in
+    ``selected``, the other members are skipped without being decoded.
+
+    Parameters
+    ----------
+    text_file : TextIO
+        File opened in text mode
+    streamed_key : str
+        Key of the array to read element by element
+    block_size : int, optional
+        Number of characters read from the file at once, by default ``BLOCK_SIZE``
+    selected_key : str, optional
+        Key of the object to read member by member, by default None
+    selected : Collection[str], optional
+        Names of the members of ``selected_key`` to decode, by default all of them
+
+    Yields
+    ------
+    Tuple[str, Any]
+        Key and value (or element) of the members
+
+    Raises
+    ------
+    ValueError
+        If the file is not a json object.
+    """
+    scanner = _Scanner(text_file, block_size)
+    scanner.expect("{")
+    if scanner.peek() == "}":
+        return
+    while True:
+        key = scanner.decode()
+        scanner.expect(":")
+        if key == streamed_key:
+            scanner.expect("[")
+            if scanner.peek() == "]":
+                scanner.expect("]")
+            else:
+                while True:
+                    yield key, scanner.decode()
+                    if scanner.expect(",]") == "]":
+                        break
+        elif key == selected_key:
+            scanner.expect("{")
+            yield key, None
+            if scanner.peek() == "}":
+                scanner.expect("}")
+            else:
+                while True:
+                    name = scanner.decode()
+                    scanner.expect(":")
+                    if selected is None or name in selected:
+                        yield key, (name, scanner.decode())
+                    else:
+                        scanner.skip()
+                    if scanner.expect(",}") == "}":
+                        break
+        else:
+            yield key, scanner.decode()
+        if scanner.expect(",}") == "}":
+            return
@@ -0,0 +1,104 @@
+""" Script to convert a file of results to another format, by blocks of rows.
+"""
+
+import argparse
+import logging
+from pathlib import Path
+import sys
+import time
+from typing import Iterator, List
+
+from uranie_launcher import __name__ as uranie_launcher_name
+from uranie_launcher import data, utils
+
+
+def _filter_chunks(chunks: Iterator[data.Data], columns: List[str],
+                   conditions: List[List[str]]) -> Iterator[data.Data]:
+    """Keep the rows of each block satisfying all the conditions, then the selected
+    headers.
+
+    Raises
+    ------
+    ValueError
+        If a condition compares a ``Data.Types.VECTOR`` header or uses an unknown operator.
+    """
+    for chunk in chunks:
+        if conditions:
+            chunk = chunk.where(data.where_mask(chunk, conditions))
+        yield chunk.select(columns) if columns else chunk
+
+
+def main_convert(arguments):
+    """ Convert a file with the given command line arguments.
+
+    Parameters
+    ----------
+    arguments: list of str
+        Command line arguments.
+
+    Returns
+    -------
+    int
+        Return code.
+    """
+    # Interpret arguments
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("input_file", type=Path, help="file to convert")
+    parser.add_argument("output_file", type=Path,
+                        help="converted file, compressed when its suffix is .gz, .bz2 or .xz")
+    parser.add_argument("--from", dest="input_format",
+                        help="format of the input file (default: detected)")
+    parser.add_argument("--to", dest="output_format",
+                        help="format of the output file (default: detected from its suffix)")
+    parser.add_argument("--columns", nargs="+", metavar="NAME",
+                        help="headers to keep, in this order (default: all)")
+    parser.add_argument("--where", nargs=3, action="append", default=[],
+                        metavar=("NAME", "OPERATOR", "VALUE"),
+                        help=f"keep the rows where the header compares to the value, with an "
+                             f"operator among {' '.join(data.OPERATORS)}, may be repeated")
+    parser.add_argument("--chunk-rows", type=int, default=data.CHUNK_ROWS,
+                        help="number of rows converted at once (default: %(default)s)")
+    args = parser.parse_args(arguments)
+
+    utils.set_verbosity(utils.INFO)
+
+    nb_rows = {"read": 0, "written": 0}
+
+    def count(chunks: Iterator[data.Data], key: str) -> Iterator[data.Data]:
+        for chunk in chunks:
+            nb_rows[key] += chunk.nb_rows
+            yield chunk
+
+    start = time.perf_counter()
+    try:
+        # only the kept headers and those of the conditions are read
+        read_columns = (list(dict.fromkeys(args.columns + [name for name, _, _ in args.where]))
+                        if args.columns else None)
+        # a dataset skips the parts whose statistics cannot satisfy the conditions
+        options = ({"where": args.where} if data.get_format(
+            args.input_file, args.input_format).name == "dataset" else {})
+        header, chunks = data.read_chunks(args.input_file, args.chunk_rows, args.input_format,
+                                          read_columns, **options)
+        data.save_chunks(count(_filter_chunks(count(chunks, "read"), args.columns,
+                                              [] if options else args.where), "written"),
+                         args.output_file,
+                         header=header.select(args.columns) if args.columns else header,
+                         data_format=args.output_format, chunk_rows=args.chunk_rows)
+    except ValueError as error:
+        parser.error(str(error))
+    duration = max(time.perf_counter() - start, 1e-9)
+
+    # a dataset is a directory of files
+    filepaths = ([path for path in args.input_file.rglob("*") if path.is_file()]
+                 if args.input_file.is_dir() else [args.input_file])
+    size = sum(filepath.stat().st_size for filepath in filepaths) / 1e6
+    utils.info(f"Converted {nb_rows['read']} rows ({size:.1f} MB) of {args.input_file} to "
+               f"{nb_rows['written']} rows of {args.output_file} in {duration:.2f} s: "
+               f"{nb_rows['read'] / duration:.0f} rows/s, {size / duration:.1f} MB/s.")
+    return 0
+
+
+def run_convert():
+    """ Entry point for the ``uranie-launcher-convert`` script."""
+    logging.getLogger(uranie_launcher_name).addHandler(logging.StreamHandler(sys.stdout))
+    sys.exit(main_convert(sys.argv[1:]))
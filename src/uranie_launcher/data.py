@@ -1,10 +1,70 @@
-"""Module to load, parse and write data based on uranie file format (ascii or json).
+"""Module to load, parse and write data based on uranie file format (ascii, csv, json or binary).
 """
-import csv
 from datetime import datetime
-import json
-from pathlib import Path
-from typing import Any, List
+import functools
+import importlib
+import itertools
+import operator
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Tuple
+import warnings
+
+import numpy
+
+from . import _columns, _data_text
+
+_LAZY_ATTRIBUTES = {
+    "data_to_csv": "_data_csv",
+    "iter_csv_chunks": "_data_csv",
+    "csv_to_data": "_data_csv",
+    "JSON_ITEMS": "_data_json",
+    "JSON_COLUMNS": "_data_json",
+    "data_to_json": "_data_json",
+    "iter_json_chunks": "_data_json",
+    "json_to_data": "_data_json",
+    "data_to_ascii": "_data_ascii",
+    "iter_ascii_chunks": "_data_ascii",
+    "ascii_to_data": "_data_ascii",
+    "data_to_binary": "_data_binary",
+    "binary_to_data": "_data_binary",
+    "build_ascii_index": "_data_index",
+    "AsciiTableReader": "_data_index",
+    "concat": "_data_concat",
+    "concat_files": "_data_concat",
+    "DataWriter": "_data_writer",
+    "JOINS": "_data_join",
+    "join": "_data_join",
+    "join_files": "_data_join",
+    "SharedData": "_data_shared",
+    "OPERATORS": "_data_filter",
+    "where_mask": "_data_filter",
+    "Comparison": "_data_compare",
+    "compare": "_data_compare",
+    "sample_rows": "_data_sample",
+    "PART_ROWS": "_data_dataset",
+    "DatasetWriter": "_data_dataset",
+    "read_manifest": "_data_dataset",
+    "read_dataset": "_data_dataset",
+    "write_dataset": "_data_dataset",
+    "AGGREGATIONS": "_data_groupby",
+    "GroupBy": "_data_groupby",
+    "COMPRESSIONS": "_compression",
+    "DataFormat": "_data_formats",
+    "register_format": "_data_formats",
+    "formats": "_data_formats",
+    "get_format": "_data_formats",
+    "load": "_data_formats",
+    "iter_chunks": "_data_formats",
+    "read_chunks": "_data_formats",
+    "save": "_data_formats",
+    "save_chunks": "_data_formats",
+}
+"""Public names defined in the modules of each format, imported on first use."""
+
+CHUNK_ROWS = 10_000
+"""Default number of rows per block when reading or writing files by blocks."""
+
+BUFFER_SIZE = 1 << 20
+"""Default size in bytes of the buffer of written files."""
 
 
 class Data():
@@ -36,11 +96,7 @@ class Data():
             Any
                 Value casted as expected type
             """
-            return {
-                Data.Types.STRING: str,
-                Data.Types.DOUBLE: float,
-                Data.Types.VECTOR: lambda val: [float(v) for v in val.strip('][').split(',')],
-            }[value_type](value)
+            return _PARSERS[value_type](value)
 
         @staticmethod
         def check_type(value: Any, value_type: str, var_name: str, row_index: int):
@@ -65,26 +121,65 @@ class Data():
                 The type of an element of ``Data.Types.VECTOR`` is not float.
             """
 
-            types = {
-                Data.Types.STRING: str,
-                Data.Types.DOUBLE: (float, int),
-                Data.Types.VECTOR: list,
-            }
-            if not isinstance(value, types[value_type]):
+            if not isinstance(value, _PYTHON_TYPES[value_type]):
                 raise ValueError(
                     f"Type is not correct: found {type(value)},"
-                    f"expected {types[value_type]} for '{var_name}' at row {row_index}.")
+                    f"expected {_PYTHON_TYPES[value_type]} for '{var_name}' at row {row_index}.")
 
-            if value_type == Data.Types.VECTOR:
+            if value_type == Data.Types.VECTOR and not _is_float_array(value):
                 for elt, val in enumerate(value):
                     if not isinstance(val, float):
                         raise ValueError(
                             f"Element of vector is not correct: found {type(val)},"
                             f"expected float for '{var_name}' at row {row_index}, element {elt}.")
 
+        @staticmethod
+        def check_values(values: Any, value_type: str, var_name: str, first_row_index: int):
+            """Check the type of all the values of a column at once.
+
+            The distinct Python types found in the column are checked instead of each value,
+            ``check_type`` being called value by value only to report an error.
+
+            Parameters
+            ----------
+            values : Any
+                Sequence of values to test, or ``numpy.ndarray``
+            value_type : str
+                Uranie ``Data.Types``
+            var_name : str
+                Name associated to the variable
+            first_row_index : int
+                Row in the Data of the first value
+
+            Raises
+            ------
+            ValueError
+                The type is not in ``Data.Types``.
+            ValueError
+                The type of an element of ``Data.Types.VECTOR`` is not float.
+            """
+            if isinstance(values, numpy.ndarray) and \
+                    values.dtype.kind in _NUMPY_KINDS.get(value_type, ""):
+                return
+
+            valid = all(issubclass(found, _PYTHON_TYPES[value_type])
+                        for found in set(map(type, values)))
+            if valid and value_type == Data.Types.VECTOR:
+                lists = [value for value in values if not _is_float_array(value)]
+                valid = all(issubclass(found, float)
+                            for found in set(map(type, itertools.chain.from_iterable(lists))))
+            if not valid:
+                for index, value in enumerate(values):
+                    Data.Types.check_type(value=value,
+                                          value_type=value_type,
+                                          var_name=var_name,
+                                          row_index=first_row_index + index)
+
     class Header:
         """Class defining data header"""
 
+        __slots__ = ("_name", "_value_type", "_value_unit")
+
         def __init__(self, name: str, value_type: str, value_unit: str) -> None:
             """Constructor.
 
@@ -116,7 +211,105 @@ class Data():
             """unit of the variable"""
             return self._value_unit
 
-    def __init__(self, name: str, description: str, headers: List['Data.Header']):
+    class Schema:
+        """Class describing the headers of a ``Data``.
+
+        It is built once per ``Data`` and holds, for each header, the functions parsing,
+        formatting and checking its values, so that they are not selected value by value.
+        """
+
+        __slots__ = ("_headers", "_names", "_types", "_units", "_indices",
+                     "_parsers", "_column_parsers", "_formatters", "_validators")
+
+        def __init__(self, headers: List['Data.Header']) -> None:
+            """Constructor.
+
+            Parameters
+            ----------
+            headers : List[Data.Header]
+                List of ``Data.Header`` to define the content
+            """
+            self._headers: Tuple['Data.Header', ...] = tuple(headers)
+            self._names: Tuple[str, ...] = tuple(header.name for header in headers)
+            self._types: Tuple[str, ...] = tuple(header.value_type for header in headers)
+            self._units: Tuple[str, ...] = tuple(header.value_unit for header in headers)
+            self._indices: Dict[str, int] = {name: index for index, name in enumerate(self._names)}
+            self._parsers: Tuple[Callable[[str], Any], ...] = tuple(
+                _PARSERS[value_type] for value_type in self._types)
+            self._column_parsers: Tuple[Callable[[List[str]], Any], ...] = tuple(
+                _COLUMN_PARSERS[value_type] for value_type in self._types)
+            self._formatters: Tuple[Callable[[Any], str], ...] = tuple(
+                _FORMATTERS[value_type] for value_type in self._types)
+            self._validators: Tuple[Callable[..., None], ...] = tuple(
+                functools.partial(Data.Types.check_values, value_type=value_type, var_name=name)
+                for name, value_type in zip(self._names, self._types))
+
+        @property
+        def headers(self) -> Tuple['Data.Header', ...]:
+            """``Data.Header`` defining the content"""
+            return self._headers
+
+        @property
+        def names(self) -> Tuple[str, ...]:
+            """Header names"""
+            return self._names
+
+        @property
+        def types(self) -> Tuple[str, ...]:
+            """Header types"""
+            return self._types
+
+        @property
+        def units(self) -> Tuple[str, ...]:
+            """Header units"""
+            return self._units
+
+        @property
+        def parsers(self) -> Tuple[Callable[[str], Any], ...]:
+            """Functions converting a value from string, as ``Data.Types.convert``"""
+            return self._parsers
+
+        @property
+        def column_parsers(self) -> Tuple[Callable[[List[str]], Any], ...]:
+            """Functions converting all the values of a column from string at once, into
+            values accepted by ``Data.extend_columns``"""
+            return self._column_parsers
+
+        @property
+        def formatters(self) -> Tuple[Callable[[Any], str], ...]:
+            """Functions converting a value to a string without blank, except in strings"""
+            return self._formatters
+
+        @property
+        def validators(self) -> Tuple[Callable[..., None], ...]:
+            """Functions checking values as ``Data.Types.check_values``, called with the
+            ``values`` and the ``first_row_index`` keyword arguments"""
+            return self._validators
+
+        def index(self, name: str) -> int:
+            """Position of a header.
+
+            Parameters
+            ----------
+            name : str
+                Header name
+
+            Returns
+            -------
+            int
+                Index of the header
+
+            Raises
+            ------
+            ValueError
+                If there is no header named ``name``.
+            """
+            if name not in self._indices:
+                raise ValueError(f"Unknown header '{name}', expected one of {list(self._names)}.")
+            return self._indices[name]
+
+    def __init__(self, name: str, description: str, headers: List['Data.Header'],
+                 columns: List[_columns.Column] = None):
         """Constructor.
 
         Parameters
@@ -127,12 +320,29 @@ class Data():
             Description of the data
         headers : List[Data.Header]
             List of ``Data.Header`` to define the content
+        columns : List[_columns.Column], optional
+            Storage of the values of each header, as created by the readers,
+            by default empty storages
+
+        Raises
+        ------
+        ValueError
+            If columns are not one per header, of the same length
         """
         self._name: str = name
         self._description: str = description
         self._headers: List['Data.Header'] = headers
-        self._values: List[List[float or str or List[float]]] = [
-            [] for i in range(len(self._headers))]
+        self._schema: Data.Schema = Data.Schema(headers)
+        if columns is None:
+            storages = {
+                Data.Types.STRING: _columns.StringColumn,
+                Data.Types.DOUBLE: _columns.DoubleColumn,
+                Data.Types.VECTOR: _columns.VectorColumn,
+            }
+            columns = [storages[header.value_type]() for header in self._headers]
+        if len(columns) != len(headers) or len(set(map(len, columns))) > 1:
+            raise ValueError("Expected one column per header, all of the same length.")
+        self._columns: List[_columns.Column] = columns
 
     @property
     def name(self) -> str:
@@ -149,35 +359,40 @@ class Data():
         """List of ``Data.Header`` defining the content"""
         return self._headers
 
+    @property
+    def schema(self) -> 'Data.Schema':
+        """``Data.Schema`` of the headers"""
+        return self._schema
+
     @property
     def names(self) -> List[str]:
         """List of header names"""
-        return [header.name for header in self.headers]
+        return list(self._schema.names)
 
     @property
     def types(self) -> List[str]:
         """List of header types"""
-        return [header.value_type for header in self.headers]
+        return list(self._schema.types)
 
     @property
     def units(self) -> List[str]:
         """List of header units"""
-        return [header.value_unit for header in self.headers]
+        return list(self._schema.units)
 
     @property
     def values(self) -> List[List[float or str or List[float]]]:
-        """values per header"""
-        return self._values
+        """values per header, copied as Python objects (see ``column`` to avoid the copy)"""
+        return [column.tolist() for column in self._columns]
 
     @property
     def nb_rows(self):
         """Number of values per header"""
-        return len(self.values[0])
+        return len(self._columns[0])
 
     @property
     def nb_columns(self):
         """Number of header"""
-        return len(self.headers)
+        return len(self._schema.names)
 
     def add_values(self, values: List[float or str or List[float]]):
         """Add a row in the data.
@@ -189,17 +404,74 @@ class Data():
 
         Raises
         ------
+        ValueError
+            If there is not one value per header
         ValueError
             If type is not coherent with header
         """
-
-        for index, value in enumerate(values):
+        if len(values) != self.nb_columns:
+            raise ValueError(f"Each row must contain {self.nb_columns} values.")
+        for value, header, column in zip(values, self.headers, self._columns):
             Data.Types.check_type(value=value,
-                                  value_type=self.types[index],
-                                  row_index=len(self._values[index]),
-                                  var_name=self.names[index])
-        for index, value in enumerate(values):
-            self._values[index].append(value)
+                                  value_type=header.value_type,
+                                  row_index=len(column),
+                                  var_name=header.name)
+        for value, column in zip(values, self._columns):
+            column.append(value)
+
+    def add_rows(self, rows: List[List[float or str or List[float]]] or numpy.ndarray):
+        """Add several rows in the data.
+
+        Types are checked once per column, see ``extend_columns``.
+
+        Parameters
+        ----------
+        rows : List[List[float or str or List[float]]] or numpy.ndarray
+            Value for each header, for each row. A 2-D ``numpy.ndarray`` is added column by
+            column without conversion to Python objects.
+
+        Raises
+        ------
+        ValueError
+            If a row has not one value per header
+        ValueError
+            If type is not coherent with header
+        """
+        if isinstance(rows, numpy.ndarray):
+            if rows.ndim != 2 or rows.shape[1] != self.nb_columns:
+                raise ValueError(f"Each row must contain {self.nb_columns} values.")
+            self.extend_columns(list(rows.T))
+            return
+        if any(len(row) != self.nb_columns for row in rows):
+            raise ValueError(f"Each row must contain {self.nb_columns} values.")
+        self.extend_columns([list(values) for values in zip(*rows)] if rows else
+                            [[] for _ in self._columns])
+
+    def extend_columns(self, columns: List[List[float or str or List[float]] or numpy.ndarray]):
+        """Add values at the end of each header.
+
+        All the columns are checked before any value is added, so that the data is left
+        unchanged on error.
+
+        Parameters
+        ----------
+        columns : List[List[float or str or List[float]] or numpy.ndarray]
+            Values to add for each header, all of the same length
+
+        Raises
+        ------
+        ValueError
+            If there is not one column per header or if columns differ in length
+        ValueError
+            If type is not coherent with header
+        """
+        if len(columns) != self.nb_columns or len(set(map(len, columns))) > 1:
+            raise ValueError(f"Expected {self.nb_columns} columns of the same length, "
+                             f"got lengths {[len(values) for values in columns]}.")
+        for values, validator, column in zip(columns, self._schema.validators, self._columns):
+            validator(values=values, first_row_index=len(column))
+        for values, column in zip(columns, self._columns):
+            column.extend(values)
 
     def get_values(self, index) -> List[float or str or List[float]]:
         """Get a row in the data.
@@ -214,215 +486,475 @@ class Data():
         List[float or str or List[float]]
             Value for each header
         """
-        return [values[index] for values in self.values]
+        return [column[index] for column in self._columns]
+
+    def get_rows(self, start: int, stop: int) -> List[List[float or str or List[float]]]:
+        """Get consecutive rows in the data.
+
+        Parameters
+        ----------
+        start : int
+            Index of the first row
+        stop : int
+            Index after the last row
+
+        Returns
+        -------
+        List[List[float or str or List[float]]]
+            Value for each header, for each row
+        """
+        return [list(row) for row in zip(*[column.tolist(start, stop)
+                                           for column in self._columns])]
+
+    def column(self, name: str) -> numpy.ndarray or List[numpy.ndarray]:
+        """Get the values of a header, without copy except for strings.
+
+        ``Data.Types.DOUBLE`` values are returned as a read-only ``numpy.ndarray`` sharing
+        the memory of the data, ``Data.Types.VECTOR`` values as a list of read-only
+        ``numpy.ndarray``, one per row. ``Data.Types.STRING`` values, stored in UTF-8, are
+        decoded on first call into a read-only fixed-width unicode ``numpy.ndarray``, kept
+        until rows are added: it takes 4 bytes per character of the longest string for every
+        row. The view is not updated by rows added afterwards.
+
+        Parameters
+        ----------
+        name : str
+            Header name
+
+        Returns
+        -------
+        numpy.ndarray or List[numpy.ndarray]
+            Values of the header
+
+        Raises
+        ------
+        ValueError
+            If there is no header named ``name``.
+        """
+        return self._columns[self._schema.index(name)].view()
+
+    def to_numpy(self) -> Dict[str, numpy.ndarray or List[numpy.ndarray]]:
+        """Get the values of all headers, without copy except for strings.
+
+        Returns
+        -------
+        Dict[str, numpy.ndarray or List[numpy.ndarray]]
+            Values per header name, as returned by ``column``
+        """
+        return {name: column.view() for name, column in zip(self._schema.names, self._columns)}
+
+    def groupby(self, keys: str or List[str]) -> Any:
+        """Group the rows of the data by the values of key headers, to aggregate the values
+        of the other headers in each group, as in::
+
+            my_data.groupby(["scenario", "mesh_level"]).agg({"pi": ["mean", "max", 0.95]})
+
+        Parameters
+        ----------
+        keys : str or List[str]
+            Names of the ``Data.Types.DOUBLE`` or ``Data.Types.STRING`` headers whose values
+            define the groups
+
+        Returns
+        -------
+        GroupBy
+            Groups of rows, aggregated by ``GroupBy.agg``
+
+        Raises
+        ------
+        ValueError
+            If a key header does not exist or is a ``Data.Types.VECTOR`` header.
+        """
+        return importlib.import_module(f"{__package__}._data_groupby").GroupBy(
+            self, [keys] if isinstance(keys, str) else keys)
+
+    def to_shared(self) -> Any:
+        """Copy the data in shared memory, to be used by other processes without copy.
+
+        Returns
+        -------
+        SharedData
+            Picklable handle on the shared memory, to be sent to the other processes and
+            freed with ``SharedData.unlink``, as in::
+
+                with my_data.to_shared() as handle:
+                    pool.map(post_process, [handle] * nb_tasks)
+
+            where ``post_process`` gets the data with ``Data.from_shared(handle)``
+        """
+        return importlib.import_module(f"{__package__}._data_shared").SharedData(self)
+
+    @staticmethod
+    def from_shared(handle: Any) -> 'Data':
+        """Get data copied in shared memory by ``to_shared``, possibly in another process.
+
+        The shared memory is mapped once per process and its buffers are used as read-only
+        columns, copied only when rows are added to the data.
+
+        Parameters
+        ----------
+        handle : SharedData
+            Handle returned by ``to_shared``
+
+        Returns
+        -------
+        Data
+            Data sharing the memory of the handle
+
+        Raises
+        ------
+        FileNotFoundError
+            If the shared memory has been freed before being mapped in this process.
+        """
+        return handle.attach()
+
+    def _view(self, headers: List['Data.Header'], columns: List[_columns.Column],
+              rows: slice or numpy.ndarray, size: int) -> 'Data':
+        """New data made of ``rows`` of ``columns``, each one taken on first access."""
+        return Data(name=self.name,
+                    description=self.description,
+                    headers=headers,
+                    columns=[_columns.LazyColumn(size, functools.partial(column.take, rows))
+                             for column in columns])
+
+    def select(self, columns: List[str]) -> 'Data':
+        """Get some headers of the data without copy.
+
+        Parameters
+        ----------
+        columns : List[str]
+            Names of the headers, in the order of the new data
+
+        Returns
+        -------
+        Data
+            Data sharing the memory of this one, copied when rows are added to it
+
+        Raises
+        ------
+        ValueError
+            If a header does not exist.
+        """
+        indices = [self._schema.index(name) for name in columns]
+        nb_rows = self.nb_rows if self.nb_columns else 0
+        return self._view([self._headers[index] for index in indices],
+                          [self._columns[index] for index in indices],
+                          slice(0, nb_rows), nb_rows)
 
+    def take(self, indices: slice or Iterable[int]) -> 'Data':
+        """Get some rows of the data.
 
-def data_to_csv(data: Data, filepath: Path):
-    """Convert ``Data`` to csv.
+        A slice of rows shares the memory of this data, other rows are gathered when a
+        header is first accessed.
+
+        Parameters
+        ----------
+        indices : slice or Iterable[int]
+            Rows to take, in the order of the new data
+
+        Returns
+        -------
+        Data
+            Rows ``indices`` of the data, not updated by rows added afterwards
+
+        Raises
+        ------
+        IndexError
+            If a row does not exist.
+        """
+        nb_rows = self.nb_rows if self.nb_columns else 0
+        if isinstance(indices, slice):
+            selected = range(nb_rows)[indices]
+            rows = slice(selected.start, selected.stop if selected.stop >= 0 else None,
+                         selected.step) if selected else slice(0, 0)
+            size = len(selected)
+        else:
+            rows = numpy.asarray(indices, dtype="int64").reshape(-1)
+            if rows.size and not -nb_rows <= rows.min() <= rows.max() < nb_rows:
+                raise IndexError(f"Row indices out of range [0;{nb_rows}[.")
+            size = rows.size
+        return self._view(self._headers, self._columns, rows, size)
+
+    def where(self, mask: numpy.ndarray or Callable[['Data'], numpy.ndarray]) -> 'Data':
+        """Get the rows of the data matching a condition.
+
+        Parameters
+        ----------
+        mask : numpy.ndarray or Callable[[Data], numpy.ndarray]
+            One boolean per row, or function computing them from the data, such as
+            ``lambda data: data.column("status") == 0``
+
+        Returns
+        -------
+        Data
+            Rows whose boolean is ``True``, as returned by ``take``
+
+        Raises
+        ------
+        ValueError
+            If there is not one boolean per row.
+        """
+        nb_rows = self.nb_rows if self.nb_columns else 0
+        mask = numpy.asarray(mask(self) if callable(mask) else mask)
+        if mask.dtype != bool or mask.shape != (nb_rows,):
+            raise ValueError(f"Expected a mask of {nb_rows} booleans, "
+                             f"got {mask.dtype} values of shape {mask.shape}.")
+        return self.take(numpy.flatnonzero(mask))
+
+
+def _parse_vector(value: str) -> List[float]:
+    values = value.strip('][')
+    return [float(element) for element in values.split(',')] if values.strip() else []
+
+
+def _parse_doubles(values: List[str]) -> numpy.ndarray:
+    return numpy.array(values, dtype="float64")
+
+
+def _parse_vectors(values: List[str]) -> List[numpy.ndarray]:
+    """Parse vectors by joining their elements, parsed at once by NumPy."""
+    values = [value.strip().strip('][') for value in values]
+    sizes = numpy.array([value.count(',') + 1 if value.strip() else 0 for value in values],
+                        dtype="int64")
+    offsets = numpy.concatenate([numpy.zeros(1, dtype="int64"), numpy.cumsum(sizes)]).tolist()
+    text = ",".join(value for value in values if value.strip())
+    with warnings.catch_warnings():
+        warnings.simplefilter("error", DeprecationWarning)
+        try:
+            elements = numpy.fromstring(text, dtype="float64", sep=",")
+        except (ValueError, DeprecationWarning) as error:
+            raise ValueError(f"Invalid vector in {values}.") from error
+    if elements.size != offsets[-1]:
+        raise ValueError(f"Invalid vector in {values}.")
+    return [elements[start:stop] for start, stop in zip(offsets, offsets[1:])]
+
+
+def _is_float_array(value: Any) -> bool:
+    return isinstance(value, numpy.ndarray) and value.ndim == 1 and value.dtype.kind == "f"
+
+
+def _format_vector(value: List[float]) -> str:
+    return "[" + ",".join(map(repr, value)) + "]"
+
+
+_PARSERS = {
+    Data.Types.STRING: str,
+    Data.Types.DOUBLE: float,
+    Data.Types.VECTOR: _parse_vector,
+}
+"""Conversion from string of each ``Data.Types``."""
+
+_COLUMN_PARSERS = {
+    Data.Types.STRING: list,
+    Data.Types.DOUBLE: _parse_doubles,
+    Data.Types.VECTOR: _parse_vectors,
+}
+"""Conversion from strings of a column of each ``Data.Types``."""
+
+_FORMATTERS = {
+    Data.Types.STRING: str,
+    Data.Types.DOUBLE: repr,
+    Data.Types.VECTOR: _format_vector,
+}
+"""Conversion to string of each ``Data.Types``."""
+
+
+def _double_formatter(precision: int = None) -> Callable[[float], str]:
+    """Function converting a double to a string.
 
     Parameters
     ----------
-    data : Data
-        data to dump
-    filepath : Path
-        Path to file
+    precision : int, optional
+        Number of digits after the decimal point of the ``%.{precision}e`` format, by
+        default the shortest string read back as the same double
+
+    Raises
+    ------
+    ValueError
+        If ``precision`` is negative.
     """
-    with filepath.open(mode='w', encoding='utf-8', newline='') as csv_file:
-        csv_writer = csv.writer(csv_file)
-        csv_writer.writerow(["NAME", data.name])
-        csv_writer.writerow(["TITLE", data.description])
-        csv_writer.writerow(["DATE", _get_date()])
-        csv_writer.writerow(["COLUMN_NAMES"] + data.names)
-        csv_writer.writerow(["COLUMN_TYPES"] + data.types)
-        csv_writer.writerow(["COLUMN_TITLES"] + data.names)
-        csv_writer.writerow(["COLUMN_UNITS"] + data.units)
-        csv_writer.writerows([[index] + [str(values[index]) for values in data.values]
-                              for index in range(data.nb_rows)])
-
-
-def csv_to_data(filepath: Path) -> Data:
-    """Convert csv to ``Data``.
+    if precision is None:
+        return repr
+    if precision < 0:
+        raise ValueError(f"precision must be positive or zero, got {precision}.")
+    return f"%.{precision}e".__mod__
 
-    Parameters
-    ----------
-    filepath : Path
-        Path to file
 
-    Returns
-    -------
-    Data
-        Loaded data
+def _column_formatters(data: Data, format_text: Callable[[numpy.ndarray], numpy.ndarray],
+                       precision: int = None) -> List[Callable[[Any], numpy.ndarray]]:
+    """Functions converting the values of a column of each header of ``data`` to texts at
+    once, as ``_data_text.format_doubles``, see ``_double_formatter``.
+
+    ``format_text`` is applied to the texts of strings and vectors, such as
+    ``_data_text.quote_csv``.
     """
-    with filepath.open(mode='r', encoding='utf-8') as csv_file:
-
-        matrix = []
-        csv_reader = csv.reader(csv_file)
-        for line_no, line in enumerate(csv_reader):
-            if line_no == 0:
-                name = line[1]
-            elif line_no == 1:
-                description = line[1]
-            elif line_no == 2:
-                pass  # date
-            elif line_no == 3:
-                names = line[1:]
-            elif line_no == 4:
-                types = line[1:]
-            elif line_no == 5:
-                pass  # titles
-            elif line_no == 6:
-                units = line[1:]
-            else:
-                matrix.append([Data.Types.convert(value, types[index])
-                               for index, value in enumerate(line[1:])])
-
-        data = Data(name=name,
-                    description=description,
-                    headers=[Data.Header(name=name,
-                                         value_type=types[index],
-                                         value_unit=units[index])
-                             for index, name in enumerate(names)])
-        for values in matrix:
-            data.add_values(values)
-        return data
+    _double_formatter(precision)
 
+    def format_doubles(values: numpy.ndarray) -> numpy.ndarray:
+        return _data_text.format_doubles(values, precision)
 
-def _get_date():
-    return datetime.now().strftime("%a %b %d %H:%M:%S %Y")  # "Fri Oct 28 10:41:44 2016"
+    def format_vectors(values: List[numpy.ndarray]) -> numpy.ndarray:
+        return format_text(_data_text.format_vectors(values, precision))
 
+    def format_strings(values: numpy.ndarray) -> numpy.ndarray:
+        return format_text(_data_text.format_strings(values))
 
-def data_to_json(data: Data, filepath: Path):
-    """Convert ``Data`` to json.
+    return [{Data.Types.STRING: format_strings,
+             Data.Types.DOUBLE: format_doubles,
+             Data.Types.VECTOR: format_vectors}[value_type] for value_type in data.types]
 
-    Parameters
-    ----------
-    data : Data
-        data to dump
-    filepath : Path
-        Path to file
+
+_PYTHON_TYPES = {
+    Data.Types.STRING: str,
+    Data.Types.DOUBLE: (float, int),
+    Data.Types.VECTOR: (list, numpy.ndarray),
+}
+"""Python types accepted for each ``Data.Types``."""
+
+_NUMPY_KINDS = {
+    Data.Types.STRING: "U",
+    Data.Types.DOUBLE: "fiu",
+}
+"""Kinds of ``numpy.ndarray`` accepted without check for each ``Data.Types``."""
+
+
+def _iter_row_blocks(data: Data, chunk_rows: int) -> Iterator[Tuple[int, List[List[Any]]]]:
+    """Iterate over the rows of ``data`` by blocks.
+
+    Yields
+    ------
+    Tuple[int, List[List[Any]]]
+        Index of the first row and rows of each block
     """
-    dico = {
-        "_metadata":
-        {
-            "_comment": "",
-            "date": _get_date(),
-            "short_names": data.names,
-            "table_description": data.description,
-            "table_name": data.name,
-            "types": data.types,
-            "units": data.units
-        },
-        "items":
-        [{name: values[index]
-            for name, values in zip(data.names, data.values)}
-            for index in range(data.nb_rows)]
-    }
-    filepath.write_text(json.dumps(dico, indent=2), encoding='utf-8')
-
-
-def json_to_data(filepath: Path) -> Data:
-    """Convert json to ``Data``.
+    if chunk_rows < 1:
+        raise ValueError(f"chunk_rows must be positive, got {chunk_rows}.")
+    for start in range(0, data.nb_rows, chunk_rows):
+        yield start, data.get_rows(start, start + chunk_rows)
 
-    Parameters
-    ----------
-    filepath : Path
-        Path to file
 
-    Returns
-    -------
-    Data
-        Loaded data
+def _iter_text_blocks(data: Data, chunk_rows: int,
+                      formatters: List[Callable[[Any], numpy.ndarray]]
+                      ) -> Iterator[Tuple[int, List[numpy.ndarray]]]:
+    """Iterate over the values of ``data`` converted to texts by blocks, header by header.
+
+    Each column of a block is converted by one call to its formatter of
+    ``_column_formatters``, instead of one call per value.
+
+    Yields
+    ------
+    Tuple[int, List[numpy.ndarray]]
+        Index of the first row and texts of each header of each block, as
+        ``_data_text.format_doubles``
     """
-    dico = json.loads(filepath.read_text(encoding='utf-8'))
-    data = Data(name=dico["_metadata"]["table_name"],
-                description=dico["_metadata"]["table_description"],
-                headers=[Data.Header(name=name,
-                                     value_type=dico["_metadata"]["types"][index],
-                                     value_unit=dico["_metadata"]["units"][index])
-                         for index, name in enumerate(dico["_metadata"]["short_names"])])
-    for item in dico["items"]:
-        data.add_values([item[header.name] for header in data.headers])
-    return data
+    if chunk_rows < 1:
+        raise ValueError(f"chunk_rows must be positive, got {chunk_rows}.")
+    columns = [data.column(name) for name in data.names]
+    for start in range(0, data.nb_rows, chunk_rows):
+        yield start, [format_values(values[start:start + chunk_rows])
+                      for format_values, values in zip(formatters, columns)]
 
 
-def data_to_ascii(data: Data, filepath: Path):
-    """Convert ``Data`` to 'Salome Table' as defined by Uranie.
+def _convert_columns(data: Data, rows: List[List[str]], indices: List[int]) -> List[Any]:
+    """Convert a block of rows of strings to columns of the types of ``data``.
 
-    Parameters
-    ----------
-    data : Data
-        data to dump
-    filepath : Path
-        Path to file
+    Only the values of the headers at ``indices`` are gathered and converted, as returned by
+    ``_project``.
+
+    Returns
+    -------
+    List[Any]
+        Values of each converted header, as accepted by ``Data.extend_columns``
+
+    Raises
+    ------
+    ValueError
+        If a row has not one value per header
     """
-    filepath.write_text(f"""
-#NAME: {data.name}
-#TITLE: {data.description}
-#DATE: {_get_date()}
-#COLUMN_NAMES: {'|'.join(data.names)}
-#COLUMN_TYPES: {'|'.join(data.types)}
-#COLUMN_TITLES: {'|'.join(data.names)}
-#COLUMN_UNITS: {'|'.join(data.units)}
+    parsers = data.schema.column_parsers
+    if any(len(row) != len(parsers) for row in rows):
+        raise ValueError(f"Each row must contain {len(parsers)} values.")
+    return [parsers[index](list(map(operator.itemgetter(index), rows))) for index in indices]
+
 
-""" + "\n".join([" ".join([str(values[index]).replace(' ', '') for values in data.values])
-                 for index in range(data.nb_rows)]) + "\n", encoding='utf-8')
+def _convert_blocks(data: Data, rows: Iterable[List[str]], chunk_rows: int,
+                    indices: List[int]) -> Iterator[List[Any]]:
+    """Convert rows of strings to columns of the types of ``data``, by blocks of
+    ``chunk_rows``, see ``_convert_columns``."""
+    for block in _batched(rows, chunk_rows):
+        yield _convert_columns(data, block, indices)
 
 
-def ascii_to_data(filepath: Path) -> Data:  # pylint: disable=too-many-branches  # noqa: C901
-    """Convert 'Salome Table' as defined by Uranie to ``Data``.
+def _project(data: Data, columns: List[str] = None) -> Tuple[Data, List[int]]:
+    """Empty data with some headers of ``data``, as read by the readers.
 
     Parameters
     ----------
-    filepath : Path
-        Path to file
+    data : Data
+        Empty data defined by the header of a file
+    columns : List[str], optional
+        Names of the headers to read, in this order, by default all the headers
 
     Returns
     -------
-    Data
-        Loaded data
+    Tuple[Data, List[int]]
+        Empty data with the headers ``columns`` (``data`` itself by default) and position
+        of these headers in ``data``
+
+    Raises
+    ------
+    ValueError
+        If a header of ``columns`` is unknown.
     """
-
-    name = ""
-    description = ""
-    names = []
-    types = []
-    units = []
-    matrix = []
-    for line in filepath.read_text(encoding='utf-8').splitlines():
-        if not line.strip():
-            continue
-        if line.startswith("#NAME:"):
-            name = line.replace('#NAME:', '').strip()
-        elif line.startswith("#TITLE:"):
-            description = line.replace('#TITLE:', '').strip()
-        elif line.startswith("#DATE:"):
-            pass
-        elif line.startswith("#COLUMN_NAMES:"):
-            names = [n.strip() for n in line.replace('#COLUMN_NAMES:', '').strip().split('|')]
-        elif line.startswith("#COLUMN_TYPES:"):
-            types = [n.strip() for n in line.replace('#COLUMN_TYPES:', '').strip().split('|')]
-        elif line.startswith("#COLUMN_TITLES:"):
-            pass
-        elif line.startswith("#COLUMN_UNITS:"):
-            units = [n.strip() for n in line.replace('#COLUMN_UNITS:', '').strip().split('|')]
-        else:
-            matrix.append([Data.Types.convert(value, types[index])
-                           for index, value in enumerate(line.split())] if types else
-                          [float(value) for value in line.split()])
-
-    if not names:
-        names = [str(index) for index, _ in enumerate(matrix[0])]
-    if not types:
-        types = ["D"] * len(names)
-    if not units:
-        units = [""] * len(names)
-
-    data = Data(name=name,
+    if columns is None:
+        return data, list(range(data.nb_columns))
+    indices = [data.schema.index(name) for name in columns]
+    return Data(name=data.name, description=data.description,
+                headers=[data.headers[index] for index in indices]), indices
+
+
+def _batched(iterable: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    """Split ``iterable`` in lists of ``size`` elements (the last one may be shorter)."""
+    if size < 1:
+        raise ValueError(f"chunk_rows must be positive, got {size}.")
+    iterator = iter(iterable)
+    batch = list(itertools.islice(iterator, size))
+    while batch:
+        yield batch
+        batch = list(itertools.islice(iterator, size))
+
+
+def _new_data(name: str, description: str,  # pylint: disable=too-many-arguments
+              names: List[str], types: List[str], units: List[str]) -> Data:
+    """Create an empty data from the content of a file header."""
+    return Data(name=name,
                 description=description,
-                headers=[Data.Header(name=name,
-                                     value_type=types[index],
-                                     value_unit=units[index])
-                         for index, name in enumerate(names)])
-    for values in matrix:
-        data.add_values(values)
-    return data
+                headers=[Data.Header(name=header_name, value_type=value_type, value_unit=unit)
+                         for header_name, value_type, unit in zip(names, types, units)])
+
+
+def _empty_like(data: Data) -> Data:
+    """Create an empty data with the same name, description and headers as ``data``."""
+    return Data(name=data.name, description=data.description, headers=data.headers)
+
+
+def _get_date():
+    return datetime.now().strftime("%a %b %d %H:%M:%S %Y")  # "Fri Oct 28 10:41:44 2016"
+
+
+def _column_tolist(data: Data, name: str, start: int, stop: int) -> List[Any]:
+    """Copy of values ``start`` to ``stop`` (excluded) of a header as Python objects."""
+    values = data.column(name)[start:stop]
+    return values.tolist() if isinstance(values, numpy.ndarray) else [
+        row.tolist() for row in values]
+
+
+def __getattr__(name: str) -> Any:
+    """Import on first use the modules defining the functions of ``_LAZY_ATTRIBUTES``."""
+    if name in _LAZY_ATTRIBUTES:
+        module = importlib.import_module(f"{__package__}.{_LAZY_ATTRIBUTES[name]}")
+        return getattr(module, name)
+    raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
+
+
+def __dir__() -> List[str]:
+    return sorted(list(globals()) + list(_LAZY_ATTRIBUTES))
@@ -0,0 +1,90 @@
+"""Tests ``_columns`` module."""
+
+import numpy
+
+from uranie_launcher import _columns
+
+
+def test_strings_encoding():
+    """Test encoding strings in UTF-8 and decoding them back"""
+
+    strings = ["", "a", "toto", "é", "日本語", "😀x", "\ud800", "a b", "x" * 40]
+    values, offsets = _columns.encode_strings(strings)
+    assert values.dtype == numpy.uint8
+    assert offsets.tolist() == [0, 0, 1, 5, 7, 16, 21, 24, 27, 67]
+    decoded = _columns.decode_strings(values, offsets)
+    assert decoded.dtype == numpy.dtype("<U40")
+    assert decoded.tolist() == strings
+    assert _columns.decode_strings(values, offsets[2:6]).tolist() == ["toto", "é", "日本語"]
+    assert _columns.decode_strings(*_columns.encode_strings(["abc", ""])).tolist() == [
+        "abc", ""]
+
+    values, offsets = _columns.encode_strings([])
+    assert values.size == 0 and offsets.tolist() == [0]
+    assert _columns.decode_strings(values, offsets).size == 0
+    assert _columns.decode_strings(values, offsets[:0]).size == 0
+
+
+def test_string_column():
+    """Test the rows of a column of strings"""
+
+    strings = ["", "a", "toto", "é", "日本語", "😀x", "\ud800"]
+    column = _columns.StringColumn.from_rows(strings)
+    column.append("new")
+    column.extend(numpy.array(["q", "rr"]))
+    column.extend([])
+    strings += ["new", "q", "rr"]
+    assert len(column) == len(strings)
+    assert [column[index] for index in range(-len(strings), len(strings))] == strings * 2
+    assert column.tolist(2, 4) == strings[2:4]
+    assert column.tolist(8) == strings[8:]
+    assert column.view().tolist() == strings
+    assert not column.view().flags.writeable
+    assert column.tolist(2, 4) == strings[2:4]
+    column.append("é")
+    strings.append("é")
+    assert column.tolist() == strings
+
+    assert column.take(slice(3, 6)).tolist() == strings[3:6]
+    assert column.take(slice(6, 3)).tolist() == []
+    assert column.take(slice(None, None, 2)).tolist() == strings[::2]
+    assert column.take(numpy.array([6, 0, 3, 3])).tolist() == [strings[6], strings[0],
+                                                               strings[3], strings[3]]
+    values, offsets = column.take(numpy.zeros(0, dtype="int64")).flat()
+    assert values.size == 0 and offsets.tolist() == [0]
+
+    empty = _columns.StringColumn()
+    assert len(empty) == 0 and empty.tolist() == [] and empty.view().size == 0
+
+    # lists are converted by blocks, a long string only widens its block
+    many = [f"row_{index}" for index in range(2 * _columns.ENCODE_ROWS + 5)]
+    many[-1] = "é" * 1000
+    column = _columns.StringColumn.from_rows(many)
+    assert column.tolist(_columns.ENCODE_ROWS - 1, _columns.ENCODE_ROWS + 1) == many[
+        _columns.ENCODE_ROWS - 1:_columns.ENCODE_ROWS + 1]
+    assert column[-1] == many[-1] and len(column) == len(many)
+    assert column.flat()[1][-1] == sum(len(string.encode("utf-8")) for string in many)
+
+
+def test_vector_column():
+    """Test the rows of a column of vectors and of a column loaded on first access"""
+
+    column = _columns.LazyColumn(1, lambda: _columns.VectorColumn.from_rows([[1.0, 2.0]]))
+    assert len(column) == 1
+    column.extend([[], [3.0]])
+    column.append([4.0, 5.0])
+    assert len(column) == 4
+    assert column[-1] == [4.0, 5.0]
+    assert column.tolist(1, 3) == [[], [3.0]]
+    assert column.tolist(5) == []
+    assert [values.tolist() for values in column.take(slice(2, None)).view()] == [[3.0],
+                                                                                  [4.0, 5.0]]
+
+    doubles = _columns.DoubleColumn(numpy.array([1.0, 2.0]))
+    assert isinstance(doubles[0], float) and doubles[-1] == 2.0
+    assert isinstance(doubles.take(slice(1, None)), _columns.DoubleColumn)
+    offsets = _columns.VectorColumn.from_rows([[1.0], [2.0, 3.0]]).flat()[1]
+    buffer = _columns._BufferColumn("int64", offsets)  # pylint: disable=protected-access
+    taken = buffer.take([2, 0])
+    taken.append(4)
+    assert taken.tolist() == [3, 0, 4] and taken.view().dtype == numpy.int64
@@ -0,0 +1,42 @@
+"""Tests ``_compression`` module."""
+
+import io
+from pathlib import Path
+
+import pytest
+
+from uranie_launcher import _compression
+
+
+class _FullFile(io.BytesIO):
+    """Compressed file failing to write its blocks, as on a full disk"""
+
+    def write(self, block) -> int:
+        raise OSError("No space left on device")
+
+
+@pytest.mark.parametrize("compression", [".gz", ".bz2", ".xz"])
+def test_compression_errors(compression: str):
+    """Test reading truncated compressed files and failing to write compressed files"""
+
+    output_dirname = Path(__file__).absolute().parent / "test_compression"
+    output_dirname.mkdir(parents=True, exist_ok=True)
+    filepath = output_dirname / f"truncated.txt{compression}"
+    with _compression.open_file(filepath, mode="w", encoding="utf-8") as text_file:
+        text_file.write("value\n" * 100000)
+    # blocks still queued are discarded when the file is closed before its end
+    with _compression.open_file(filepath, mode="rb") as binary_file:
+        assert binary_file.read(6) == b"value\n"
+    filepath.write_bytes(filepath.read_bytes()[:-20])
+    with pytest.raises((EOFError, OSError)):
+        with _compression.open_file(filepath, encoding="utf-8") as text_file:
+            text_file.read()
+
+    writer = _compression._WriterThread(_FullFile())  # pylint: disable=protected-access
+    writer.write(b"value\n")
+    with pytest.raises(OSError):
+        writer.flush()
+    with pytest.raises(OSError):
+        writer.write(b"value\n")
+    with pytest.raises(OSError):
+        writer.close()
@@ -0,0 +1,29 @@
+"""Tests ``_data_compare`` module."""
+
+from pathlib import Path
+
+import pytest
+
+from uranie_launcher import data
+
+
+def test_compare_keys_across_blocks(simple_data: data.Data):
+    """Test comparing files whose key appears again after its row was compared"""
+
+    output_dirname = Path(__file__).absolute().parent / "test_compare"
+    output_dirname.mkdir(parents=True, exist_ok=True)
+    table = simple_data.select(["x", "y"])
+    table.add_rows([[2.0, "b"], [3.0, "c"], [4.0, "d"]])
+    data.save(table, output_dirname / "unique.csv")
+    repeated = data.concat([table, table.take([0])])
+    data.save(repeated, output_dirname / "repeated.csv")
+
+    assert data.compare(output_dirname / "unique.csv", output_dirname / "unique.csv",
+                        key="x", chunk_rows=2).equal
+    for a, b in [("repeated", "unique"), ("unique", "repeated")]:
+        with pytest.raises(ValueError) as error:
+            data.compare(output_dirname / f"{a}.csv", output_dirname / f"{b}.csv", key="x",
+                         chunk_rows=2)
+        assert "Values of the key header 'x' of" in str(error.value)
+    strings = data.compare(repeated.take(slice(0, 4)), table, key="y", chunk_rows=2)
+    assert strings.equal and strings.nb_rows == 4
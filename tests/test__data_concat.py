@@ -0,0 +1,28 @@
+"""Tests ``_data_concat`` module."""
+
+from pathlib import Path
+
+import pytest
+
+from uranie_launcher import data
+
+
+def test_concat_limits(simple_data: data.Data):
+    """Test concatenating no data, and tables without final line break"""
+
+    with pytest.raises(ValueError) as error:
+        data.concat([])
+    assert "No data to concatenate." in str(error.value)
+
+    output_dir = Path(__file__).absolute().parent / "test_concat"
+    output_dir.mkdir(parents=True, exist_ok=True)
+    with pytest.raises(ValueError) as error:
+        data.concat_files([], output_dir / "nothing.dat")
+    assert "No file to concatenate." in str(error.value)
+
+    filepath = output_dir / "no_newline.dat"
+    data.data_to_ascii(simple_data, filepath)
+    filepath.write_bytes(filepath.read_bytes().rstrip(b"\n"))
+    data.concat_files([filepath, filepath], output_dir / "merged_no_newline.dat")
+    merged = data.ascii_to_data(output_dir / "merged_no_newline.dat")
+    assert merged.get_rows(0, 2) == simple_data.get_rows(0, 1) * 2
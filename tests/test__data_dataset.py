@@ -0,0 +1,58 @@
+"""Tests ``_data_dataset`` module."""
+
+import os
+from pathlib import Path
+import shutil
+
+import pytest
+
+from uranie_launcher import _data_dataset, data
+
+
+def test_dataset_writer(simple_data: data.Data):
+    """Test appending rows of values to a dataset"""
+
+    output_dirname = Path(__file__).absolute().parent / "test_dataset"
+    directory = output_dirname / "rows.dataset"
+    shutil.rmtree(directory, ignore_errors=True)
+
+    with pytest.raises(ValueError) as error:
+        data.DatasetWriter(directory, simple_data, part_rows=0)
+    assert "part_rows must be positive, got 0" in str(error.value)
+
+    with data.DatasetWriter(directory, simple_data, part_rows=2) as writer:
+        assert writer.directory == directory
+        writer.append([])
+        writer.append(simple_data.take(slice(0, 0)))
+        writer.append([[2.0, "a", [2.0]], [3.0, "b", []], [4.0, "c", [4.0, 4.0]]])
+        assert (writer.nb_rows, len(writer.parts)) == (3, 1)
+    assert (writer.nb_rows, len(writer.parts)) == (3, 2)
+    assert data.read_dataset(directory).nb_rows == 3
+
+    # the options of save_chunks are given to the writer of the parts
+    with pytest.raises(ValueError):
+        data.save_chunks([simple_data], directory, chunk_rows=0)
+    data.save_chunks([simple_data], directory, chunk_rows=1)
+    assert data.read_dataset(directory).nb_rows == 4
+
+
+def test_dataset_concurrent_creation(simple_data: data.Data, monkeypatch: pytest.MonkeyPatch):
+    """Test creating a dataset whose schema is written meanwhile by another writer"""
+
+    output_dirname = Path(__file__).absolute().parent / "test_dataset"
+    directory = output_dirname / "concurrent.dataset"
+    shutil.rmtree(directory, ignore_errors=True)
+
+    def link(source: Path, destination: Path):
+        # another writer creates the schema of the same dataset first
+        shutil.copy(source, destination)
+        raise FileExistsError(destination)
+
+    monkeypatch.setattr(os, "link", link)
+    with data.DatasetWriter(directory, simple_data) as writer:
+        writer.append(simple_data)
+    monkeypatch.undo()
+    assert data.read_dataset(directory).get_rows(0, 1) == simple_data.get_rows(0, 1)
+    # the temporary schema is removed
+    assert not any(path.name.startswith(".")
+                   for path in (directory / _data_dataset.MANIFEST).iterdir())
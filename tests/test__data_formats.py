@@ -0,0 +1,54 @@
+"""Tests ``_data_formats`` module."""
+
+from pathlib import Path
+
+import pytest
+
+from uranie_launcher import data
+
+
+def test_format_registry(simple_data: data.Data):
+    """Test replacing a format and writing blocks of rows with a format without streaming"""
+
+    output_dirname = Path(__file__).absolute().parent / "test_load_save"
+    output_dirname.mkdir(parents=True, exist_ok=True)
+
+    def write_lines(table: data.Data, filepath: Path):
+        filepath.write_text("\n".join(str(row) for row in table.get_rows(0, table.nb_rows)))
+
+    data.register_format(data.DataFormat("rows", [".rows"], reader=data.csv_to_data,
+                                         writer="._data_ascii:data_to_ascii"))
+    data.register_format(data.DataFormat("rows", [".rows", ".row"], reader=data.csv_to_data,
+                                         writer=write_lines), replace=True)
+    assert [registered.name for registered in data.formats()].count("rows") == 1
+    assert data.get_format(output_dirname / "simple_data.row").name == "rows"
+    data.save_chunks([simple_data.take(slice(0, 1))] * 3, output_dirname / "simple_data.rows")
+    assert (output_dirname / "simple_data.rows").read_text().splitlines() == [
+        str(simple_data.get_rows(0, 1)[0])] * 3
+
+    # a format mapping its files in memory is sliced rather than read by blocks
+    data.register_format(data.DataFormat("mapped", [".mapped"], reader=data.binary_to_data,
+                                         writer=data.data_to_binary,
+                                         chunk_reader=data.iter_csv_chunks, memory_mapped=True))
+    data.save(simple_data, output_dirname / "simple_data.mapped")
+    assert [chunk.get_rows(0, 1) for chunk in data.iter_chunks(
+        output_dirname / "simple_data.mapped", columns=["y"])] == [[["toto"]]]
+
+    with pytest.raises(ValueError) as error:
+        data.load(output_dirname / "simple_data.rows", data_format="unknown")
+    assert "Unknown format 'unknown', expected one of" in str(error.value)
+    with pytest.raises(ValueError) as error:
+        data.save_chunks([], output_dirname / "simple_data.csv")
+    assert "No header nor rows to write" in str(error.value)
+
+
+def test_format_empty_file(simple_data: data.Data):
+    """Test reading by blocks a file without row"""
+
+    output_dirname = Path(__file__).absolute().parent / "test_load_save"
+    output_dirname.mkdir(parents=True, exist_ok=True)
+    filepath = output_dirname / "empty.csv"
+    data.save(simple_data.take(slice(0, 0)), filepath)
+    assert [chunk.nb_rows for chunk in data.iter_chunks(filepath)] == []
+    comparison = data.compare(filepath, filepath, key="x", columns=["y"])
+    assert comparison.equal and comparison.nb_rows == 0
@@ -0,0 +1,73 @@
+"""Tests ``_data_index`` module."""
+
+import os
+from pathlib import Path
+
+import pytest
+
+from uranie_launcher import _data_index, data
+
+
+def test_read_keys_across_blocks():
+    """Test reading all the rows of a key spread over several blocks of the index"""
+
+    output_dirname = Path(__file__).absolute().parent / "test_ascii_table_reader"
+    output_dirname.mkdir(parents=True, exist_ok=True)
+    table = data.Data(name="table", description="",
+                      headers=[data.Data.Header("key", data.Data.Types.DOUBLE, ""),
+                               data.Data.Header("y", data.Data.Types.STRING, "")])
+    keys = [0.0, 1.0, 1.0, 1.0, 1.0, 1.0, 1.0, 2.0, 3.0, 3.0, 3.0, 5.0]
+    table.add_rows([[key, f"row_{index}"] for index, key in enumerate(keys)])
+    ascii_filepath = output_dirname / "duplicates.dat"
+    data.data_to_ascii(data=table, filepath=ascii_filepath)
+    # the first reader builds the missing index
+    _data_index.index_path(ascii_filepath).unlink(missing_ok=True)
+
+    for every in [1, 2, 3, 4, 100]:
+        with data.AsciiTableReader(ascii_filepath, every=every, key="key") as reader:
+            assert reader.read_keys([1.0]).column("y").tolist() == [
+                f"row_{index}" for index in range(1, 7)]
+            assert reader.read_keys([3.0, 4.0, 0.0, 5.0, 6.0, -1.0]).column("y").tolist() == [
+                "row_8", "row_9", "row_10", "row_0", "row_11"]
+        # the next reader rebuilds the outdated index
+        stat = ascii_filepath.stat()
+        os.utime(ascii_filepath, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000))
+
+
+def test_ascii_index_errors():
+    """Test the tables which cannot be indexed"""
+
+    output_dirname = Path(__file__).absolute().parent / "test_ascii_table_reader"
+    output_dirname.mkdir(parents=True, exist_ok=True)
+    table = data.Data(name="table", description="",
+                      headers=[data.Data.Header("key", data.Data.Types.DOUBLE, "")])
+    table.add_rows([[2.0], [1.0]])
+    ascii_filepath = output_dirname / "unsorted.dat"
+    data.data_to_ascii(data=table, filepath=ascii_filepath)
+    with pytest.raises(ValueError) as error:
+        data.build_ascii_index(ascii_filepath, every=1, key="key")
+    assert "are not sorted" in str(error.value)
+
+    # rows out of order between two indexed rows
+    table = data.Data(name="table", description="",
+                      headers=[data.Data.Header("key", data.Data.Types.DOUBLE, "")])
+    table.add_rows([[key] for key in [0.0, 9.0, 1.0, 2.0, 6.0, 7.0, 8.0, 3.0, 10.0]])
+    data.data_to_ascii(data=table, filepath=ascii_filepath)
+    with pytest.raises(ValueError) as error:
+        data.build_ascii_index(ascii_filepath, every=4, key="key")
+    assert "are not sorted" in str(error.value)
+
+    data.build_ascii_index(ascii_filepath)
+    with pytest.raises(ValueError):
+        data.AsciiTableReader(ascii_filepath, columns=["unknown"])
+    # the header becomes invalid while the index stays up to date
+    stat = ascii_filepath.stat()
+    ascii_filepath.write_bytes(b"\xff" + ascii_filepath.read_bytes()[1:])
+    os.utime(ascii_filepath, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    with pytest.raises(ValueError):
+        data.AsciiTableReader(ascii_filepath)
+
+    data.data_to_ascii(data=table, filepath=output_dirname / "unsorted.dat.gz")
+    with pytest.raises(ValueError) as error:
+        data.build_ascii_index(output_dirname / "unsorted.dat.gz")
+    assert "cannot be indexed" in str(error.value)
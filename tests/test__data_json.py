@@ -0,0 +1,73 @@
+"""Tests ``_data_json`` module."""
+
+from pathlib import Path
+
+import pytest
+
+from uranie_launcher import data
+
+
+def test_json_metadata_order():
+    """Test json streaming needs metadata before the values, but not json loading"""
+
+    output_dirname = Path(__file__).absolute().parent / "test_json_metadata_order"
+    output_dirname.mkdir(parents=True, exist_ok=True)
+
+    metadata = ('"_metadata": {"table_name": "t", "table_description": "d", '
+                '"short_names": ["x", "y"], "types": ["D", "S"], "units": ["", ""]}')
+    json_filepath = output_dirname / "items_first.json"
+    json_filepath.write_text('{"items": [{"x": 1.0, "y": "a"}, {"x": 2.0, "y": "b"}], '
+                             + metadata + '}', encoding="utf-8")
+    loaded = data.json_to_data(json_filepath)
+    assert loaded.name == "t" and loaded.names == ["x", "y"]
+    assert loaded.get_values(index=1) == [2.0, "b"]
+    assert data.json_to_data(json_filepath, columns=["y"]).column("y").tolist() == ["a", "b"]
+    with pytest.raises(ValueError) as error:
+        list(data.iter_json_chunks(json_filepath))
+    assert "'_metadata' must precede the values" in str(error.value)
+
+    json_filepath = output_dirname / "columns_first.json"
+    json_filepath.write_text('{"columns": {"x": [1.0], "y": ["a"]}, ' + metadata + '}',
+                             encoding="utf-8")
+    assert data.json_to_data(json_filepath).get_values(index=0) == [1.0, "a"]
+
+    json_filepath.write_text('{"other": 1.0}', encoding="utf-8")
+    with pytest.raises(ValueError) as error:
+        data.json_to_data(json_filepath)
+    assert "'_metadata' not found" in str(error.value)
+
+    json_filepath.write_text('{"items": [{"x": 1.0}]}', encoding="utf-8")
+    with pytest.raises(ValueError) as error:
+        data.json_to_data(json_filepath)
+    assert "'_metadata' not found" in str(error.value)
+
+
+def test_json_columns_chunk_rows(simple_data: data.Data):
+    """Test json columns need positive blocks of rows"""
+
+    output_dirname = Path(__file__).absolute().parent / "test_json_metadata_order"
+    output_dirname.mkdir(parents=True, exist_ok=True)
+    with pytest.raises(ValueError):
+        data.data_to_json(simple_data, output_dirname / "columns.json", chunk_rows=0,
+                          layout=data.JSON_COLUMNS)
+
+
+def test_json_missing_values():
+    """Test reading json without the values of a header, in both layouts and orders"""
+
+    output_dirname = Path(__file__).absolute().parent / "test_json_metadata_order"
+    output_dirname.mkdir(parents=True, exist_ok=True)
+    metadata = ('"_metadata": {"table_name": "t", "table_description": "d", '
+                '"short_names": ["x", "y"], "types": ["D", "S"], "units": ["", ""]}')
+    json_filepath = output_dirname / "missing.json"
+    for values, key in [('"columns": {"x": [1.0]}', "columns"),
+                        ('"items": [{"x": 1.0, "y": "a"}, {"x": 2.0}]', "items")]:
+        for content in [values + ", " + metadata, metadata + ", " + values]:
+            json_filepath.write_text("{" + content + "}", encoding="utf-8")
+            with pytest.raises(ValueError) as error:
+                data.json_to_data(json_filepath)
+            assert f"no value of header 'y' in '{key}'" in str(error.value)
+        # none of the read headers has values
+        with pytest.raises(ValueError) as error:
+            list(data.iter_json_chunks(json_filepath, columns=["y"]))
+        assert f"no value of header 'y' in '{key}'" in str(error.value)
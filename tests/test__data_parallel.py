@@ -0,0 +1,130 @@
+"""Tests ``_data_parallel`` module."""
+
+from pathlib import Path
+import os
+import pickle
+import subprocess
+import sys
+
+import pytest
+
+from uranie_launcher import _data_csv, _data_parallel, data
+
+
+def test_parallel_parsing(simple_data: data.Data):
+    """Test the parsing of ranges of rows by several processes"""
+
+    simple_data.add_rows([[float(index), f"row_{index}", [float(index), 0.5]]
+                          for index in range(2, 1000)])
+    output_dirname = Path(__file__).absolute().parent / "test_parallel_parsing"
+    output_dirname.mkdir(parents=True, exist_ok=True)
+
+    doubles = simple_data.select(["x"])
+    for subset in [simple_data, doubles]:
+        for suffix in [".dat", ".csv"]:
+            filepath = output_dirname / f"{len(subset.names)}{suffix}"
+            data.save(subset, filepath)
+            loaded = data.load(filepath, workers=3)
+            assert loaded.get_rows(0, 1000) == subset.get_rows(0, 1000)
+
+
+def test_parallel_parsing_limits(simple_data: data.Data):
+    """Test parallel parsing without rows, with fewer rows than processes or one process"""
+
+    output_dirname = Path(__file__).absolute().parent / "test_parallel_parsing"
+    output_dirname.mkdir(parents=True, exist_ok=True)
+    empty = data.Data(name="empty", description="", headers=simple_data.headers)
+    for suffix in [".dat", ".csv"]:
+        filepath = output_dirname / f"empty{suffix}"
+        data.save(empty, filepath)
+        loaded = data.load(filepath, workers=4)
+        assert loaded.names == ["x", "y", "z"] and loaded.nb_rows == 0
+
+        filepath = output_dirname / f"few{suffix}"
+        data.save(simple_data, filepath)
+        for workers in [1, 2, 8]:
+            loaded = data.load(filepath, workers=workers, columns=["z", "y"])
+            assert loaded.get_rows(0, 1) == [[[1.0, 2.0], "toto"]]
+
+        filepath = output_dirname / f"few{suffix}.gz"
+        data.save(simple_data, filepath)
+        assert data.load(filepath, workers=2).get_rows(0, 1) == simple_data.get_rows(0, 1)
+
+
+def test_parallel_parsing_errors():
+    """Test the errors of the parsing processes, without leaking shared memory"""
+
+    output_dirname = Path(__file__).absolute().parent / "test_parallel_parsing"
+    output_dirname.mkdir(parents=True, exist_ok=True)
+    filepath = output_dirname / "invalid.dat"
+    filepath.write_text("#COLUMN_NAMES: a\n#COLUMN_TYPES: D\n" + "1.0\n" * 1000 + "a\n",
+                        encoding="utf-8")
+    with pytest.raises(ValueError):
+        data.ascii_to_data(filepath, workers=2)
+
+    with data.Data(name="t", description="", headers=[]).to_shared() as handle:
+        handle.detach()
+        with pytest.raises(ValueError) as error:
+            handle.detach()
+        assert "not owned" in str(error.value)
+
+
+def test_parallel_parsing_process():
+    """Test parallel parsing in a new process, whose processes exit before the shared
+    memory is read"""
+
+    output_dirname = Path(__file__).absolute().parent / "test_parallel_parsing"
+    output_dirname.mkdir(parents=True, exist_ok=True)
+    filepath = output_dirname / "process.csv"
+    table = data.Data(name="t", description="", headers=[
+        data.Data.Header("a", data.Data.Types.DOUBLE, ""),
+        data.Data.Header("b", data.Data.Types.STRING, "")])
+    table.add_rows([[float(index), str(index)] for index in range(100)])
+    data.save(table, filepath)
+    script = ("import sys\nfrom uranie_launcher import data\n"
+              "loaded = data.csv_to_data(__import__('pathlib').Path(sys.argv[1]), workers=4)\n"
+              "print(loaded.nb_rows, loaded.get_values(index=99))\n")
+    result = subprocess.run([sys.executable, "-c", script, str(filepath)], check=True,
+                            capture_output=True, text=True,
+                            env={**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)})
+    assert result.stdout == "100 [99.0, '99']\n"
+    assert "leaked" not in result.stderr
+
+
+def test_parse_range(simple_data: data.Data):
+    """Test the parsing of a range of rows and the transfer of its shared memory"""
+    # pylint: disable=protected-access
+
+    simple_data.add_rows([[2.0, "a", []], [3.0, "b", [3.0]]])
+    output_dirname = Path(__file__).absolute().parent / "test_parallel_parsing"
+    output_dirname.mkdir(parents=True, exist_ok=True)
+    filepath = output_dirname / "range.csv"
+    data.save(simple_data, filepath)
+    with filepath.open(mode="rb") as binary_file:
+        header, start = _data_csv._read_binary_csv_header(binary_file)
+    ranges = _data_parallel._split(filepath, start, 2)
+    assert len(ranges) == 2
+    headers = (header.names, header.types, header.units)
+    handles = [pickle.loads(pickle.dumps(_data_parallel._parse_range(
+        filepath, _data_csv._parse_csv_lines, headers, [2, 0], byte_range)))
+        for byte_range in ranges]
+    loaded = _data_parallel._stitch(header.select(["z", "x"]), handles)
+    assert loaded.get_rows(0, 3) == [[[1.0, 2.0], 1.0], [[], 2.0], [[3.0], 3.0]]
+
+
+def test_parallel_parsing_comment_rows():
+    """Test rows starting with '#' read as rows in text and binary modes"""
+
+    table = data.Data(name="hashes", description="", headers=[
+        data.Data.Header("y", data.Data.Types.STRING, ""),
+        data.Data.Header("x", data.Data.Types.DOUBLE, "")])
+    table.add_rows([["#tag", 1.0], ["a", 2.0], ["#", 3.0]])
+    output_dirname = Path(__file__).absolute().parent / "test_parallel_parsing"
+    output_dirname.mkdir(parents=True, exist_ok=True)
+    filepath = output_dirname / "comment_rows.dat"
+    data.save(table, filepath)
+    rows = table.get_rows(0, 3)
+    assert data.load(filepath).get_rows(0, 3) == rows
+    assert data.load(filepath, workers=2).get_rows(0, 3) == rows
+    with data.AsciiTableReader(filepath) as reader:
+        assert reader.nb_rows == 3 and reader.read_range(0, 3).get_rows(0, 3) == rows
@@ -0,0 +1,46 @@
+"""Tests ``_data_shared`` module."""
+
+from multiprocessing import shared_memory
+
+import pytest
+
+from uranie_launcher import _data_shared, data
+
+
+def test_shared_exit(simple_data: data.Data):
+    """Test unmapping the shared memory blocks when the process exits"""
+    # pylint: disable=protected-access
+
+    with simple_data.to_shared() as used, simple_data.to_shared() as unused:
+        assert used.name != unused.name
+        shared = data.Data.from_shared(used)
+        data.Data.from_shared(unused)
+        assert set(_data_shared._ATTACHED) >= {used.name, unused.name}
+        _data_shared._close_attached()
+        assert not _data_shared._ATTACHED
+        # the values still referenced stay mapped until the process exits
+        assert shared.get_rows(0, 1) == simple_data.get_rows(0, 1)
+
+
+def test_shared_copy_error(simple_data: data.Data, monkeypatch: pytest.MonkeyPatch):
+    """Test freeing the shared memory when the copy of the columns fails"""
+
+    created = []
+
+    class Memory(shared_memory.SharedMemory):
+        """Shared memory whose buffer cannot be written"""
+
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            created.append(self.name)
+
+        @property
+        def buf(self):
+            raise MemoryError("no buffer")
+
+    monkeypatch.setattr(shared_memory, "SharedMemory", Memory)
+    with pytest.raises(MemoryError):
+        simple_data.to_shared()
+    monkeypatch.undo()
+    with pytest.raises(FileNotFoundError):
+        shared_memory.SharedMemory(name=created[0])
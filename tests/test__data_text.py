@@ -0,0 +1,27 @@
+"""Tests ``_data_text`` module."""
+
+import csv
+import io
+
+import numpy
+
+from uranie_launcher import _data_text
+
+
+def test_join_texts():
+    """Test joining texts padded with NUL bytes, strings containing NUL bytes being kept"""
+
+    strings = numpy.array(["a\0b", "x", "", "a,b", 'q"r', 'a\0,"', "é ü", "\0z"])
+    texts = _data_text.join_texts([_data_text.format_integers(numpy.arange(len(strings))),
+                                   _data_text.quote_csv(_data_text.format_strings(strings))],
+                                  ",", "\n")
+    expected = io.StringIO()
+    csv.writer(expected, lineterminator="\n").writerows(enumerate(strings.tolist()))
+    assert texts == expected.getvalue()
+
+    texts = _data_text.join_texts([_data_text.remove_blanks(_data_text.format_strings(strings)),
+                                   _data_text.format_doubles(numpy.full(len(strings), -1.5), 2),
+                                   _data_text.format_vectors([numpy.array([0.1, 1e300])] * 8)],
+                                  " ", "\n")
+    assert texts.splitlines() == [f"{string.replace(' ', '')} -1.50e+00 [0.1,1e+300]"
+                                  for string in strings.tolist()]
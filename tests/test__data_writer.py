@@ -0,0 +1,47 @@
+"""Tests ``_data_writer`` module."""
+
+from pathlib import Path
+
+import pytest
+
+from uranie_launcher import data
+
+
+def test_data_writer_append(simple_data: data.Data):
+    """Test appending rows to files without quoted values or final line break"""
+
+    output_dirname = Path(__file__).absolute().parent / "test_data_writer"
+    output_dirname.mkdir(parents=True, exist_ok=True)
+    doubles = simple_data.select(["x"])
+
+    csv_filepath = output_dirname / "doubles.csv"
+    data.save(doubles, csv_filepath)
+    csv_filepath.write_bytes(csv_filepath.read_bytes().rstrip(b"\n"))
+    with data.DataWriter(csv_filepath, doubles, append=True) as writer:
+        writer.append([[2.0]])
+    assert data.load(csv_filepath).column("x").tolist() == [1.0, 2.0]
+    assert csv_filepath.read_text(encoding="utf-8").splitlines()[-1].startswith("1,")
+
+    ascii_filepath = output_dirname / "no_newline.txt"
+    data.save(simple_data, ascii_filepath)
+    ascii_filepath.write_bytes(ascii_filepath.read_bytes().rstrip(b"\n"))
+    with data.DataWriter(ascii_filepath, simple_data, append=True) as writer:
+        assert writer.filepath == ascii_filepath
+        writer.append([[2.0, "a", [3.0]]])
+        assert writer.nb_rows == 1
+    assert data.load(ascii_filepath).column("x").tolist() == [1.0, 2.0]
+
+    # an empty file gets its header
+    ascii_filepath.write_bytes(b"")
+    with data.DataWriter(ascii_filepath, simple_data, append=True) as writer:
+        writer.append(simple_data)
+    assert data.load(ascii_filepath).get_rows(0, 1) == simple_data.get_rows(0, 1)
+
+    empty = data.Data(name="empty", description="", headers=[])
+    with data.DataWriter(output_dirname / "empty.csv", empty) as writer:
+        writer.append(empty)
+        assert writer.nb_rows == 0
+
+    with pytest.raises(ValueError) as error:
+        data.DataWriter(ascii_filepath, simple_data, data_format="json")
+    assert "Unknown format 'json', expected 'ascii' or 'csv'." in str(error.value)
@@ -0,0 +1,49 @@
+"""Tests ``_json_stream`` module."""
+
+import io
+
+import pytest
+
+from uranie_launcher import _json_stream
+
+
+def test_json_stream_blocks():
+    """Test json values cut by the end of the buffer"""
+
+    text = ('{"a": 123, "b": -1.5e-3, "c": true, "d": null, "e": [1, 22.5, false], '
+            '"f": {"g": 45, "h": "i\\"j"}, "k": 6789}')
+    expected = [("a", 123), ("b", -1.5e-3), ("c", True), ("d", None),
+                ("e", 1), ("e", 22.5), ("e", False), ("f", None), ("f", ("g", 45)),
+                ("k", 6789)]
+    for block_size in (1, 2, 3, 5, 64):
+        members = _json_stream.iter_members(io.StringIO(text), streamed_key="e",
+                                            block_size=block_size, selected_key="f",
+                                            selected=["g"])
+        assert list(members) == expected
+    with pytest.raises(ValueError):
+        list(_json_stream.iter_members(io.StringIO('{"a": 12'), streamed_key="e",
+                                       block_size=1))
+    with pytest.raises(ValueError):
+        list(_json_stream.iter_members(io.StringIO('{"a": tru}'), streamed_key="e",
+                                       block_size=1))
+
+
+def test_json_stream_skip():
+    """Test skipped and empty json values"""
+
+    text = ('{"e": [], "f": {"g": 1, "h": "\\\\", "i": [{"j": "]\\"}"}], "k": {}}, '
+            '"l": {}}')
+    for block_size in (1, 2, 7, 64):
+        members = _json_stream.iter_members(io.StringIO(text), streamed_key="e",
+                                            block_size=block_size, selected_key="f",
+                                            selected=["k"])
+        assert list(members) == [("f", None), ("f", ("k", {})), ("l", {})]
+        members = _json_stream.iter_members(io.StringIO(text), streamed_key="e",
+                                            block_size=block_size, selected_key="l")
+        assert list(members) == [("f", {"g": 1, "h": "\\", "i": [{"j": ']"}'}], "k": {}}),
+                                 ("l", None)]
+    assert not list(_json_stream.iter_members(io.StringIO(" { } "), streamed_key="e"))
+    with pytest.raises(ValueError) as error:
+        list(_json_stream.iter_members(io.StringIO('{"f": {"g": [1, "'), streamed_key="e",
+                                       selected_key="f", selected=[]))
+    assert "unexpected end of file" in str(error.value)
@@ -0,0 +1,53 @@
+"""Tests ``_run_convert`` module."""
+
+import logging
+from pathlib import Path
+import shutil
+import sys
+
+import pytest
+
+from uranie_launcher import _run_convert, data
+
+
+def test_run_convert(simple_data: data.Data, monkeypatch: pytest.MonkeyPatch):
+    """Test the entry point of the conversion script"""
+
+    output_dirname = Path(__file__).absolute().parent / "test_convert"
+    output_dirname.mkdir(parents=True, exist_ok=True)
+    input_filepath = output_dirname / "entry_point.dat"
+    data.save(simple_data, input_filepath)
+
+    logger = logging.getLogger(_run_convert.uranie_launcher_name)
+    monkeypatch.setattr(logger, "handlers", [])
+    monkeypatch.setattr(sys, "argv", ["uranie-launcher-convert", str(input_filepath),
+                                      str(output_dirname / "entry_point.csv")])
+    with pytest.raises(SystemExit) as exit_info:
+        _run_convert.run_convert()
+    assert exit_info.value.code == 0
+    assert data.load(output_dirname / "entry_point.csv").values == simple_data.values
+
+
+def test_run_convert_dataset(simple_data: data.Data, monkeypatch: pytest.MonkeyPatch):
+    """Test converting the rows of a dataset satisfying a condition"""
+
+    output_dirname = Path(__file__).absolute().parent / "test_convert"
+    output_dirname.mkdir(parents=True, exist_ok=True)
+    table = data.Data(name="study", description="results", headers=simple_data.headers)
+    table.add_rows([[float(index), f"row_{index}", [float(index)]] for index in range(30)])
+    dataset = output_dirname / "entry_point.dataset"
+    shutil.rmtree(dataset, ignore_errors=True)
+    data.write_dataset(table, dataset, part_rows=10)
+    # the parts which cannot satisfy the condition are not read
+    first_part = dataset / data.read_manifest(dataset)["parts"][0]["file"]
+    first_part.unlink()
+
+    logger = logging.getLogger(_run_convert.uranie_launcher_name)
+    monkeypatch.setattr(logger, "handlers", [])
+    assert _run_convert.main_convert([str(dataset), str(output_dirname / "dataset.csv"),
+                                      "--where", "x", ">=", "15", "--columns", "y"]) == 0
+    assert data.load(output_dirname / "dataset.csv").column("y").tolist() == [
+        f"row_{index}" for index in range(15, 30)]
+    assert _run_convert.main_convert([str(dataset), str(output_dirname / "no_row.csv"),
+                                      "--where", "x", ">", "100", "--columns", "y"]) == 0
+    assert data.load(output_dirname / "no_row.csv").names == ["y"]
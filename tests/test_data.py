@@ -1,10 +1,16 @@
 """Tests ``data`` module."""
 
+from concurrent.futures import ProcessPoolExecutor
+import csv
+import io
 from pathlib import Path
+import pickle
+import shutil
 
+import numpy
 import pytest
 
-from uranie_launcher import data
+from uranie_launcher import _run_convert, data
 
 
 def test_conversion():
@@ -50,6 +56,130 @@ def test_data(simple_data: data.Data):
     assert simple_data.get_values(index=0) == [1.0, "toto", [1.0, 2.0]]
 
 
+def test_columns(simple_data: data.Data):
+    """Test columnar access without copy"""
+
+    simple_data.add_values(values=[2.0, "a much longer string", [3.0]])
+
+    x_values = simple_data.column("x")
+    assert x_values.tolist() == [1.0, 2.0]
+    assert not x_values.flags.writeable
+    assert x_values.base is not None
+    assert simple_data.column("y").tolist() == ["toto", "a much longer string"]
+    assert [row.tolist() for row in simple_data.column("z")] == [[1.0, 2.0], [3.0]]
+    assert list(simple_data.to_numpy()) == ["x", "y", "z"]
+    assert simple_data.get_values(index=1) == [2.0, "a much longer string", [3.0]]
+
+    with pytest.raises(ValueError) as error:
+        simple_data.column("unknown")
+    assert "Unknown header" in str(error.value)
+
+
+def test_vector_column(simple_data: data.Data):
+    """Test vectors stored as one buffer of elements and offsets"""
+
+    simple_data.add_rows([[2.0, "b", []], [3.0, "c", numpy.arange(1000.0)]])
+
+    rows = simple_data.column("z")
+    assert [row.size for row in rows] == [2, 0, 1000]
+    assert rows[0].base is rows[2].base and not rows[2].flags.writeable
+    assert simple_data.get_rows(0, 2) == [[1.0, "toto", [1.0, 2.0]], [2.0, "b", []]]
+    assert numpy.shares_memory(simple_data.take(slice(1, 3)).column("z")[1], rows[2])
+    assert [row.tolist() for row in simple_data.take([2, 0]).column("z")[1:]] == [[1.0, 2.0]]
+
+    parse_vectors = simple_data.schema.column_parsers[2]
+    assert [row.tolist() for row in parse_vectors(["[1, 2 ,3]", "[]", " [4.5] "])] == \
+        [[1.0, 2.0, 3.0], [], [4.5]]
+    for invalid in ["[1,,2]", "[1,2,]"]:
+        with pytest.raises(ValueError) as error:
+            parse_vectors([invalid])
+        assert "Invalid vector" in str(error.value)
+
+
+def test_schema(simple_data: data.Data):
+    """Test codecs compiled once per data"""
+
+    schema = simple_data.schema
+    assert schema.names == ("x", "y", "z")
+    assert [header.value_unit for header in schema.headers] == ["u_x", "u_y", "u_z"]
+    assert schema.index("z") == 2
+    assert [parse(value) for parse, value in zip(schema.parsers, ["1.5", "a", "[1,2]"])] == \
+        [1.5, "a", [1.0, 2.0]]
+    assert data.Data.Types.convert("[]", data.Data.Types.VECTOR) == []
+    assert [format_value(value) for format_value, value
+            in zip(schema.formatters, [1.5, "a", [1.0, 2.0]])] == ["1.5", "a", "[1.0,2.0]"]
+
+    with pytest.raises(ValueError) as error:
+        schema.validators[1](values=["a", 1.0], first_row_index=3)
+    assert "for 'y' at row 4" in str(error.value)
+
+    with pytest.raises(ValueError) as error:
+        schema.index("unknown")
+    assert "Unknown header" in str(error.value)
+
+
+def test_select_where_take(simple_data: data.Data):
+    """Test views on headers and rows"""
+
+    simple_data.add_rows([[float(index), f"row_{index}", [float(index)]]
+                          for index in range(2, 10)])
+
+    selected = simple_data.select(["z", "x"])
+    assert selected.names == ["z", "x"]
+    assert numpy.shares_memory(selected.column("x"), simple_data.column("x"))
+
+    rows = simple_data.take(slice(8, 1, -3))
+    assert rows.column("x").tolist() == [9.0, 6.0, 3.0]
+    assert numpy.shares_memory(rows.column("x"), simple_data.column("x"))
+    rows.add_values(values=[0.0, "new", []])
+    assert simple_data.nb_rows == 9 and rows.nb_rows == 4
+
+    assert simple_data.take([3, 0, -1]).get_rows(0, 3) == [
+        [4.0, "row_4", [4.0]], [1.0, "toto", [1.0, 2.0]], [9.0, "row_9", [9.0]]]
+    odd = simple_data.where(lambda values: values.column("x") % 2 == 1)
+    assert odd.column("y").tolist() == ["toto", "row_3", "row_5", "row_7", "row_9"]
+    assert simple_data.where(numpy.zeros(9, dtype=bool)).nb_rows == 0
+
+    with pytest.raises(IndexError):
+        simple_data.take([9])
+    with pytest.raises(ValueError) as error:
+        simple_data.where([1, 0])
+    assert "Expected a mask of 9 booleans" in str(error.value)
+
+
+def test_add_rows(simple_data: data.Data):
+    """Test bulk ingestion of rows and columns"""
+
+    simple_data.add_rows([[2.0, "a", [3.0]], [3, "b", []]])
+    simple_data.extend_columns([numpy.array([4.0]), ["c"], [[4.0, 5.0]]])
+    assert simple_data.nb_rows == 4
+    assert simple_data.get_values(index=2) == [3.0, "b", []]
+    assert simple_data.get_values(index=3) == [4.0, "c", [4.0, 5.0]]
+
+    with pytest.raises(ValueError) as error:
+        simple_data.add_rows([[5.0, "d", [1.0]], [6.0, 7.0, [1.0]]])
+    assert "Type is not correct: found" in str(error.value)
+    assert "'y' at row 5" in str(error.value)
+
+    with pytest.raises(ValueError) as error:
+        simple_data.extend_columns([[5.0], ["d"], [[1.0, 2]]])
+    assert "Element of vector is not correct: found" in str(error.value)
+
+    for values in [[5.0, "d"], [5.0, "d", [], 6.0]]:
+        with pytest.raises(ValueError) as error:
+            simple_data.add_values(values)
+        assert "Each row must contain 3 values." in str(error.value)
+        with pytest.raises(ValueError) as error:
+            simple_data.add_rows([values])
+        assert "Each row must contain 3 values." in str(error.value)
+
+    with pytest.raises(ValueError) as error:
+        simple_data.extend_columns([[5.0], ["d", "e"], [[1.0]]])
+    assert "Expected 3 columns of the same length" in str(error.value)
+
+    assert simple_data.nb_rows == 4
+
+
 def test_data_to_csv(simple_data: data.Data):
     """Test conversion data <-> csv"""
 
@@ -72,6 +202,12 @@ def test_data_to_csv(simple_data: data.Data):
     assert simple_data.nb_columns == simple_data_2.nb_columns
     assert simple_data.get_values(index=0) == simple_data_2.get_values(index=0)
 
+    with csv_filepath.open(mode="a", encoding="utf-8") as csv_file:
+        csv_file.write("1,2.0,short\n")
+    with pytest.raises(ValueError) as error:
+        data.csv_to_data(csv_filepath)
+    assert "Each row must contain 3 values." in str(error.value)
+
 
 def test_data_to_json(simple_data: data.Data):
     """Test conversion data <-> json"""
@@ -96,6 +232,29 @@ def test_data_to_json(simple_data: data.Data):
     assert simple_data.get_values(index=0) == simple_data_2.get_values(index=0)
 
 
+def test_data_to_json_columns(simple_data: data.Data):
+    """Test conversion data <-> json with columns layout"""
+
+    output_dirname = Path(__file__).absolute().parent / "test_data_to_json_columns"
+    output_dirname.mkdir(parents=True, exist_ok=True)
+
+    simple_data.add_rows([[float(index), f"row_{index}", [0.5] * index] for index in range(4)])
+    items_filepath = output_dirname / "simple_data_items.json"
+    data.data_to_json(data=simple_data, filepath=items_filepath)
+    columns_filepath = output_dirname / "simple_data_columns.json"
+    data.data_to_json(data=simple_data, filepath=columns_filepath, chunk_rows=2,
+                      layout=data.JSON_COLUMNS)
+
+    assert columns_filepath.stat().st_size < items_filepath.stat().st_size / 2
+    assert '"columns":{"x":[1.0,0.0,1.0,2.0,3.0]' in columns_filepath.read_text(encoding="utf-8")
+    assert data.json_to_data(columns_filepath).values == simple_data.values
+    assert [chunk.nb_rows for chunk in data.iter_json_chunks(columns_filepath, 2)] == [2, 2, 1]
+
+    with pytest.raises(ValueError) as error:
+        data.data_to_json(data=simple_data, filepath=columns_filepath, layout="rows")
+    assert "Unknown json layout 'rows'" in str(error.value)
+
+
 def test_data_to_ascii(simple_data: data.Data):
     """Test conversion data <-> ascii"""
 
@@ -119,6 +278,108 @@ def test_data_to_ascii(simple_data: data.Data):
     assert simple_data.get_values(index=0) == simple_data_2.get_values(index=0)
 
 
+def test_float_formatting():
+    """Test doubles are written without loss, or with a fixed precision"""
+
+    output_dirname = Path(__file__).absolute().parent / "test_float_formatting"
+    output_dirname.mkdir(parents=True, exist_ok=True)
+
+    special = [0.0, -0.0, 0.1, 1 / 3, -2.5e-300, 5e-324, 1.7976931348623157e308,
+               numpy.inf, -numpy.inf, numpy.nan]
+    values = numpy.concatenate([special, numpy.random.default_rng(0).standard_normal(1000)
+                                * 10.0 ** numpy.random.default_rng(1).integers(-300, 300, 1000)])
+    doubles = data.Data(name="doubles", description="",
+                        headers=[data.Data.Header("x", data.Data.Types.DOUBLE, ""),
+                                 data.Data.Header("v", data.Data.Types.VECTOR, "")])
+    doubles.extend_columns([values, [values[index:index + 3] for index in range(values.size)]])
+
+    for suffix, reader in [(".dat", data.ascii_to_data), (".csv", data.csv_to_data)]:
+        filepath = output_dirname / f"doubles{suffix}"
+        data.save(doubles, filepath, chunk_rows=100)
+        loaded = reader(filepath)
+        assert loaded.column("x").tobytes() == values.tobytes()
+        assert all(loaded.column("v")[index].tobytes() == values[index:index + 3].tobytes()
+                   for index in range(values.size))
+
+        data.save(doubles, filepath, precision=16)
+        assert reader(filepath).column("x").tobytes() == values.tobytes()
+
+        data.save(doubles.take(slice(0, 3)), filepath, precision=3)
+        assert reader(filepath).get_rows(0, 3) == [
+            [0.0, [0.0, -0.0, 0.1]], [-0.0, [-0.0, 0.1, 0.3333]], [0.1, [0.1, 0.3333, -2.5e-300]]]
+    assert (output_dirname / "doubles.dat").read_text(encoding="utf-8").splitlines()[-1] == (
+        "1.000e-01 [1.000e-01,3.333e-01,-2.500e-300]")
+
+    with data.DataWriter(output_dirname / "writer.dat", doubles, precision=2) as writer:
+        writer.append([[2 / 3, [1.0]]])
+    assert data.load(output_dirname / "writer.dat").get_rows(0, 1) == [[0.667, [1.0]]]
+    with pytest.raises(ValueError):
+        data.DataWriter(output_dirname / "writer.dat", doubles, precision=-1)
+
+
+def test_text_formatting():
+    """Test texts written by NumPy are those of repr, %.{precision}e and the csv module"""
+
+    output_dirname = Path(__file__).absolute().parent / "test_float_formatting"
+    output_dirname.mkdir(parents=True, exist_ok=True)
+
+    generator = numpy.random.default_rng(2)
+    values = numpy.concatenate([
+        generator.integers(0, 2 ** 64, 5000, dtype="uint64").view("float64"),
+        generator.standard_normal(5000) * 10.0 ** generator.integers(-20, 20, 5000),
+        numpy.round(generator.random(5000) * 1e9) / 10.0 ** generator.integers(0, 9, 5000),
+        [0.0, -0.0, 0.5, 0.125, 2.5, 1e16, 1e17, 9.999999999999999e15, 1e-5, 1e-4, 5e-324,
+         2.0 ** -1074, 123456789012345678.0, numpy.nan, numpy.inf, -numpy.inf]])
+    strings = ["plain", "with blank", "comma,", 'quote"', "line\nbreak", "é", ""]
+    table = data.Data(name="texts", description="",
+                      headers=[data.Data.Header("x", data.Data.Types.DOUBLE, ""),
+                               data.Data.Header("s", data.Data.Types.STRING, ""),
+                               data.Data.Header("v", data.Data.Types.VECTOR, "")])
+    table.extend_columns([values, [strings[index % 7] for index in range(values.size)],
+                          [values[index:index + index % 3] for index in range(values.size)]])
+
+    for precision, format_double in [(None, repr), (0, "%.0e".__mod__),
+                                     (6, "%.6e".__mod__), (16, "%.16e".__mod__)]:
+        expected = io.StringIO(newline="")
+        csv.writer(expected).writerows(
+            [index, format_double(value), string, "[" + ",".join(map(format_double, vector)) + "]"]
+            for index, (value, string, vector) in enumerate(table.get_rows(0, table.nb_rows)))
+        filepath = output_dirname / "texts.csv"
+        data.data_to_csv(table, filepath, precision=precision)
+        assert filepath.read_bytes().decode("utf-8").endswith(
+            "COLUMN_UNITS,,,\r\n" + expected.getvalue())
+
+        filepath = output_dirname / "texts.dat"
+        data.data_to_ascii(table.select(["x"]), filepath, precision=precision)
+        assert filepath.read_text(encoding="utf-8").split()[-len(values):] == list(
+            map(format_double, values.tolist()))
+
+
+@pytest.mark.parametrize("writer, reader", [
+    (data.data_to_ascii, data.ascii_to_data),
+    (data.data_to_csv, data.csv_to_data),
+    (data.data_to_json, data.json_to_data),
+])
+def test_write_by_blocks(simple_data: data.Data, writer, reader):
+    """Test writing files by blocks of rows"""
+
+    output_dirname = Path(__file__).absolute().parent / "test_write_by_blocks"
+    output_dirname.mkdir(parents=True, exist_ok=True)
+
+    simple_data.add_rows([[float(index), f"row_{index}", [0.5] * (index + 1)]
+                          for index in range(4)])
+    filepath = output_dirname / f"simple_data_{writer.__name__}"
+    writer(data=simple_data, filepath=filepath, chunk_rows=2, buffer_size=16)
+    assert reader(filepath).values == simple_data.values
+    with pytest.raises(ValueError) as error:
+        writer(data=simple_data, filepath=filepath, chunk_rows=0)
+    assert "chunk_rows must be positive, got 0" in str(error.value)
+
+    empty_data = data.Data(name="empty", description="", headers=simple_data.headers)
+    writer(data=empty_data, filepath=filepath)
+    assert reader(filepath).nb_rows == 0
+
+
 def test_no_meta_data():
     """Test file without meta data"""
 
@@ -132,3 +393,601 @@ def test_no_meta_data():
 
     ascii_filepath_2 = output_dirname / "no_meta_data_2.dat"
     data.data_to_ascii(data=no_meta_data, filepath=ascii_filepath_2)
+
+
+def test_data_to_binary(simple_data: data.Data):
+    """Test conversion data <-> binary"""
+
+    output_dirname = Path(__file__).absolute().parent / "test_data_to_binary"
+    output_dirname.mkdir(parents=True, exist_ok=True)
+
+    simple_data.add_rows([[2.0, "", []], [3.0, "été", [3.0, 4.0, 5.0]]])
+    binary_filepath = output_dirname / "simple_data.bin"
+    data.data_to_binary(data=simple_data, filepath=binary_filepath, chunk_rows=2)
+
+    simple_data_2 = data.binary_to_data(binary_filepath)
+
+    assert simple_data.name == simple_data_2.name
+    assert simple_data.description == simple_data_2.description
+    assert simple_data.names == simple_data_2.names
+    assert simple_data.types == simple_data_2.types
+    assert simple_data.units == simple_data_2.units
+    assert simple_data_2.nb_rows == 3
+    assert simple_data.values == simple_data_2.values
+    assert isinstance(simple_data_2.column("x").base, numpy.memmap)
+
+    simple_data_2.add_values(values=[4.0, "new", [1.0]])
+    assert simple_data_2.get_values(index=3) == [4.0, "new", [1.0]]
+
+    with pytest.raises(ValueError) as error:
+        data.Data(name="columns", description="", headers=simple_data.headers, columns=[])
+    assert "Expected one column per header" in str(error.value)
+    assert {"binary_to_data", "data_to_binary"} <= set(dir(data))
+
+    binary_filepath.write_bytes(b"not binary")
+    with pytest.raises(ValueError) as error:
+        data.binary_to_data(binary_filepath)
+    assert "is not a binary data file" in str(error.value)
+
+
+def test_ascii_table_reader():
+    """Test random access to rows through the index"""
+
+    output_dirname = Path(__file__).absolute().parent / "test_ascii_table_reader"
+    output_dirname.mkdir(parents=True, exist_ok=True)
+
+    table = data.Data(name="table", description="",
+                      headers=[data.Data.Header("execution_index", data.Data.Types.DOUBLE, ""),
+                               data.Data.Header("y", data.Data.Types.STRING, "u_y")])
+    table.add_rows([[2.0 * index, f"row_{index}"] for index in range(25)])
+    ascii_filepath = output_dirname / "table.dat"
+    data.data_to_ascii(data=table, filepath=ascii_filepath)
+
+    index_filepath = data.build_ascii_index(ascii_filepath, every=4)
+    assert index_filepath.is_file()
+
+    with data.AsciiTableReader(ascii_filepath) as reader:
+        assert reader.nb_rows == 25
+        assert reader.header.names == table.names
+        assert reader.read_rows([7, 0, 24, 7]).column("y").tolist() == \
+            ["row_7", "row_0", "row_24", "row_7"]
+        assert reader.read_range(20, 100).values == [
+            [40.0, 42.0, 44.0, 46.0, 48.0], ["row_20", "row_21", "row_22", "row_23", "row_24"]]
+        assert reader.read_range(0, 25).values == table.values
+        with pytest.raises(IndexError):
+            reader.read_rows([25])
+        with pytest.raises(ValueError) as error:
+            reader.read_keys([2.0])
+        assert "No key indexed" in str(error.value)
+
+    with data.AsciiTableReader(ascii_filepath, every=4, key="execution_index") as reader:
+        assert reader.read_keys([8.0, 9.0, 48.0, -2.0]).column("y").tolist() == \
+            ["row_4", "row_24"]
+
+    with pytest.raises(ValueError) as error:
+        data.build_ascii_index(ascii_filepath, every=0)
+    assert "every must be positive" in str(error.value)
+
+
+@pytest.mark.parametrize("extension, writer, reader", [
+    (".dat", data.data_to_ascii, data.iter_ascii_chunks),
+    (".csv", data.data_to_csv, data.iter_csv_chunks),
+    (".json", data.data_to_json, data.iter_json_chunks),
+])
+def test_iter_chunks(simple_data: data.Data, extension, writer, reader):
+    """Test reading files by blocks of rows"""
+
+    output_dirname = Path(__file__).absolute().parent / "test_iter_chunks"
+    output_dirname.mkdir(parents=True, exist_ok=True)
+
+    simple_data.add_rows([[float(index), f"row_{index}", [float(index)] * index]
+                          for index in range(1, 5)])
+    filepath = output_dirname / f"simple_data{extension}"
+    writer(data=simple_data, filepath=filepath)
+
+    chunks = list(reader(filepath, chunk_rows=2))
+    assert [chunk.nb_rows for chunk in chunks] == [2, 2, 1]
+    assert all(chunk.names == simple_data.names for chunk in chunks)
+    assert all(chunk.types == simple_data.types for chunk in chunks)
+    assert all(chunk.units == simple_data.units for chunk in chunks)
+    assert [chunk.get_values(index) for chunk in chunks for index in range(chunk.nb_rows)] == \
+        [simple_data.get_values(index) for index in range(simple_data.nb_rows)]
+
+    with pytest.raises(ValueError) as error:
+        next(reader(filepath, chunk_rows=0))
+    assert "chunk_rows must be positive" in str(error.value)
+
+
+def test_ascii_doubles():
+    """Test bulk parsing of tables with only doubles"""
+
+    output_dirname = Path(__file__).absolute().parent / "test_ascii_doubles"
+    output_dirname.mkdir(parents=True, exist_ok=True)
+
+    ascii_filepath = output_dirname / "doubles.dat"
+    ascii_filepath.write_text("#COLUMN_NAMES: a|b\n#COLUMN_TYPES: D|D\n\n"
+                              "1.0 2.5e-3\n\n-3 nan\n", encoding="utf-8")
+    doubles = data.ascii_to_data(ascii_filepath)
+    assert doubles.names == ["a", "b"]
+    assert doubles.column("a").tolist() == [1.0, -3.0]
+    assert doubles.get_values(index=0) == [1.0, 2.5e-3]
+    assert numpy.isnan(doubles.get_values(index=1)[1])
+
+    ascii_filepath.write_text("#COLUMN_TYPES: D|D\n1.0 2.0\n3.0\n", encoding="utf-8")
+    with pytest.raises(ValueError):
+        data.ascii_to_data(ascii_filepath)
+
+    doubles.add_rows(numpy.array([[4.0, 5.0], [6.0, 7.0]]))
+    assert doubles.column("b").tolist()[2:] == [5.0, 7.0]
+    with pytest.raises(ValueError) as error:
+        doubles.add_rows(numpy.zeros((2, 3)))
+    assert "Each row must contain 2 values." in str(error.value)
+
+
+def test_concat(simple_data: data.Data):
+    """Test concatenation of data and files"""
+
+    other = data.Data(name="other", description="", headers=simple_data.headers)
+    other.add_rows([[2.0, "a_much_longer_string", [3.0]], [3.0, "b", [4.0, 5.0]]])
+    merged = data.concat([simple_data, other, simple_data])
+    assert merged.name == simple_data.name
+    assert merged.column("y").tolist() == ["toto", "a_much_longer_string", "b", "toto"]
+    assert merged.get_values(index=2) == [3.0, "b", [4.0, 5.0]]
+
+    output_dir = Path(__file__).absolute().parent / "test_concat"
+    output_dir.mkdir(parents=True, exist_ok=True)
+    data.data_to_ascii(simple_data, output_dir / "first.dat")
+    data.data_to_ascii(other, output_dir / "second.dat")
+    data.data_to_csv(other, output_dir / "second.csv")
+    for out_filepath in [output_dir / "merged.dat", output_dir / "merged.csv"]:
+        data.concat_files([output_dir / "first.dat", output_dir / "second.csv",
+                           output_dir / "second.dat"], out_filepath, chunk_rows=1)
+        loaded = (data.csv_to_data if out_filepath.suffix == ".csv" else
+                  data.ascii_to_data)(out_filepath)
+        assert loaded.get_rows(0, 5) == merged.get_rows(0, 3) + other.get_rows(0, 2)
+
+    with pytest.raises(ValueError) as error:
+        data.concat([simple_data, simple_data.select(["x"])])
+    assert "differ from those of data 0" in str(error.value)
+
+
+@pytest.mark.parametrize("compression", [".gz", ".bz2", ".xz"])
+def test_compression(simple_data: data.Data, compression: str):
+    """Test compressed files"""
+
+    simple_data.add_rows([[float(index), f"row_{index}", [float(index)]]
+                          for index in range(2, 1000)])
+    output_dirname = Path(__file__).absolute().parent / "test_compression"
+    output_dirname.mkdir(parents=True, exist_ok=True)
+
+    for writer, reader, suffix in [(data.data_to_ascii, data.ascii_to_data, ".dat"),
+                                   (data.data_to_csv, data.csv_to_data, ".csv"),
+                                   (data.data_to_json, data.json_to_data, ".json"),
+                                   (data.data_to_binary, data.binary_to_data, ".bin")]:
+        filepath = output_dirname / f"simple_data{suffix}"
+        writer(simple_data, filepath)
+        compressed_filepath = output_dirname / f"simple_data{suffix}{compression}"
+        writer(simple_data, compressed_filepath, chunk_rows=100, buffer_size=256)
+        assert compressed_filepath.stat().st_size < filepath.stat().st_size
+        assert reader(compressed_filepath).get_rows(0, 1000) == simple_data.get_rows(0, 1000)
+
+    merged = output_dirname / f"merged.csv{compression}"
+    data.concat_files([output_dirname / f"simple_data.dat{compression}"] * 2, merged)
+    assert data.csv_to_data(merged).nb_rows == 2 * simple_data.nb_rows
+
+
+def test_load_save(simple_data: data.Data):
+    """Test the registry of file formats"""
+
+    output_dirname = Path(__file__).absolute().parent / "test_load_save"
+    output_dirname.mkdir(parents=True, exist_ok=True)
+
+    for suffix in [".dat", ".csv.gz", ".json", ".bin"]:
+        filepath = output_dirname / f"simple_data{suffix}"
+        data.save(simple_data, filepath)
+        assert data.load(filepath).get_rows(0, 1) == simple_data.get_rows(0, 1)
+        assert [chunk.nb_rows for chunk in data.iter_chunks(filepath, chunk_rows=1)] == [1]
+        if suffix != ".csv.gz":
+            renamed = output_dirname / f"simple_data{suffix}.unknown"
+            data.save(simple_data, renamed, data_format=data.get_format(filepath).name)
+            assert data.get_format(renamed).name == data.get_format(filepath).name
+    assert data.get_format(output_dirname / "simple_data.bin").memory_mapped
+
+    data.register_format(data.DataFormat("lines", [".lines"], reader=lambda filepath: None,
+                                         writer="._data_ascii:data_to_ascii"))
+    data.save(simple_data, output_dirname / "simple_data.lines")
+    assert data.get_format(output_dirname / "simple_data.lines").streaming is False
+    with pytest.raises(ValueError) as error:
+        data.register_format(data.DataFormat("other", [".lines"], reader=None, writer=None))
+    assert "conflicts with the registered formats ['lines']" in str(error.value)
+    with pytest.raises(ValueError) as error:
+        data.save(simple_data, output_dirname / "simple_data.other")
+    assert "Cannot detect the format" in str(error.value)
+
+
+def test_groupby():
+    """Test aggregating the values of groups of rows"""
+
+    table = data.Data(name="study", description="results",
+                      headers=[data.Data.Header("scenario", data.Data.Types.STRING, ""),
+                               data.Data.Header("mesh", data.Data.Types.DOUBLE, ""),
+                               data.Data.Header("pi", data.Data.Types.DOUBLE, "m/s"),
+                               data.Data.Header("curve", data.Data.Types.VECTOR, "m")])
+    table.add_rows([["b", 1.0, 4.0, [4.0]], ["a", 2.0, 1.0, [1.0]], ["b", 1.0, 2.0, [2.0, 2.0]],
+                    ["a", 1.0, 3.0, []], ["b", 1.0, 9.0, [9.0]]])
+
+    result = table.groupby(["scenario", "mesh"]).agg(
+        {"pi": ["count", "sum", "mean", "var", "std", "min", "max", "median", 0.25],
+         "curve": ["first", "last"]})
+    assert result.name == "study"
+    assert result.names == ["scenario", "mesh", "pi_count", "pi_sum", "pi_mean", "pi_var",
+                            "pi_std", "pi_min", "pi_max", "pi_median", "pi_q0.25",
+                            "curve_first", "curve_last"]
+    assert result.units == ["", "", "", "m/s", "m/s", "(m/s)^2", "m/s", "m/s", "m/s", "m/s",
+                            "m/s", "m", "m"]
+    assert result.get_rows(0, 3) == [
+        ["a", 1.0, 1.0, 3.0, 3.0, 0.0, 0.0, 3.0, 3.0, 3.0, 3.0, [], []],
+        ["a", 2.0, 1.0, 1.0, 1.0, 0.0, 0.0, 1.0, 1.0, 1.0, 1.0, [1.0], [1.0]],
+        ["b", 1.0, 3.0, 15.0, 5.0, 26 / 3, (26 / 3) ** 0.5, 2.0, 9.0, 4.0, 3.0, [4.0], [9.0]]]
+
+    by_scenario = table.groupby("scenario")
+    assert by_scenario.nb_groups == 2 and by_scenario.keys == ["scenario"]
+    assert by_scenario.agg({"mesh": "var"}).units == ["", ""]
+    assert by_scenario.agg({"mesh": "last"}).get_rows(0, 2) == [["a", 1.0], ["b", 1.0]]
+    table.add_values(["a", 2.0, numpy.nan, [0.0]])
+    assert numpy.isnan(table.groupby("mesh").agg({"pi": [0.5]}).column("pi_q0.5")).tolist() == [
+        False, True]
+
+    for keys, aggregations in [("curve", {}), ("unknown", {}), ("mesh", {"curve": "mean"}),
+                               ("mesh", {"pi": "mode"}), ("mesh", {"pi": [1.5]}), ([], {})]:
+        with pytest.raises(ValueError):
+            table.groupby(keys).agg(aggregations)
+    empty = data.Data(name="empty", description="", headers=table.headers)
+    assert empty.groupby("scenario").agg({"pi": ["mean", 0.5]}).nb_rows == 0
+
+
+def test_sample_rows(simple_data: data.Data):
+    """Test sampling the rows of a file in one pass"""
+
+    table = data.Data(name="study", description="results", headers=simple_data.headers)
+    table.add_rows([[float(index), f"row_{index % 3}", [float(index)] * (index % 2)]
+                    for index in range(1000)])
+    output_dirname = Path(__file__).absolute().parent / "test_sample_rows"
+    output_dirname.mkdir(parents=True, exist_ok=True)
+    filepath = output_dirname / "simple_data.dat.gz"
+    data.save(table, filepath)
+
+    sample = data.sample_rows(filepath, 50, seed=3, chunk_rows=64)
+    assert (sample.name, sample.description) == (table.name, table.description)
+    assert [sample.names, sample.types, sample.units] == [
+        table.names, table.types, table.units]
+    rows = sample.column("x").astype(int)
+    assert len(set(rows.tolist())) == 50 and (numpy.diff(rows) > 0).all()
+    assert sample.get_rows(0, 50) == table.take(rows).get_rows(0, 50)
+    assert data.sample_rows(filepath, 50, seed=3).get_rows(0, 50) == sample.get_rows(0, 50)
+    assert data.sample_rows(filepath, 2000, chunk_rows=64).nb_rows == 1000
+    assert data.sample_rows(filepath, 0).nb_rows == 0
+
+    # each row is kept with probability 1/10
+    counts = numpy.zeros(1000)
+    for seed in range(200):
+        counts[data.sample_rows(filepath, 100, seed=seed, chunk_rows=128,
+                                columns=["x"]).column("x").astype(int)] += 1
+    assert abs(counts[:500].sum() / counts.sum() - 0.5) < 0.02
+
+    stratified = data.sample_rows(filepath, 10, seed=0, strata="y", chunk_rows=64,
+                                  columns=["x"])
+    assert stratified.names == ["x"]
+    assert sorted(numpy.unique(stratified.column("x").astype(int) % 3,
+                               return_counts=True)[1].tolist()) == [10, 10, 10]
+    with pytest.raises(ValueError):
+        data.sample_rows(filepath, 10, strata="z")
+    with pytest.raises(ValueError):
+        data.sample_rows(filepath, -1)
+
+
+def _add_parts(arguments) -> int:
+    """Add rows to a dataset from a worker, return the number of written parts"""
+    directory, table = arguments
+    with data.DatasetWriter(directory, table, part_rows=100) as writer:
+        writer.append(table)
+    return len(writer.parts)
+
+
+def test_dataset(simple_data: data.Data):
+    """Test writing a dataset by parts and reading it with a filter"""
+
+    table = data.Data(name="study", description="results", headers=simple_data.headers)
+    table.add_rows([[float(index), f"row_{index % 3}", [float(index)] * (index % 2)]
+                    for index in range(1000)])
+    output_dirname = Path(__file__).absolute().parent / "test_dataset"
+    shutil.rmtree(output_dirname, ignore_errors=True)
+    directory = output_dirname / "study.dataset"
+
+    # four processes add parts at the same time
+    with ProcessPoolExecutor(max_workers=4) as executor:
+        nb_parts = list(executor.map(_add_parts, [
+            (directory, table.take(slice(start, start + 250))) for start in range(0, 1000, 250)]))
+    assert nb_parts == [3] * 4
+    manifest = data.read_manifest(directory)
+    assert (manifest["name"], manifest["format"]) == ("study", "binary")
+    assert [header["name"] for header in manifest["headers"]] == ["x", "y", "z"]
+    assert sorted(part["nb_rows"] for part in manifest["parts"]) == [50] * 4 + [100] * 8
+    assert sorted(part["statistics"]["x"] for part in manifest["parts"])[:2] == [
+        [0.0, 99.0], [100.0, 199.0]]
+
+    dataset = data.load(directory)
+    assert sorted(dataset.column("x").tolist()) == list(map(float, range(1000)))
+    assert data.read_dataset(directory, workers=3).get_rows(0, 1000) == dataset.get_rows(0, 1000)
+
+    assert data.read_dataset(directory, where=[("x", "<", 0)]).nb_rows == 0
+    assert sum(chunk.nb_rows for chunk in data.iter_chunks(directory, 30)) == 1000
+
+    data.write_dataset(table.take(slice(0, 10)), directory, part_rows=4)
+    assert len(data.read_manifest(directory)["parts"]) == 15
+    assert data.read_dataset(directory).nb_rows == 1010
+    with pytest.raises(ValueError):
+        data.write_dataset(table.select(["x"]), directory)
+    with pytest.raises(ValueError):
+        data.write_dataset(table, directory, data_format="csv")
+    with pytest.raises(ValueError):
+        data.read_dataset(directory, where=[("z", "==", 1.0)])
+    with pytest.raises(ValueError):
+        data.read_dataset(output_dirname)
+
+    # only the parts holding x >= 950 are read
+    for part in data.read_manifest(directory)["parts"]:
+        if part["statistics"]["x"][1] < 950.0:
+            (directory / part["file"]).unlink()
+    filtered = data.read_dataset(directory, where=[("x", ">=", 950.0), ("y", "!=", "row_0")],
+                                 columns=["z", "x"], workers=2)
+    assert filtered.names == ["z", "x"]
+    assert filtered.get_rows(0, 33) == table.take(
+        [index for index in range(950, 1000) if index % 3]).select(["z", "x"]).get_rows(0, 33)
+
+
+def test_compare(simple_data: data.Data):
+    """Test comparing two tables of results with tolerances"""
+
+    headers = [data.Data.Header("execution_index", data.Data.Types.DOUBLE, "")]
+    rows = [[float(index), float(index) / 3, f"row_{index}", [1.0, float(index)]]
+            for index in range(500)]
+    rows[5][1] = float("nan")
+    reference = data.Data(name="v1", description="results", headers=headers + simple_data.headers)
+    reference.add_rows(rows)
+    rows[10][1] += 1e-9
+    rows[20][1] += 1e-3
+    rows[30][2] = "changed"
+    rows[40][3] = [1.0]
+    rows[50][3] = [1.0, 55.0]
+    rows[60][1] = float("nan")
+    changed = data.Data(name="v2", description="results", headers=reference.headers)
+    changed.add_rows(rows[:1:-1] + [[1000.0, 0.0, "new", []]])
+
+    comparison = data.compare(reference, changed)
+    assert comparison.nb_rows == 498
+    assert not comparison.equal
+    assert comparison.only_in_a.tolist() == [0.0, 1.0]
+    assert comparison.only_in_b.tolist() == [1000.0]
+    summary = comparison.summary
+    assert summary.column("name").tolist() == ["x", "y", "z"]
+    assert summary.column("nb_differences").tolist() == [2.0, 1.0, 2.0]
+    assert summary.column("max_abs_difference")[[0, 2]].tolist() == pytest.approx([1e-3, 5.0])
+    assert numpy.isnan(summary.column("max_abs_difference")[1])
+    differences = comparison.differences
+    assert differences.names == ["execution_index", "x_a", "y_a", "z_a", "x_b", "y_b", "z_b"]
+    assert differences.column("execution_index").tolist() == [20.0, 30.0, 40.0, 50.0, 60.0]
+    assert differences.get_values(index=1)[2::3] == ["row_30", "changed"]
+
+    # second file in reverse order of keys, both read by small blocks
+    output_dirname = Path(__file__).absolute().parent / "test_compare"
+    output_dirname.mkdir(parents=True, exist_ok=True)
+    data.save(reference, output_dirname / "v1_output.dat")
+    data.save(changed, output_dirname / "v2_output.csv")
+    streamed = data.compare(output_dirname / "v1_output.dat", output_dirname / "v2_output.csv",
+                            rtol=1e-2, columns=["x", "z"], max_rows=2, chunk_rows=64)
+    assert streamed.nb_rows == 498
+    assert streamed.summary.column("nb_differences").tolist() == [1.0, 2.0]
+    assert streamed.differences.column("execution_index").tolist() == [60.0, 40.0]
+    assert data.compare(reference, reference).equal
+    assert streamed.key == "execution_index"
+
+    with pytest.raises(ValueError):
+        data.compare(reference, changed, key="z")
+    strings = data.Data(name="v2", description="", headers=headers + [
+        data.Data.Header("x", data.Data.Types.STRING, "")])
+    with pytest.raises(ValueError) as error:
+        data.compare(reference, strings)
+    assert "Cannot compare 'x' of types 'D' and 'S'." in str(error.value)
+    with pytest.raises(ValueError):
+        data.compare(reference, data.concat([changed, changed]))
+
+
+def _post_process(handle) -> list:
+    """Summary of shared data computed by a worker"""
+    shared = data.Data.from_shared(handle)
+    return [float(shared.column("x").sum()), shared.get_values(index=-1),
+            shared.column("x").flags.writeable]
+
+
+def test_shared(simple_data: data.Data):
+    """Test sending data to other processes through shared memory"""
+
+    simple_data.add_rows([[float(index), f"row_{index}", [0.5] * (index % 3 + 1)]
+                          for index in range(2, 1000)])
+    with simple_data.to_shared() as handle:
+        assert handle.nb_rows == 999
+        assert len(pickle.dumps(handle)) < 1000
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            results = list(executor.map(_post_process, [handle] * 4))
+        assert results == [[499500.0, [999.0, "row_999", [0.5]], False]] * 4
+
+        shared = data.Data.from_shared(handle)
+        assert shared.get_rows(0, 999) == simple_data.get_rows(0, 999)
+        with pytest.raises(ValueError):
+            shared.column("x")[0] = 0.0
+        with pytest.raises(ValueError):
+            handle.close()
+        shared.add_values([0.0, "new", [1.0]])
+        assert data.Data.from_shared(handle).nb_rows == 999
+        handle.close()
+        handle.close()
+    handle.unlink()
+    with pytest.raises(FileNotFoundError):
+        data.Data.from_shared(handle)
+
+    empty = data.Data(name="empty", description="", headers=simple_data.headers)
+    with empty.to_shared() as handle:
+        assert data.Data.from_shared(handle).names == ["x", "y", "z"]
+        handle.close()
+
+
+@pytest.mark.parametrize("suffix", [".dat", ".csv", ".csv.gz"])
+def test_data_writer(simple_data: data.Data, suffix: str):
+    """Test writing rows by batches, then appending to an existing file"""
+
+    output_dirname = Path(__file__).absolute().parent / "test_data_writer"
+    output_dirname.mkdir(parents=True, exist_ok=True)
+    filepath = output_dirname / f"simple_data{suffix}"
+
+    with data.DataWriter(filepath, simple_data) as writer:
+        writer.append(simple_data)
+        writer.flush()
+        if suffix != ".csv.gz":
+            assert data.load(filepath).get_rows(0, 1) == simple_data.get_rows(0, 1)
+        writer.append([[2.0, "a", [3.0]], [3.0, "b", []]])
+    with data.DataWriter(filepath, simple_data, append=True) as writer:
+        writer.append([[4.0, "c", [4.0, 5.0]]])
+        assert writer.nb_rows == 1
+
+    loaded = data.load(filepath)
+    assert loaded.column("x").tolist() == [1.0, 2.0, 3.0, 4.0]
+    assert loaded.get_values(index=3) == [4.0, "c", [4.0, 5.0]]
+    if suffix == ".csv":
+        assert filepath.read_text(encoding="utf-8").splitlines()[-1].startswith("3,")
+
+    with pytest.raises(ValueError) as error:
+        data.DataWriter(filepath, simple_data.select(["x", "y"]), append=True)
+    assert "differ from those of" in str(error.value)
+    with pytest.raises(ValueError) as error:
+        with data.DataWriter(filepath, simple_data) as writer:
+            writer.append([[5.0, 6.0, []]])
+    assert "Type is not correct: found" in str(error.value)
+
+
+def test_convert(simple_data: data.Data):
+    """Test the streaming conversion script"""
+
+    simple_data.add_rows([[float(index), f"row_{index}", [float(index)] * (index % 3)]
+                          for index in range(2, 100)])
+    output_dirname = Path(__file__).absolute().parent / "test_convert"
+    output_dirname.mkdir(parents=True, exist_ok=True)
+    input_filepath = output_dirname / "simple_data.dat"
+    data.save(simple_data, input_filepath)
+
+    for suffix in [".csv", ".json", ".bin", ".dat.gz"]:
+        output_filepath = output_dirname / f"converted{suffix}"
+        assert _run_convert.main_convert(
+            [str(input_filepath), str(output_filepath), "--columns", "z", "x",
+             "--where", "x", ">", "10", "--where", "y", "!=", "row_12", "--chunk-rows", "7"]) == 0
+        converted = data.load(output_filepath)
+        assert converted.names == ["z", "x"]
+        assert converted.column("x").tolist() == [11.0] + [float(x) for x in range(13, 100)]
+        assert converted.get_values(index=0) == [[11.0, 11.0], 11.0]
+
+    # a dataset is a directory, its size is the size of its files
+    shutil.rmtree(output_dirname / "converted.dataset", ignore_errors=True)
+    assert _run_convert.main_convert([str(input_filepath),
+                                      str(output_dirname / "converted.dataset")]) == 0
+    assert _run_convert.main_convert([str(output_dirname / "converted.dataset"),
+                                      str(output_dirname / "from_dataset.csv")]) == 0
+    assert data.load(output_dirname / "from_dataset.csv").nb_rows == 99
+    assert data.where_mask(simple_data, [("x", "<", "3"), ("y", "!=", "toto")]).tolist() == [
+        False, True] + [False] * 97
+
+    with pytest.raises(SystemExit):
+        _run_convert.main_convert([str(input_filepath), str(output_dirname / "invalid.csv"),
+                                   "--where", "z", "==", "1"])
+
+
+def test_join():
+    """Test hash joins in memory and between files"""
+
+    design = data.Data(name="design", description="", headers=[
+        data.Data.Header("execution_index", data.Data.Types.DOUBLE, ""),
+        data.Data.Header("x", data.Data.Types.DOUBLE, "m")])
+    design.add_rows([[float(index), 10.0 * index] for index in range(4)])
+    results = data.Data(name="results", description="", headers=[
+        data.Data.Header("execution_index", data.Data.Types.DOUBLE, ""),
+        data.Data.Header("x", data.Data.Types.STRING, ""),
+        data.Data.Header("z", data.Data.Types.VECTOR, "")])
+    results.add_rows([[1.0, "a", [1.0]], [2.0, "b", []], [2.0, "c", [2.0]], [7.0, "d", [7.0]]])
+
+    joined = data.join(design, results, on="execution_index", how="outer")
+    assert joined.names == ["execution_index", "x_left", "x_right", "z"]
+    assert joined.column("execution_index").tolist() == [0.0, 1.0, 2.0, 2.0, 3.0, 7.0]
+    assert joined.get_rows(1, 4) == [[1.0, 10.0, "a", [1.0]], [2.0, 20.0, "b", []],
+                                     [2.0, 20.0, "c", [2.0]]]
+    assert joined.get_values(index=0) == [0.0, 0.0, "", []]
+    assert numpy.isnan(joined.column("x_left")[5]) and joined.get_values(index=5)[2] == "d"
+    assert data.join(design, results, on="execution_index").nb_rows == 3
+    assert data.join(design, results, on="execution_index", how="left").nb_rows == 5
+    assert data.join(design, results, on="execution_index", how="right").nb_rows == 4
+
+    output_dirname = Path(__file__).absolute().parent / "test_join"
+    output_dirname.mkdir(parents=True, exist_ok=True)
+    data.save(design, output_dirname / "design.dat")
+    data.save(results, output_dirname / "results.csv")
+    for partitions in [1, 3]:
+        data.join_files(output_dirname / "design.dat", output_dirname / "results.csv",
+                        output_dirname / "joined.json", on="execution_index", how="outer",
+                        partitions=partitions, chunk_rows=2)
+        loaded = data.load(output_dirname / "joined.json")
+        assert loaded.names == joined.names
+        assert sorted(map(str, loaded.get_rows(0, 6))) == sorted(map(str, joined.get_rows(0, 6)))
+
+    with pytest.raises(ValueError) as error:
+        data.join(design, results, on="execution_index", how="cross")
+    assert "Unknown join 'cross'" in str(error.value)
+    with pytest.raises(ValueError) as error:
+        data.join(design, results, on="x")
+    assert "Cannot join on 'x'" in str(error.value)
+    with pytest.raises(ValueError) as error:
+        data.join_files(output_dirname / "design.dat", output_dirname / "results.csv",
+                        output_dirname / "joined.json", on="execution_index", partitions=0)
+    assert "partitions must be positive, got 0" in str(error.value)
+
+
+def test_columns_projection(simple_data: data.Data):
+    """Test reading some headers of a file"""
+
+    simple_data.add_rows([[float(index), f"row_{index}", [float(index)] * (index % 3)]
+                          for index in range(2, 100)])
+    output_dirname = Path(__file__).absolute().parent / "test_columns_projection"
+    output_dirname.mkdir(parents=True, exist_ok=True)
+    expected = simple_data.select(["z", "x"])
+
+    for suffix in [".dat", ".csv", ".json", ".bin"]:
+        filepath = output_dirname / f"simple_data{suffix}"
+        data.save(simple_data, filepath)
+        loaded = data.load(filepath, columns=["z", "x"])
+        assert loaded.names == ["z", "x"]
+        assert loaded.get_rows(0, 100) == expected.get_rows(0, 100)
+        chunks = list(data.iter_chunks(filepath, chunk_rows=30, columns=["y"]))
+        assert [chunk.names for chunk in chunks] == [["y"]] * 4
+        assert chunks[3].column("y").tolist() == [f"row_{index}" for index in range(91, 100)]
+        with pytest.raises(ValueError):
+            data.load(filepath, columns=["unknown"])
+    data.save(simple_data, output_dirname / "columns.json", layout=data.JSON_COLUMNS)
+    assert data.load(output_dirname / "columns.json",
+                     columns=["y"]).get_rows(0, 100) == simple_data.select(["y"]).get_rows(0, 100)
+    for suffix in [".dat", ".csv"]:
+        loaded = data.load(output_dirname / f"simple_data{suffix}", workers=2, columns=["z", "x"])
+        assert loaded.get_rows(0, 100) == expected.get_rows(0, 100)
+
+    doubles = output_dirname / "doubles.dat"
+    data.save(simple_data.select(["x"]), doubles)
+    assert data.load(doubles, columns=["x"]).column("x").tolist() == list(range(1, 100))
+    with data.AsciiTableReader(output_dirname / "simple_data.dat", every=10,
+                               columns=["y"]) as reader:
+        assert reader.read_rows([50, 2]).get_rows(0, 2) == [["row_51"], ["row_3"]]